@@ -1,4 +1,8 @@
+import asyncio
 import logging
+import os
+import signal
+import socket
 
 # localmodules:start
 from MuppetsServer.routers import (
@@ -13,14 +17,44 @@ from MuppetsServer.routers import (
     structure_actions,
 )
 from MuppetsServer.tools.player_island_factory import PlayerIslandFactory
+from MuppetsServer.warmup import warm_up
 from ZewSFS import SFSServer
-from ZewSFS.Server import SFSServerClient
+from ZewSFS.Server import (
+    SFSAdmissionControl,
+    SFSServerClient,
+    SFSTimingMiddleware,
+    reject_request,
+)
 from ZewSFS.Types import SFSObject
+from config import (
+    SFS_CAPTURE_PATH,
+    SFS_CLIENT_BURST,
+    SFS_CLIENT_RATE,
+    SFS_COMPRESSION_LEVEL,
+    SFS_COMPRESSION_THRESHOLD,
+    SFS_DRAIN_TIMEOUT,
+    SFS_IDLE_TIMEOUT,
+    SFS_MAX_EXPENSIVE_REQUESTS,
+)
+from database.lease import (
+    acquire_player_lease,
+    release_player_lease,
+    renew_player_leases,
+)
 from database.player import Player, PlayerIsland
 # localmodules:end
 
 logger = logging.getLogger("MuppetsServer/Main")
 
+# Player leases of a worker expire this long after its last renewal, so the players of a
+# crashed worker can log in again elsewhere.
+_PLAYER_LEASE_TTL_MS = 30000
+_PLAYER_LEASE_RENEW_INTERVAL = 10
+# Seconds requests that need the player wait for it to load after the login.
+_PLAYER_READY_TIMEOUT = 20.0
+# Shown to the connected players when the server shuts down.
+_DRAIN_MESSAGE = "The server is restarting, please log in again in a minute."
+
 
 async def _ensure_islands_initialized(player: Player) -> None:
     if not getattr(player, "islands", None):
@@ -30,7 +64,7 @@ async def _ensure_islands_initialized(player: Player) -> None:
             await PlayerIslandFactory.create_initial_structures(island)
 
 
-async def _load_player(client: "SFSServerClient", bbb_id: int):
+async def _load_player(bbb_id: int) -> Player:
     player = await Player.load_by_id(bbb_id)
     if player is None:
         player = Player()
@@ -44,16 +78,65 @@ async def _load_player(client: "SFSServerClient", bbb_id: int):
         await player.on_load_complete()
         await player.save()
     await _ensure_islands_initialized(player)
-    client.player = player
+    return player
+
+
+async def _prefetch_player(client: "SFSServerClient", bbb_id: int) -> Player:
+    # The load runs after the login is answered, so it takes its admission slot itself.
+    admission = client.server.admission
+    if admission is None:
+        return await _load_player(bbb_id)
+    if not await admission.acquire():
+        await client.server.rejection_callback(client, None)
+        raise ConnectionAbortedError("Server busy")
+    try:
+        return await _load_player(bbb_id)
+    finally:
+        admission.release()
 
 
 class MuppetsServer:
-    server: "SFSServer" = SFSServer(port=9933)
+    server: "SFSServer" = SFSServer(
+        port=9933,
+        compression_threshold=SFS_COMPRESSION_THRESHOLD,
+        compression_level=SFS_COMPRESSION_LEVEL,
+        # Every gs_update_properties carries all the player's properties.
+        droppable_commands={"gs_update_properties"},
+        concurrent_requests=True,
+        idle_timeout=SFS_IDLE_TIMEOUT,
+        # Most inbound packets are keepalives.
+        keep_alive_command="keep_alive",
+        # Player loads hit the database, see _prefetch_player; db_* only do on a response
+        # cache miss.
+        admission=SFSAdmissionControl(
+            client_rate=SFS_CLIENT_RATE,
+            client_burst=SFS_CLIENT_BURST,
+            expensive_commands=("gs_player", "db_*"),
+            max_expensive=SFS_MAX_EXPENSIVE_REQUESTS,
+            max_wait=10.0,
+        ),
+        player_timeout=_PLAYER_READY_TIMEOUT,
+    )
+    # Set in worker mode: the name this process holds player leases under.
+    lease_owner: str | None = None
+    # Per-command latencies, response sizes and errors; dumped to the log on SIGUSR1.
+    timings = SFSTimingMiddleware()
+    _drain_task: asyncio.Task | None = None
 
     @staticmethod
     async def error_callback(client: "SFSServerClient", err: Exception, tb: str):
         logger.error(tb)
 
+    @staticmethod
+    async def rejection_callback(client: "SFSServerClient", cmd: str | None):
+        await client.send_extension(
+            "gs_display_generic_message",
+            SFSObject()
+            .putBool("force_logout", cmd is None)
+            .putUtfString("msg", "EXTREMELY_HEAVY_LOAD_ON_SERVER_MESSAGE"),
+        )
+        await reject_request(client, cmd)
+
     @staticmethod
     async def login_callback(
         client: "SFSServerClient", username, password, auth_params: SFSObject
@@ -65,17 +148,74 @@ class MuppetsServer:
         client.set_arg("client_platform", auth_params.get("client_platform", None))
         client.set_arg("client_device", auth_params.get("client_device", None))
 
-        await _load_player(client, bbb_id)
+        owner = MuppetsServer.lease_owner
+        if owner is not None and not await acquire_player_lease(
+            bbb_id, owner, _PLAYER_LEASE_TTL_MS
+        ):
+            logger.warning(f"Player {bbb_id} is active in another worker")
+            return False
+
+        # Loaded while the client downloads the static data; requests that need the player
+        # wait for it, see player_timeout.
+        client.prefetch_player(_prefetch_player(client, bbb_id))
 
         await client.send_extension(
             "gs_initialized", SFSObject().putLong("bbb_id", 1796072285)
         )
         return True
 
+    @staticmethod
+    async def disconnect_callback(client: "SFSServerClient"):
+        owner = MuppetsServer.lease_owner
+        bbb_id = client.get_arg("bbb_id")
+        if owner is None or bbb_id is None:
+            return
+        # Keep the lease while another connection of this worker still plays as the player.
+        if not MuppetsServer.server.get_clients_by_bbb_id(bbb_id):
+            await release_player_lease(bbb_id, owner)
+
+    @staticmethod
+    async def drain_callback():
+        # Handlers save what they change, this catches anything still only in memory.
+        for client in MuppetsServer.server.clients:
+            if client.player is not None:
+                try:
+                    await client.player.save()
+                except Exception:
+                    logger.exception(f"Could not save player {client.player.id}")
+
+    @staticmethod
+    def drain():
+        """Starts a graceful shutdown of the game server, see SFSServer.drain."""
+        if MuppetsServer._drain_task is None:
+            logger.info("Shutting down the game server")
+            MuppetsServer._drain_task = asyncio.create_task(
+                MuppetsServer.server.drain(
+                    SFS_DRAIN_TIMEOUT,
+                    notice=(
+                        "gs_display_generic_message",
+                        SFSObject()
+                        .putBool("force_logout", False)
+                        .putUtfString("msg", _DRAIN_MESSAGE),
+                    ),
+                )
+            )
+
     @staticmethod
     async def start():
         MuppetsServer.server.error_callback = MuppetsServer.error_callback
         MuppetsServer.server.login_callback = MuppetsServer.login_callback
+        MuppetsServer.server.disconnect_callback = MuppetsServer.disconnect_callback
+        MuppetsServer.server.rejection_callback = MuppetsServer.rejection_callback
+        MuppetsServer.server.drain_callback = MuppetsServer.drain_callback
+        MuppetsServer.server.add_middleware(MuppetsServer.timings)
+        MuppetsServer.timings.install_signal_handler()
+        try:
+            asyncio.get_running_loop().add_signal_handler(
+                signal.SIGTERM, MuppetsServer.drain
+            )
+        except (NotImplementedError, RuntimeError, ValueError) as e:
+            logger.warning(f"Can't drain on SIGTERM: {e}")
 
         MuppetsServer.server.include_router(static_data.router)
         MuppetsServer.server.include_router(monster_actions.router)
@@ -87,4 +227,30 @@ class MuppetsServer:
         MuppetsServer.server.include_router(misc_actions.router)
         MuppetsServer.server.include_router(player_actions.router)
 
+        # Port 9933 only opens once the catalogs and static responses are ready.
+        await warm_up(MuppetsServer.server)
+        if SFS_CAPTURE_PATH:
+            MuppetsServer.server.start_capture(SFS_CAPTURE_PATH.format(pid=os.getpid()))
         await MuppetsServer.server.serve_forever()
+
+    @staticmethod
+    async def start_worker():
+        """Runs the game server as one of several processes sharing the port, see supervisor."""
+        MuppetsServer.server.reuse_port = True
+        MuppetsServer.lease_owner = f"{socket.gethostname()}:{os.getpid()}"
+        renewing = asyncio.create_task(MuppetsServer._renew_leases())
+        try:
+            await MuppetsServer.start()
+        finally:
+            renewing.cancel()
+
+    @staticmethod
+    async def _renew_leases():
+        while True:
+            await asyncio.sleep(_PLAYER_LEASE_RENEW_INTERVAL)
+            try:
+                await renew_player_leases(
+                    MuppetsServer.lease_owner, _PLAYER_LEASE_TTL_MS
+                )
+            except Exception:
+                logger.exception("Could not renew player leases")
@@ -11,7 +11,7 @@ from database.player import PlayerMonster
 router = SFSRouter()
 
 
-@router.on_request("keep_alive")
+@router.on_request("keep_alive", read_only=True)
 async def keep_alive(client: SFSServerClient, params: SFSObject):
     response = SFSObject()
     for k in list(params.get_value().keys()):
@@ -69,7 +69,7 @@ async def lighting_change(client: SFSServerClient, params: SFSObject):
 
 
 # Legacy: MuppetsDec does return; on these commands (no response). Stub matches old behaviour.
-@router.on_request("gs_check_for_daily_reward")
+@router.on_request("gs_check_for_daily_reward", read_only=True)
 async def check_for_daily_reward(client: SFSServerClient, params: SFSObject):
     return SFSObject()
 
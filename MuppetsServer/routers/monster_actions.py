@@ -1,12 +1,31 @@
 import time
 
 # localmodules:start
+from ZewSFS.Schema import SFSSchema
 from ZewSFS.Server import SFSRouter, SFSServerClient
 from ZewSFS.Types import SFSObject
+from database.player import PLAYER_PROPERTIES_SCHEMA, PlayerMonster
 # localmodules:end
 
 router = SFSRouter()
 
+# gs_update_monster carries the updated monster plus whichever fields the action changed.
+_UPDATE_MONSTER_SCHEMA = SFSSchema(
+    {
+        "success": "bool",
+        "user_monster_id": "long",
+        "monster": PlayerMonster.sfs_schema.schema,
+        "pos_x": "int",
+        "pos_y": "int",
+        "volume": "double",
+        "flip": "int",
+        "muted": "int",
+        "times_fed": "int",
+        "level": "int",
+        "last_collection": "long",
+    }
+)
+
 
 @router.on_request("gs_move_monster")
 async def move_monster(client: SFSServerClient, params: SFSObject):
@@ -29,15 +48,20 @@ async def move_monster(client: SFSServerClient, params: SFSObject):
     await user_monster.save()
 
     await client.send_extension("gs_move_monster", SFSObject().putBool("success", True))
-    update_resp = (
-        SFSObject().putBool("success", True).putLong("user_monster_id", user_monster_id)
+    update_resp = {
+        "success": True,
+        "user_monster_id": user_monster_id,
+        "monster": user_monster.to_sfs_values(),
+        "pos_x": user_monster.pos_x,
+        "pos_y": user_monster.pos_y,
+        "volume": float(user_monster.volume),
+    }
+    await client.send_extension(
+        "gs_update_monster", update_resp, schema=_UPDATE_MONSTER_SCHEMA
+    )
+    await client.send_extension(
+        "gs_move_monster", update_resp, schema=_UPDATE_MONSTER_SCHEMA
     )
-    update_resp.putSFSObject("monster", await user_monster.to_sfs_object())
-    update_resp.putInt("pos_x", user_monster.pos_x)
-    update_resp.putInt("pos_y", user_monster.pos_y)
-    update_resp.putDouble("volume", float(user_monster.volume))
-    await client.send_extension("gs_update_monster", update_resp)
-    return update_resp
 
 
 @router.on_request("gs_flip_monster")
@@ -57,13 +81,16 @@ async def flip_monster(client: SFSServerClient, params: SFSObject):
     await user_monster.save()
 
     await client.send_extension("gs_flip_monster", SFSObject().putBool("success", True))
-    update_resp = (
-        SFSObject().putBool("success", True).putLong("user_monster_id", user_monster_id)
+    update_resp = {
+        "success": True,
+        "user_monster_id": user_monster_id,
+        "monster": user_monster.to_sfs_values(),
+        "flip": user_monster.flip,
+    }
+    await client.send_extension(
+        "gs_update_monster", update_resp, schema=_UPDATE_MONSTER_SCHEMA
     )
-    update_resp.putSFSObject("monster", await user_monster.to_sfs_object())
-    update_resp.putInt("flip", user_monster.flip)
-    await client.send_extension("gs_update_monster", update_resp)
-    return update_resp
+    await client.send_extension("gs_flip_monster", update_resp, schema=_UPDATE_MONSTER_SCHEMA)
 
 
 @router.on_request("gs_mute_monster")
@@ -83,13 +110,16 @@ async def mute_monster(client: SFSServerClient, params: SFSObject):
     await user_monster.save()
 
     await client.send_extension("gs_mute_monster", SFSObject().putBool("success", True))
-    update_resp = (
-        SFSObject().putBool("success", True).putLong("user_monster_id", user_monster_id)
+    update_resp = {
+        "success": True,
+        "user_monster_id": user_monster_id,
+        "monster": user_monster.to_sfs_values(),
+        "muted": user_monster.muted,
+    }
+    await client.send_extension(
+        "gs_update_monster", update_resp, schema=_UPDATE_MONSTER_SCHEMA
     )
-    update_resp.putSFSObject("monster", await user_monster.to_sfs_object())
-    update_resp.putInt("muted", user_monster.muted)
-    await client.send_extension("gs_update_monster", update_resp)
-    return update_resp
+    await client.send_extension("gs_mute_monster", update_resp, schema=_UPDATE_MONSTER_SCHEMA)
 
 
 @router.on_request("gs_sell_monster")
@@ -139,16 +169,20 @@ async def feed_monster(client: SFSServerClient, params: SFSObject):
     await user_monster.save()
 
     await client.send_extension("gs_feed_monster", SFSObject().putBool("success", True))
-    update_resp = (
-        SFSObject().putBool("success", True).putLong("user_monster_id", user_monster_id)
+    update_resp = {
+        "success": True,
+        "user_monster_id": user_monster_id,
+        "monster": user_monster.to_sfs_values(),
+        "times_fed": user_monster.times_fed,
+        "level": user_monster.level,
+    }
+    await client.send_extension(
+        "gs_update_monster", update_resp, schema=_UPDATE_MONSTER_SCHEMA
     )
-    update_resp.putSFSObject("monster", await user_monster.to_sfs_object())
-    update_resp.putInt("times_fed", user_monster.times_fed)
-    update_resp.putInt("level", user_monster.level)
-    await client.send_extension("gs_update_monster", update_resp)
     await client.send_extension(
         "gs_update_properties",
-        SFSObject().putSFSArray("properties", client.player.get_properties()),
+        {"properties": client.player.get_properties_values()},
+        schema=PLAYER_PROPERTIES_SCHEMA,
     )
     return SFSObject().putBool("success", True)
 
@@ -180,15 +214,19 @@ async def collect_monster(client: SFSServerClient, params: SFSObject):
     collect_response.putInt("coins", collected)
     await client.send_extension("gs_collect_monster", collect_response)
 
-    update_response = (
-        SFSObject().putBool("success", True).putLong("user_monster_id", user_monster_id)
+    update_response = {
+        "success": True,
+        "user_monster_id": user_monster_id,
+        "monster": user_monster.to_sfs_values(),
+        "last_collection": user_monster.last_collection,
+    }
+    await client.send_extension(
+        "gs_update_monster", update_response, schema=_UPDATE_MONSTER_SCHEMA
     )
-    update_response.putSFSObject("monster", await user_monster.to_sfs_object())
-    update_response.putLong("last_collection", user_monster.last_collection)
-    await client.send_extension("gs_update_monster", update_response)
     await client.send_extension(
         "gs_update_properties",
-        SFSObject().putSFSArray("properties", client.player.get_properties()),
+        {"properties": client.player.get_properties_values()},
+        schema=PLAYER_PROPERTIES_SCHEMA,
     )
     return collect_response
 
@@ -12,7 +12,7 @@ from ZewSFS.Server import SFSRouter, SFSServerClient
 from ZewSFS.Types import SFSArray, SFSObject
 # localmodules:end
 
-router = SFSRouter(cached=True)
+router = SFSRouter(cached=True, read_only=True)
 
 
 @router.on_request("db_level")
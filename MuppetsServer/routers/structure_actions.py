@@ -1,14 +1,34 @@
 import time
 
 # localmodules:start
+from ZewSFS.Schema import SFSSchema
 from ZewSFS.Server import SFSRouter, SFSServerClient
-from ZewSFS.Types import SFSObject, SFSArray
-from database.player import PlayerIsland, PlayerStructure
+from ZewSFS.Types import SFSObject
+from database.player import PLAYER_PROPERTY_SCHEMA, PlayerIsland, PlayerStructure
 from database.structure import Structure
 # localmodules:end
 
 router = SFSRouter()
 
+# gs_update_structure for move/mute/flip: the structure plus the changed fields as properties.
+_UPDATE_STRUCTURE_SCHEMA = SFSSchema(
+    {
+        "success": "bool",
+        "user_structure_id": "long",
+        "user_structure": PlayerStructure.sfs_schema.schema,
+        "properties": [
+            {
+                **PLAYER_PROPERTY_SCHEMA,
+                "pos_x": "int",
+                "pos_y": "int",
+                "scale": "double",
+                "muted": "int",
+                "flip": "int",
+            }
+        ],
+    }
+)
+
 
 def _speedup_cost_diamonds(now_ms: int, end_ms: int) -> int:
     if now_ms >= end_ms:
@@ -103,20 +123,20 @@ async def move_structure(client: SFSServerClient, params: "SFSObject"):
     user_structure.scale = scale
     await user_structure.save()
 
-    response = SFSObject()
-    response.putBool("success", True)
-    response.putLong("user_structure_id", user_structure_id)
-    response.putSFSObject("user_structure", await user_structure.to_sfs_object())
-    props = client.player.get_properties()
-    props.addSFSObject(SFSObject().putInt("pos_x", pos_x))
-    props.addSFSObject(SFSObject().putInt("pos_y", pos_y))
-    props.addSFSObject(SFSObject().putDouble("scale", float(scale)))
-    response.putSFSArray("properties", props)
+    response = {
+        "success": True,
+        "user_structure_id": user_structure_id,
+        "user_structure": user_structure.to_sfs_values(),
+        "properties": client.player.get_properties_values()
+        + [{"pos_x": pos_x}, {"pos_y": pos_y}, {"scale": float(scale)}],
+    }
 
     await client.send_extension(
         "gs_move_structure", SFSObject().putBool("success", True)
     )
-    await client.send_extension("gs_update_structure", response)
+    await client.send_extension(
+        "gs_update_structure", response, schema=_UPDATE_STRUCTURE_SCHEMA
+    )
 
 
 @router.on_request("gs_mute_structure")
@@ -138,18 +158,18 @@ async def mute_structure(client: SFSServerClient, params: "SFSObject"):
     user_structure.muted = 0 if user_structure.muted else 1
     await user_structure.save()
 
-    props = SFSArray()
-    props.addSFSObject(SFSObject().putInt("muted", user_structure.muted))
-
-    update_resp = SFSObject()
-    update_resp.putLong("user_structure_id", user_structure_id)
-    update_resp.putSFSObject("user_structure", await user_structure.to_sfs_object())
-    update_resp.putSFSArray("properties", props)
+    update_resp = {
+        "user_structure_id": user_structure_id,
+        "user_structure": user_structure.to_sfs_values(),
+        "properties": [{"muted": user_structure.muted}],
+    }
 
     await client.send_extension(
         "gs_mute_structure", SFSObject().putBool("success", True)
     )
-    await client.send_extension("gs_update_structure", update_resp)
+    await client.send_extension(
+        "gs_update_structure", update_resp, schema=_UPDATE_STRUCTURE_SCHEMA
+    )
 
 
 @router.on_request("gs_flip_structure")
@@ -171,18 +191,18 @@ async def flip_structure(client: "SFSServerClient", params: "SFSObject"):
     user_structure.flip = 0 if user_structure.flip else 1
     await user_structure.save()
 
-    props = SFSArray()
-    props.addSFSObject(SFSObject().putInt("flip", user_structure.flip))
-
-    update_resp = SFSObject()
-    update_resp.putLong("user_structure_id", user_structure_id)
-    update_resp.putSFSObject("user_structure", await user_structure.to_sfs_object())
-    update_resp.putSFSArray("properties", props)
+    update_resp = {
+        "user_structure_id": user_structure_id,
+        "user_structure": user_structure.to_sfs_values(),
+        "properties": [{"flip": user_structure.flip}],
+    }
 
     await client.send_extension(
         "gs_flip_structure", SFSObject().putBool("success", True)
     )
-    await client.send_extension("gs_update_structure", update_resp)
+    await client.send_extension(
+        "gs_update_structure", update_resp, schema=_UPDATE_STRUCTURE_SCHEMA
+    )
 
 
 @router.on_request("gs_sell_structure")
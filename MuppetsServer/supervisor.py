@@ -0,0 +1,179 @@
+"""Multi-process mode: game server workers sharing port 9933 through SO_REUSEPORT, plus the auth app, under one supervisor."""
+
+import asyncio
+import logging
+import multiprocessing
+import signal
+import time
+
+import uvicorn
+
+# localmodules:start
+from config import HTTP_PORT, SFS_DRAIN_TIMEOUT
+from database import engine, init_database
+from MuppetsServer.auth_app import app as auth_app
+from MuppetsServer.muppets_server import MuppetsServer
+from MuppetsServer.warmup import freeze_heap, load_catalogs
+# localmodules:end
+
+logger = logging.getLogger("MuppetsServer/Supervisor")
+
+# How often workers report that their event loop is responsive.
+_WORKER_HEARTBEAT_INTERVAL = 1.0
+# Least time between two starts of the same worker, so a crashing worker doesn't spin.
+_WORKER_RESTART_DELAY = 1.0
+# Seconds workers get past SFS_DRAIN_TIMEOUT to save their players and exit before being killed.
+_WORKER_STOP_MARGIN = 5.0
+
+
+async def _beat(heartbeat):
+    while True:
+        heartbeat.value = time.monotonic()
+        await asyncio.sleep(_WORKER_HEARTBEAT_INTERVAL)
+
+
+def _reset_signals():
+    # Forked workers inherit the supervisor's handlers.
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+
+
+def _run_game_worker(heartbeat):
+    _reset_signals()
+
+    async def run():
+        beating = asyncio.create_task(_beat(heartbeat))
+        try:
+            # Returns once a SIGTERM has drained the server.
+            await MuppetsServer.start_worker()
+        finally:
+            beating.cancel()
+
+    asyncio.run(run())
+
+
+def _run_http_worker(heartbeat):
+    _reset_signals()
+
+    async def run():
+        server = uvicorn.Server(
+            uvicorn.Config(auth_app, host="0.0.0.0", port=int(HTTP_PORT))
+        )
+        await asyncio.gather(server.serve(), _beat(heartbeat))
+
+    asyncio.run(run())
+
+
+async def _prepare_database():
+    await init_database()
+    async with engine.begin() as conn:
+        # Lets the workers read while one of them writes.
+        await conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+    # Imported once here rather than by every worker at the same time.
+    await load_catalogs()
+    # Workers are forked: they must not inherit open connections.
+    await engine.dispose()
+
+
+class SupervisedWorker:
+    """A worker process, restarted when it exits or stops sending heartbeats."""
+
+    def __init__(self, context, name: str, target):
+        self.context = context
+        self.name = name
+        self.target = target
+        self.process = None
+        self.heartbeat = None
+        self.started_at = 0.0
+        self.restarts = 0
+
+    def start(self):
+        self.heartbeat = self.context.Value("d", time.monotonic(), lock=False)
+        self.process = self.context.Process(
+            target=self.target, args=(self.heartbeat,), name=self.name
+        )
+        self.process.start()
+        self.started_at = time.monotonic()
+        logger.info(f"Started {self.name} (pid {self.process.pid})")
+
+    def terminate(self):
+        """Sends SIGTERM to the worker; a game worker drains its clients before exiting."""
+        if self.process is not None and self.process.is_alive():
+            self.process.terminate()
+
+    def wait(self, deadline: float):
+        """Waits for the worker to exit until deadline (a time.monotonic() value), then kills it."""
+        if self.process is None:
+            return
+        self.process.join(max(0.0, deadline - time.monotonic()))
+        if self.process.is_alive():
+            logger.warning(f"Killing {self.name}, still running after its stop timeout")
+            self.process.kill()
+            self.process.join()
+
+    def stop(self, timeout: float = SFS_DRAIN_TIMEOUT + _WORKER_STOP_MARGIN):
+        self.terminate()
+        self.wait(time.monotonic() + timeout)
+
+    def check(self, health_timeout: float):
+        """Restarts the worker if it has exited or its heartbeat is older than health_timeout."""
+        now = time.monotonic()
+        if now - self.started_at < _WORKER_RESTART_DELAY:
+            return
+        if not self.process.is_alive():
+            logger.error(f"{self.name} exited with code {self.process.exitcode}")
+        elif now - self.heartbeat.value > health_timeout:
+            logger.error(f"{self.name} missed its heartbeat for {health_timeout}s")
+            self.stop(timeout=5.0)
+        else:
+            return
+        self.restarts += 1
+        self.start()
+
+
+def run_supervisor(workers: int, health_timeout: float = 15.0):
+    """
+    Runs `workers` game server processes listening on the same port, and the auth app in one more.
+
+    The database is set up and the heap frozen once before forking. Every second the supervisor
+    restarts workers that exited or whose event loop stopped sending heartbeats; SIGTERM or
+    SIGINT stops them all at once, the game workers draining their clients in parallel.
+    """
+    asyncio.run(_prepare_database())
+    # Frozen before forking, so the workers' collections leave the inherited pages shared.
+    logger.info(f"Froze {freeze_heap()} objects before forking the workers")
+
+    # Fork before any event loop runs in this process, so the workers start from a clean state.
+    context = multiprocessing.get_context("fork")
+    processes = [
+        SupervisedWorker(context, f"game-{i}", _run_game_worker)
+        for i in range(workers)
+    ]
+    processes.append(SupervisedWorker(context, "http", _run_http_worker))
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for process in processes:
+        process.start()
+    logger.info(f"Supervising {workers} game server workers")
+    while not stopping:
+        time.sleep(1)
+        if stopping:
+            break
+        for process in processes:
+            process.check(health_timeout)
+
+    logger.info("Stopping workers")
+    # All of them drain at the same time, against one deadline, so stopping takes one drain.
+    for process in processes:
+        process.terminate()
+    deadline = time.monotonic() + SFS_DRAIN_TIMEOUT + _WORKER_STOP_MARGIN
+    for process in processes:
+        process.wait(deadline)
@@ -0,0 +1,86 @@
+"""Startup phase run before port 9933 opens, so the first clients don't pay for cold catalogs and caches."""
+
+import gc
+import logging
+import time
+
+# localmodules:start
+from database.backdrop import Backdrop
+from database.breeding import BreedingCombination
+from database.island import Island
+from database.level import Level
+from database.light import Light
+from database.monster import Monster
+from database.structure import Structure
+from ZewSFS import SFSServer
+# localmodules:end
+
+logger = logging.getLogger("MuppetsServer/Warmup")
+
+# Adapters whose catalog is imported from content/base_game_data on first use.
+_WARMUP_CATALOGS = (Level, Monster, Structure, Island, Backdrop, Light, BreedingCombination)
+
+
+async def load_catalogs():
+    """
+    Imports every static catalog that isn't in the database yet.
+
+    The imports write to SQLite, which serialises them anyway, so they run one after another.
+    """
+    for catalog in _WARMUP_CATALOGS:
+        await catalog.ensure_loaded()
+
+
+def freeze_heap() -> int:
+    """
+    Runs the collector once, then moves every object still alive to the permanent generation.
+
+    Later collections don't walk the frozen objects. Processes forked afterwards inherit them
+    frozen, so their collections don't write to those pages and they stay shared.
+
+    Returns:
+        int: The number of objects frozen.
+    """
+    gc.collect()
+    gc.freeze()
+    return gc.get_freeze_count()
+
+
+async def warm_up(server: SFSServer) -> dict[str, float]:
+    """
+    Loads the static catalogs, prebuilds every cached response and freezes the objects built so far.
+
+    The responses are built concurrently, their compression running in worker threads. Then
+    freeze_heap() keeps later collections from walking them. This runs in each worker; in
+    supervisor mode, what the supervisor built is frozen before the workers are forked.
+
+    Args:
+        server (SFSServer): The server whose cached responses to prebuild, routers included.
+
+    Returns:
+        dict[str, float]: The seconds spent in each phase, in order.
+    """
+    timings = {}
+    started = phase_started = time.perf_counter()
+
+    def end_phase(name: str):
+        nonlocal phase_started
+        now = time.perf_counter()
+        timings[name] = now - phase_started
+        phase_started = now
+
+    await load_catalogs()
+    end_phase("catalogs")
+
+    built = await server.prebuild_responses()
+    end_phase("responses")
+
+    frozen = freeze_heap()
+    end_phase("gc_freeze")
+
+    logger.info(
+        f"Warmup done in {time.perf_counter() - started:.3f}s: "
+        + ", ".join(f"{name} {seconds:.3f}s" for name, seconds in timings.items())
+        + f" ({len(built)} responses prebuilt, {frozen} objects frozen)"
+    )
+    return timings
@@ -0,0 +1,269 @@
+import mmap
+import os
+import struct
+import time
+from collections.abc import Iterable, Iterator
+
+# The file starts with this, followed by records.
+_CAPTURE_MAGIC = b"SFSCAP\x00\x01"
+# Record header: seconds since the capture started, connection id, kind and frame size.
+_CAPTURE_RECORD = struct.Struct(">dIBI")
+# Frames are buffered in memory up to this size before they are written to the file.
+_CAPTURE_BUFFER_SIZE = 1048576
+
+# Record kinds.
+CAPTURE_START = 0
+CAPTURE_OPEN = 1
+CAPTURE_IN = 2
+CAPTURE_OUT = 3
+CAPTURE_CLOSE = 4
+
+
+class SFSFrameCapture:
+    """
+    Records the frames an SFSServer receives and sends, for SFSReplay to play back later.
+
+    The log is append-only: each record is a fixed header (seconds since the capture started,
+    from time.monotonic(), connection id, kind and size) followed by the frame exactly as it went
+    over the wire. Connections are numbered in the order they were opened, and each capture
+    appended to a file starts with a CAPTURE_START record, so several runs can share one file.
+    Recording a frame copies it into a buffer that is written to the file once it is full, so it
+    costs no syscall per frame. Captures hold login frames, passwords included.
+
+    Attributes:
+        path (str): The file the records are appended to.
+        frames (int): The frames recorded.
+        bytes (int): The bytes of the frames recorded.
+
+    Methods:
+        open(client): Starts recording a new connection.
+        record(connection, kind, frame): Records a frame.
+        record_many(connection, kind, frames): Records several frames at once.
+        close_connection(client): Records that a connection was closed.
+        flush(): Writes the buffered records to the file.
+        close(): Stops recording.
+    """
+
+    def __init__(self, path: str, buffer_size: int = _CAPTURE_BUFFER_SIZE):
+        self.path = path
+        self.frames = 0
+        self.bytes = 0
+        self._file = open(path, "ab", buffering=buffer_size)
+        if self._file.tell() == 0:
+            self._file.write(_CAPTURE_MAGIC)
+        self._started = time.monotonic()
+        self._connections = 0
+        # The start record holds the wall clock time, for whoever reads the file.
+        started_at = struct.pack(">d", time.time())
+        self._file.write(_CAPTURE_RECORD.pack(0.0, 0, CAPTURE_START, len(started_at)))
+        self._file.write(started_at)
+
+    @property
+    def closed(self) -> bool:
+        """
+        Whether the capture was closed.
+        """
+        return self._file is None
+
+    def open(self, client):
+        """
+        Starts recording a connection, setting its capture and capture_id.
+
+        Args:
+            client (SFSServerClient): The client of the new connection.
+        """
+        if self._file is None:
+            return
+        self._connections += 1
+        client.capture = self
+        client.capture_id = self._connections
+        self.record(client.capture_id, CAPTURE_OPEN, b"")
+
+    def record(self, connection: int, kind: int, frame: bytes | bytearray | memoryview):
+        """
+        Records a frame of a connection.
+
+        Args:
+            connection (int): The capture_id of the connection.
+            kind (int): CAPTURE_IN for a frame received, CAPTURE_OUT for a frame sent.
+            frame (bytes | bytearray | memoryview): The frame, header included.
+        """
+        file = self._file
+        if file is None:
+            return
+        size = len(frame)
+        file.write(
+            _CAPTURE_RECORD.pack(time.monotonic() - self._started, connection, kind, size)
+        )
+        file.write(frame)
+        self.frames += 1
+        self.bytes += size
+
+    def record_many(
+        self,
+        connection: int,
+        kind: int,
+        frames: Iterable[bytes | bytearray | memoryview],
+    ):
+        """
+        Records several frames of a connection, with the same timestamp.
+
+        Args:
+            connection (int): The capture_id of the connection.
+            kind (int): CAPTURE_IN for frames received, CAPTURE_OUT for frames sent.
+            frames (Iterable): The frames, headers included.
+        """
+        file = self._file
+        if file is None:
+            return
+        elapsed = time.monotonic() - self._started
+        for frame in frames:
+            size = len(frame)
+            file.write(_CAPTURE_RECORD.pack(elapsed, connection, kind, size))
+            file.write(frame)
+            self.frames += 1
+            self.bytes += size
+
+    def close_connection(self, client):
+        """
+        Records that the connection of a client was closed.
+
+        Args:
+            client (SFSServerClient): The client.
+        """
+        if client.capture is self:
+            self.record(client.capture_id, CAPTURE_CLOSE, b"")
+
+    def flush(self):
+        """
+        Writes the buffered records to the file.
+        """
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        """
+        Writes the buffered records and closes the file; frames recorded afterwards are ignored.
+        """
+        if self._file is not None:
+            file, self._file = self._file, None
+            file.close()
+
+
+class SFSCapturedSession:
+    """
+    One connection of a capture, as read by SFSCaptureReader.sessions.
+
+    Attributes:
+        key (tuple[int, int]): The number of the capture in the file and the connection id.
+        opened_at (float): The seconds since the capture started at which the connection was opened.
+        closed_at (float | None): The seconds since the capture started at which it was closed, if it was.
+        frames (list): (seconds since the capture started, kind, start, end) of every frame,
+            where start and end locate the frame in the file, see SFSCaptureReader.frame.
+    """
+
+    __slots__ = ("key", "opened_at", "closed_at", "frames")
+
+    def __init__(self, key: tuple[int, int], opened_at: float):
+        self.key = key
+        self.opened_at = opened_at
+        self.closed_at: float | None = None
+        self.frames: list[tuple[float, int, int, int]] = []
+
+
+class SFSCaptureReader:
+    """
+    Reads a file written by SFSFrameCapture through mmap, without loading it in memory.
+
+    A record cut short at the end of the file, as a crash leaves it, is ignored.
+
+    Methods:
+        __iter__(): Yields every record.
+        frame(start, end): Returns the bytes of a frame.
+        sessions(): Groups the frames by connection.
+        close(): Unmaps the file.
+
+    Raises:
+        ValueError: If the file isn't a capture.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < len(_CAPTURE_MAGIC):
+                raise ValueError(f"{path} is not a frame capture")
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[: len(_CAPTURE_MAGIC)] != _CAPTURE_MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a frame capture")
+
+    def __enter__(self) -> "SFSCaptureReader":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _records(self) -> Iterator[tuple[int, float, int, int, int, int]]:
+        """
+        Yields the capture number, timestamp, connection id, kind, start and end of every record.
+        """
+        data = self._map
+        size = len(data)
+        offset = len(_CAPTURE_MAGIC)
+        header_size = _CAPTURE_RECORD.size
+        unpack_from = _CAPTURE_RECORD.unpack_from
+        capture = 0
+        while offset + header_size <= size:
+            timestamp, connection, kind, length = unpack_from(data, offset)
+            start = offset + header_size
+            end = start + length
+            if end > size:
+                break
+            if kind == CAPTURE_START:
+                capture += 1
+            yield capture, timestamp, connection, kind, start, end
+            offset = end
+
+    def __iter__(self) -> Iterator[tuple[int, float, int, int, bytes]]:
+        """
+        Yields every record in file order.
+
+        Yields:
+            tuple: The number of the capture in the file, the seconds since it started, the
+                connection id, the kind (one of the CAPTURE_* constants) and the frame.
+        """
+        data = self._map
+        for capture, timestamp, connection, kind, start, end in self._records():
+            yield capture, timestamp, connection, kind, data[start:end]
+
+    def frame(self, start: int, end: int) -> bytes:
+        """
+        Returns the bytes of a frame located by SFSCapturedSession.frames.
+        """
+        return self._map[start:end]
+
+    def sessions(self) -> list[SFSCapturedSession]:
+        """
+        Groups the frames of the file by connection.
+
+        Returns:
+            list[SFSCapturedSession]: The connections, in the order they were opened.
+        """
+        sessions: dict[tuple[int, int], SFSCapturedSession] = {}
+        for capture, timestamp, connection, kind, start, end in self._records():
+            if kind == CAPTURE_START:
+                continue
+            key = (capture, connection)
+            session = sessions.get(key)
+            if session is None:
+                # A connection whose open record was lost starts with its first frame.
+                session = sessions[key] = SFSCapturedSession(key, timestamp)
+            if kind == CAPTURE_CLOSE:
+                session.closed_at = timestamp
+            elif kind != CAPTURE_OPEN:
+                session.frames.append((timestamp, kind, start, end))
+        return list(sessions.values())
+
+    def close(self):
+        self._map.close()
@@ -1,5 +1,4 @@
 import asyncio
-import io
 import logging
 from asyncio import StreamReader, StreamWriter
 from socket import socket
@@ -7,7 +6,15 @@ from typing import List
 
 # localmodules:start
 from ZewSFS.Types import SFSObject
-from ZewSFS.Utils import decompile_packet, compile_packet
+from ZewSFS.Exceptions import CompilePacketException
+from ZewSFS.Utils import (
+    compile_packet,
+    compress_packet,
+    decompile_packet,
+    decompress_packet_body,
+    packet_body_size,
+    parse_packet_header,
+)
 # localmodules:end
 
 logger = logging.getLogger("ZewSFS/SFSClient")
@@ -32,11 +39,13 @@ class SFSClient:
     Attributes:
         connection (socket): The socket connection to the server.
         loop (asyncio.AbstractEventLoop): The event loop in which this client is running.
+        compression_threshold (int | None): Bodies larger than this are sent compressed, as told by the server's handshake.
 
     """
 
     # connection = None
     loop = None
+    compression_threshold: int | None = None
 
     def __init__(
         self,
@@ -93,13 +102,15 @@ class SFSClient:
         except:
             ...
 
-    async def connect(self, host: str, port: int = 9933):
+    async def connect(self, host: str, port: int = 9933, handshake: bool = True):
         """
         Connect to the server.
 
         Args:
             host (str): The host of the server.
             port (int, optional): The port of the server. Defaults to 9933.
+            handshake (bool, optional): Whether to send the handshake request, and return its
+                response. Defaults to True.
         """
 
         logger.info(f"Connecting to {host}:{port}")
@@ -109,7 +120,8 @@ class SFSClient:
 
         self.reader, self.writer = await asyncio.open_connection(host, port)
 
-        return await self.send_handshake_request()
+        if handshake:
+            return await self.send_handshake_request()
 
     async def send_raw(self, packet: bytes):
         """
@@ -136,7 +148,13 @@ class SFSClient:
         packet.putByte("c", c)
         packet.putShort("a", a)
         packet.putSFSObject("p", params)
-        await self.send_raw(compile_packet(packet))
+        compiled = compile_packet(packet)
+        if (
+            self.compression_threshold is not None
+            and packet_body_size(compiled) > self.compression_threshold
+        ):
+            compiled = compress_packet(compiled)
+        await self.send_raw(compiled)
 
     async def send_handshake_request(self):
         """
@@ -150,7 +168,9 @@ class SFSClient:
 
         await self.send_packet(0, 0, session_info)
 
-        return await self.read_response()
+        response = await self.read_response()
+        self.compression_threshold = response.getInt("ct")
+        return response
 
     async def send_login_request(
         self, zone: str, username: str, password: str, auth_params: SFSObject
@@ -202,37 +222,28 @@ class SFSClient:
         Read a response from the server.
         """
 
-        response = b""
-        packet_size = b""
-
         packet_type = await self.raw_read(1)
-        __ = packet_type
 
-        if packet_type == b"\x88":
-            packet_size_len = 4
-        elif packet_type == b"\x80":
-            packet_size_len = 2
-        else:
+        header = parse_packet_header(packet_type[0])
+        if header is None:
             return SFSObject(), b""
+        packet_size_len, compressed = header
 
-        while packet_size_len > 0:
-            new = await self.raw_read(packet_size_len)
-            packet_size += new
-            packet_size_len -= len(new)
-
-        __ += packet_size
-
-        packet_size = int.from_bytes(packet_size, "big")
-
-        while len(response) < packet_size:
-            chunk_size = min(packet_size - len(response), 4096 * 4)
-            response += await self.raw_read(chunk_size)
-
-        __ += response
+        try:
+            packet_size = int.from_bytes(
+                await self.reader.readexactly(packet_size_len), "big"
+            )
+            response = await self.reader.readexactly(packet_size)
+        except asyncio.IncompleteReadError:
+            raise DisconnectException("The client has disconnected from the server")
 
-        packet_bytes = io.BytesIO(response)
         logger.debug(f"Got {len(response)} bytes from server")
-        response = decompile_packet(packet_bytes)
+        if compressed:
+            try:
+                response = decompress_packet_body(response)
+            except CompilePacketException as e:
+                raise DisconnectException(str(e)) from e
+        response = decompile_packet(memoryview(response))
 
         logger.debug(response)
         logger.debug(response.to_python_object(True))
@@ -270,7 +281,7 @@ class SFSClient:
                 response = await self.read_response()
 
                 if "c" in response:
-                    cmd, params = response.get("c"), response.get("p")
+                    cmd, params = response.getUtfString("c"), response.getSFSObject("p")
             except Exception as e:
                 print(f"An error occurred: {e}")
                 raise e
@@ -298,7 +309,7 @@ class SFSClient:
                 response = await self.read_response()
 
                 if "c" in response:
-                    cmd, params = response.get("c"), response.get("p")
+                    cmd, params = response.getUtfString("c"), response.getSFSObject("p")
 
             except asyncio.TimeoutError:
                 print(
@@ -0,0 +1,285 @@
+import asyncio
+import logging
+import math
+from collections import deque
+
+# localmodules:start
+from ZewSFS.Capture import CAPTURE_IN, SFSCaptureReader, SFSCapturedSession
+from ZewSFS.Client.Client import DisconnectException, SFSClient
+from ZewSFS.Types import SFSObject
+from ZewSFS.Utils import decompress_packet_body, parse_packet_header
+# localmodules:end
+
+logger = logging.getLogger("ZewSFS/SFSReplay")
+
+# Seconds between reading the capture and sending the first frame, so the first connections
+# aren't late because the others are still being set up.
+_REPLAY_LEAD_TIME = 0.1
+
+
+def _replay_command(frame: bytes) -> str | None:
+    """
+    Returns the command of a captured extension request frame, or None for any other frame.
+    """
+    header = parse_packet_header(frame[0])
+    if header is None:
+        return None
+    packet_size_len, compressed = header
+    body = frame[1 + packet_size_len :]
+    if compressed:
+        body = decompress_packet_body(body)
+    packet = SFSObject.unpack(memoryview(body), None, True)
+    if packet.getByte("c") == b"\x01" and packet.getShort("a") in (12, 13):
+        return packet.getSFSObject("p").getUtfString("c")
+    return None
+
+
+def _replay_percentiles(latencies: list[float]) -> dict:
+    """
+    Returns the count, mean and percentiles of latencies, in milliseconds.
+    """
+    if not latencies:
+        return {"count": 0}
+    latencies = sorted(latencies)
+    count = len(latencies)
+
+    def percentile(fraction: float) -> float:
+        return latencies[max(0, math.ceil(count * fraction) - 1)] * 1000
+
+    return {
+        "count": count,
+        "mean": sum(latencies) / count * 1000,
+        "p50": percentile(0.5),
+        "p90": percentile(0.9),
+        "p99": percentile(0.99),
+        "max": latencies[-1] * 1000,
+    }
+
+
+class SFSReplay:
+    """
+    Plays the client side of a frame capture back against a server, to benchmark it with real traffic.
+
+    Every captured connection is opened again, on its own SFSClient, at the time it was opened
+    in the capture, and sends the frames its client sent, byte for byte, at the times they were
+    received. Times are divided by speed, and each connection can be replayed several times at
+    once (copies) to multiply the load. The latency of an extension request is the time from
+    sending it to the first response with the same command on the same connection; requests the
+    server never answers count as unanswered. The sessions log in with the captured credentials,
+    so the server must know those players, and copies of a session share its player.
+
+    Attributes:
+        path (str): The capture file, written by SFSFrameCapture.
+        host (str): The host of the server.
+        port (int): The port of the server.
+        speed (float | None): How many times faster than captured to replay, or None for as fast as possible.
+        copies (int): How many times each captured connection is replayed at the same time.
+        response_timeout (float): The seconds a connection waits for its last responses before closing.
+
+    Methods:
+        run(): Replays the capture and returns the results.
+        format_report(stats): Returns the results as text.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        host: str,
+        port: int = 9933,
+        speed: float | None = 1.0,
+        copies: int = 1,
+        response_timeout: float = 10.0,
+    ):
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive, or None for as fast as possible")
+        self.path = path
+        self.host = host
+        self.port = port
+        self.speed = speed
+        self.copies = copies
+        self.response_timeout = response_timeout
+
+        self._reader: SFSCaptureReader | None = None
+        self._start = 0.0
+        self._base = 0.0
+        self._latencies: dict[str, list[float]] = {}
+        self._requests = 0
+        self._unanswered = 0
+        self._failed = 0
+        self._max_lag = 0.0
+
+    def _delay(self, timestamp: float) -> float:
+        """
+        Returns the seconds until a captured timestamp is due, negative if it is late.
+        """
+        if self.speed is None:
+            return 0.0
+        due = self._start + (timestamp - self._base) / self.speed
+        return due - asyncio.get_running_loop().time()
+
+    async def _wait_until(self, timestamp: float):
+        delay = self._delay(timestamp)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        elif -delay > self._max_lag:
+            self._max_lag = -delay
+
+    async def _replay_session(
+        self,
+        session: SFSCapturedSession,
+        requests: list[tuple[float, int, int, str | None]],
+    ):
+        """
+        Replays one captured connection on a new client.
+        """
+        loop = asyncio.get_running_loop()
+        await self._wait_until(session.opened_at)
+        client = SFSClient()
+        try:
+            await client.connect(self.host, self.port, handshake=False)
+        except OSError as e:
+            logger.warning(f"Could not open session {session.key}: {e}")
+            self._failed += 1
+            return
+
+        pending: dict[str, deque[float]] = {}
+        answered = asyncio.Event()
+        answered.set()
+        outstanding = 0
+
+        async def receive():
+            nonlocal outstanding
+            while True:
+                response = await client.read_response()
+                if not isinstance(response, SFSObject) or "c" not in response:
+                    continue
+                cmd = response.getUtfString("c")
+                sent = pending.get(cmd)
+                if sent:
+                    self._latencies.setdefault(cmd, []).append(loop.time() - sent.popleft())
+                    outstanding -= 1
+                    if not outstanding:
+                        answered.set()
+
+        receiving = asyncio.create_task(receive())
+        try:
+            for timestamp, start, end, cmd in requests:
+                await self._wait_until(timestamp)
+                if receiving.done():
+                    break
+                await client.send_raw(self._reader.frame(start, end))
+                self._requests += 1
+                if cmd is not None:
+                    pending.setdefault(cmd, deque()).append(loop.time())
+                    outstanding += 1
+                    answered.clear()
+            if session.closed_at is not None and self.speed is not None:
+                # Keep the connection open as long as it was, so as many are open at once.
+                delay = self._delay(session.closed_at)
+                if delay > 0:
+                    await asyncio.wait({receiving}, timeout=delay)
+            if not receiving.done():
+                await asyncio.wait(
+                    {receiving, asyncio.ensure_future(answered.wait())},
+                    timeout=self.response_timeout,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+        except (ConnectionError, DisconnectException):
+            ...
+        finally:
+            receiving.cancel()
+            self._unanswered += outstanding
+            await client.disconnect()
+
+    async def run(self) -> dict:
+        """
+        Replays the capture, every connection at its captured time.
+
+        Returns:
+            dict: The connections replayed ("connections") and those that couldn't connect
+                ("failed"), the frames sent ("requests"), the requests answered ("responses")
+                and not ("unanswered"), the seconds the replay took ("elapsed"), the responses
+                per second ("throughput"), how late the latest frame was sent in milliseconds
+                ("max_lag"), the latencies of every request ("latency") and of each command
+                ("commands"): "count", and "mean", "p50", "p90", "p99" and "max" in milliseconds.
+        """
+        loop = asyncio.get_running_loop()
+        self._latencies = {}
+        self._requests = self._unanswered = self._failed = 0
+        self._max_lag = 0.0
+        with SFSCaptureReader(self.path) as reader:
+            self._reader = reader
+            sessions = [session for session in reader.sessions() if session.frames]
+            replayed = []
+            for session in sessions:
+                requests = [
+                    (timestamp, start, end, _replay_command(reader.frame(start, end)))
+                    for timestamp, kind, start, end in session.frames
+                    if kind == CAPTURE_IN
+                ]
+                if requests:
+                    replayed.append((session, requests))
+            logger.info(
+                f"Replaying {len(replayed)} sessions x{self.copies} of {self.path} "
+                f"against {self.host}:{self.port}"
+            )
+            self._base = min((session.opened_at for session, _ in replayed), default=0.0)
+            self._start = loop.time() + _REPLAY_LEAD_TIME
+            await asyncio.gather(
+                *(
+                    self._replay_session(session, requests)
+                    for session, requests in replayed
+                    for _ in range(self.copies)
+                )
+            )
+            elapsed = loop.time() - self._start
+            self._reader = None
+
+        everything = [
+            latency for latencies in self._latencies.values() for latency in latencies
+        ]
+        return {
+            "connections": len(replayed) * self.copies,
+            "failed": self._failed,
+            "requests": self._requests,
+            "responses": len(everything),
+            "unanswered": self._unanswered,
+            "elapsed": elapsed,
+            "throughput": len(everything) / elapsed if elapsed > 0 else 0.0,
+            "max_lag": self._max_lag * 1000,
+            "latency": _replay_percentiles(everything),
+            "commands": {
+                cmd: _replay_percentiles(latencies)
+                for cmd, latencies in self._latencies.items()
+            },
+        }
+
+    @staticmethod
+    def format_report(stats: dict) -> str:
+        """
+        Returns the results of run() as text, busiest command first.
+
+        Args:
+            stats (dict): What run() returned.
+
+        Returns:
+            str: A summary line followed by a latency table, in milliseconds.
+        """
+        lines = [
+            f"{stats['connections']} connections ({stats['failed']} failed), "
+            f"{stats['requests']} frames sent, {stats['responses']} responses "
+            f"({stats['unanswered']} unanswered) in {stats['elapsed']:.2f}s: "
+            f"{stats['throughput']:.1f} responses/s, sending up to {stats['max_lag']:.1f}ms late",
+            f"{'command':<32} {'count':>8} {'mean':>8} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}",
+        ]
+        rows = [("*", stats["latency"])] + sorted(
+            stats["commands"].items(), key=lambda item: -item[1]["count"]
+        )
+        for cmd, s in rows:
+            if not s["count"]:
+                continue
+            lines.append(
+                f"{cmd:<32} {s['count']:>8} {s['mean']:>8.2f} {s['p50']:>8.2f} "
+                f"{s['p90']:>8.2f} {s['p99']:>8.2f} {s['max']:>8.2f}"
+            )
+        return "\n".join(lines)
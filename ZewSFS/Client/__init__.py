@@ -1,3 +1,4 @@
 # localmodules:start
 from .Client import SFSClient
+from .Replay import SFSReplay
 # localmodules:end
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import json
+import struct
+
+# localmodules:start
+from .Types.ArrayCodec import encode_numeric_array
+from .Types.BaseType import encode_sfs_name
+# localmodules:end
+
+_JSON_HEADER = struct.Struct(">BH")
+_JSON_BYTE_ARRAY_HEADER = struct.Struct(">BI")
+_JSON_LENGTH = struct.Struct(">H")
+_JSON_INT = struct.Struct(">Bi")
+_JSON_LONG = struct.Struct(">Bq")
+_JSON_DOUBLE = struct.Struct(">Bd")
+
+
+def transcode_json(value: str | bytes | dict | list) -> bytes:
+    """
+    Converts JSON text, or the dicts and lists it parses to, straight into an encoded SFSObject or SFSArray.
+
+    The values are typed by the same rules as SFSObject.putAny and SFSArray.addAny, so the result
+    is byte for byte what SFSObject.from_json / SFSArray.from_json would pack, without building
+    the intermediate tree of SFS values.
+
+    Args:
+        value (str | bytes | dict | list): JSON text, or an already parsed dict or list.
+
+    Returns:
+        bytes: The encoded object or array, starting with its type id.
+
+    Raises:
+        TypeError: If the JSON value is neither an object nor an array.
+    """
+    buf = bytearray()
+    transcode_json_into(buf, value)
+    return bytes(buf)
+
+
+def transcode_json_into(buf: bytearray, value: str | bytes | dict | list) -> bytearray:
+    """
+    Appends JSON text, or the dicts and lists it parses to, to buf as an encoded SFSObject or SFSArray.
+
+    Args:
+        buf (bytearray): The buffer to append to.
+        value (str | bytes | dict | list): JSON text, or an already parsed dict or list.
+
+    Returns:
+        bytearray: buf.
+
+    Raises:
+        TypeError: If the JSON value is neither an object nor an array.
+    """
+    if isinstance(value, (str, bytes, bytearray)):
+        value = json.loads(value)
+    if type(value) is dict:
+        _transcode_object(buf, value)
+    elif type(value) is list:
+        _transcode_array(buf, value)
+    else:
+        raise TypeError(f"Expected a JSON object or array, got {type(value).__name__}")
+    return buf
+
+
+def _transcode_object(buf: bytearray, value: dict):
+    """
+    Appends a dict as an SFSObject, typing every item like SFSObject.putAny.
+    """
+    start = len(buf)
+    buf += b"\x12\x00\x00"
+    count = 0
+    for key, item in value.items():
+        item_type = type(item)
+        if item is None:
+            buf += encode_sfs_name(key)
+            buf += b"\x00"
+        elif item_type is int:
+            buf += encode_sfs_name(key)
+            if item > 2147483647:
+                buf += _JSON_LONG.pack(5, item)
+            else:
+                buf += _JSON_INT.pack(4, item)
+        elif item_type is float:
+            buf += encode_sfs_name(key)
+            buf += _JSON_DOUBLE.pack(7, item)
+        elif item_type is dict:
+            buf += encode_sfs_name(key)
+            _transcode_object(buf, item)
+        elif item_type is list:
+            # putAny leaves out empty lists and lists it can't type from their first item.
+            if not item:
+                continue
+            first_type = type(item[0])
+            if first_type is dict:
+                buf += encode_sfs_name(key)
+                _transcode_array(buf, item)
+            elif first_type is float:
+                buf += encode_sfs_name(key)
+                _transcode_numeric_array(buf, 15, item, "d")
+            elif first_type is bool:
+                buf += encode_sfs_name(key)
+                _transcode_numeric_array(buf, 9, item, "B")
+            elif first_type is str:
+                buf += encode_sfs_name(key)
+                buf += _JSON_HEADER.pack(16, len(item))
+                for string in item:
+                    encoded = string.encode("utf-8")
+                    buf += _JSON_LENGTH.pack(len(encoded))
+                    buf += encoded
+            elif first_type is int:
+                buf += encode_sfs_name(key)
+                if any(x > 2147483647 for x in item):
+                    _transcode_numeric_array(buf, 13, item, "q")
+                else:
+                    _transcode_numeric_array(buf, 12, item, "i")
+            else:
+                continue
+        elif item_type is str:
+            buf += encode_sfs_name(key)
+            encoded = item.encode("utf-8")
+            buf += _JSON_HEADER.pack(8, len(encoded))
+            buf += encoded
+        elif item_type is bool:
+            buf += encode_sfs_name(key)
+            buf += b"\x01\x01" if item else b"\x01\x00"
+        elif item_type is bytearray:
+            buf += encode_sfs_name(key)
+            buf += _JSON_BYTE_ARRAY_HEADER.pack(10, len(item))
+            buf += item
+        else:
+            continue
+        count += 1
+    _JSON_LENGTH.pack_into(buf, start + 1, count)
+
+
+def _transcode_array(buf: bytearray, value: list):
+    """
+    Appends a list as an SFSArray, typing every item like SFSArray.addAny.
+    """
+    start = len(buf)
+    buf += b"\x11\x00\x00"
+    count = 0
+    for item in value:
+        if isinstance(item, bool):
+            buf += b"\x01\x01" if item else b"\x01\x00"
+        elif isinstance(item, int):
+            buf += _JSON_INT.pack(4, item)
+        elif isinstance(item, float):
+            buf += _JSON_DOUBLE.pack(7, item)
+        elif isinstance(item, str):
+            encoded = item.encode("utf-8")
+            buf += _JSON_HEADER.pack(8, len(encoded))
+            buf += encoded
+        elif isinstance(item, list):
+            _transcode_array(buf, item)
+        elif isinstance(item, dict):
+            _transcode_object(buf, item)
+        else:
+            continue
+        count += 1
+    _JSON_LENGTH.pack_into(buf, start + 1, count)
+
+
+def _transcode_numeric_array(buf: bytearray, type_id: int, value: list, typecode: str):
+    """
+    Appends a list of numbers as the numeric array type_id holding typecode items.
+    """
+    length, payload = encode_numeric_array(value, typecode)
+    buf += _JSON_HEADER.pack(type_id, length)
+    buf += payload
@@ -0,0 +1,408 @@
+from __future__ import annotations
+
+import json
+import struct
+import typing
+
+# localmodules:start
+from .Exceptions import InvalidDataType
+from .Types.ArrayCodec import encode_numeric_array, numeric_array_size
+from .Types.BaseType import BaseType, encode_sfs_name
+# localmodules:end
+
+# Scalar types written as one struct: (type id, struct format of type id + value).
+# float keeps the native byte order SFSObject uses for it, so both encoders agree byte for byte.
+_SCHEMA_SCALARS = {
+    "short": (3, ">Bh"),
+    "int": (4, ">Bi"),
+    "long": (5, ">Bq"),
+    "float": (6, "=Bf"),
+    "double": (7, ">Bd"),
+}
+# Numeric arrays: (type id, array.array typecode, struct format of type id + item count).
+_SCHEMA_NUMERIC_ARRAYS = {
+    "bool_array": (9, "B", ">BH"),
+    "byte_array": (10, "b", ">BI"),
+    "short_array": (11, "h", ">BH"),
+    "int_array": (12, "i", ">BH"),
+    "long_array": (13, "q", ">BH"),
+    "float_array": (14, "f", ">BH"),
+    "double_array": (15, "d", ">BH"),
+}
+_SCHEMA_LENGTH = struct.Struct(">H")
+_SCHEMA_HEADER = struct.Struct(">BH")
+
+_compiled_schemas: dict[str, typing.Callable[[bytearray, typing.Any], None]] = {}
+_compiled_schema_sizes: dict[str, typing.Callable[[typing.Any], int]] = {}
+
+
+class _SchemaCompiler:
+    """
+    Generates the source of the encoder functions for one schema.
+
+    Every object and array node of the schema becomes a function `(buf, value)` that appends
+    the encoded node to buf, or, for size_node, a function `(value)` that returns the size of the
+    encoded node. Names, type ids and structs are bound as constants of the generated module, so
+    encoding a value only runs the code its shape needs.
+    """
+
+    def __init__(self):
+        self.lines: list[str] = []
+        self.namespace: dict = {
+            "BaseType": BaseType,
+            "encode_numeric_array": encode_numeric_array,
+            "numeric_array_size": numeric_array_size,
+            "pack_length": _SCHEMA_LENGTH.pack,
+            "pack_length_into": _SCHEMA_LENGTH.pack_into,
+            "pack_header": _SCHEMA_HEADER.pack,
+        }
+        self.constants = 0
+        self.functions = 0
+
+    def constant(self, value) -> str:
+        """
+        Binds a value into the generated module and returns the name it is bound to.
+        """
+        name = f"k{self.constants}"
+        self.constants += 1
+        self.namespace[name] = value
+        return name
+
+    def node(self, schema) -> str:
+        """
+        Emits the encoder function of an object or array schema and returns its name.
+        """
+        name = f"encode_{self.functions}"
+        self.functions += 1
+        body = []
+        if isinstance(schema, dict):
+            body.append("    start = len(buf)")
+            body.append('    buf += b"\\x12\\x00\\x00"')
+            body.append("    count = 0")
+            for key, item_schema in schema.items():
+                key_name = self.constant(encode_sfs_name(key))
+                if item_schema == "null":
+                    body.append(f"    if {key!r} in value:")
+                    body.append(f'        buf += {key_name} + b"\\x00"')
+                else:
+                    body.append(f"    v = value.get({key!r})")
+                    body.append("    if v is not None:")
+                    body.append(f"        buf += {key_name}")
+                    body.extend(self.value(item_schema, "        "))
+                body.append("        count += 1")
+            body.append("    pack_length_into(buf, start + 1, count)")
+        elif isinstance(schema, list):
+            body.append("    buf += pack_header(17, len(value))")
+            body.append("    for v in value:")
+            body.extend(self.value(self.item_schema(schema), "        "))
+        else:
+            raise InvalidDataType(schema)
+
+        self.lines.append(f"def {name}(buf, value):")
+        self.lines.append("    if isinstance(value, BaseType):")
+        self.lines.append("        value.pack_value_into(buf, len(buf))")
+        self.lines.append("        return")
+        self.lines.extend(body)
+        self.lines.append("")
+        return name
+
+    @staticmethod
+    def item_schema(schema: list):
+        """
+        Returns the schema shared by all items of an array schema, or None if items are SFS values.
+        """
+        if not schema:
+            return None
+        first = schema[0]
+        if any(item != first for item in schema[1:]):
+            raise InvalidDataType(json.dumps(schema))
+        return first
+
+    def value(self, schema, indent: str) -> list[str]:
+        """
+        Returns the lines that append the value `v` of the given schema to buf.
+        """
+        if schema is None:
+            return [f"{indent}v.pack_value_into(buf, len(buf))"]
+        if isinstance(schema, (dict, list)):
+            return [f"{indent}{self.node(schema)}(buf, v)"]
+        if schema == "null":
+            return [f'{indent}buf += b"\\x00"']
+        if schema == "bool":
+            return [f'{indent}buf += b"\\x01\\x01" if v else b"\\x01\\x00"']
+        if schema == "byte":
+            return [
+                f'{indent}buf += b"\\x02"',
+                f'{indent}buf += v if type(v) is bytes else v.to_bytes(1, "big", signed=True)',
+            ]
+        if schema in _SCHEMA_SCALARS:
+            type_id, fmt = _SCHEMA_SCALARS[schema]
+            pack = self.constant(struct.Struct(fmt).pack)
+            return [f"{indent}buf += {pack}({type_id}, v)"]
+        if schema == "utf_string":
+            return [
+                f'{indent}e = v.encode("utf-8")',
+                f"{indent}buf += pack_header(8, len(e))",
+                f"{indent}buf += e",
+            ]
+        if schema in _SCHEMA_NUMERIC_ARRAYS:
+            type_id, typecode, fmt = _SCHEMA_NUMERIC_ARRAYS[schema]
+            pack = self.constant(struct.Struct(fmt).pack)
+            return [
+                f"{indent}n, payload = encode_numeric_array(v, {typecode!r})",
+                f"{indent}buf += {pack}({type_id}, n)",
+                f"{indent}buf += payload",
+            ]
+        if schema == "utf_string_array":
+            return [
+                f"{indent}buf += pack_header(16, len(v))",
+                f"{indent}for s in v:",
+                f'{indent}    e = s.encode("utf-8")',
+                f"{indent}    buf += pack_length(len(e))",
+                f"{indent}    buf += e",
+            ]
+        raise InvalidDataType(schema)
+
+
+    def size_node(self, schema) -> str:
+        """
+        Emits the size function of an object or array schema and returns its name.
+        """
+        name = f"size_{self.functions}"
+        self.functions += 1
+        body = ["    size = 3"]
+        if isinstance(schema, dict):
+            for key, item_schema in schema.items():
+                key_size = len(encode_sfs_name(key))
+                if item_schema == "null":
+                    body.append(f"    if {key!r} in value:")
+                    body.append(f"        size += {key_size + 1}")
+                else:
+                    body.append(f"    v = value.get({key!r})")
+                    body.append("    if v is not None:")
+                    body.append(f"        size += {key_size}")
+                    body.extend(self.value_size(item_schema, "        "))
+        elif isinstance(schema, list):
+            body.append("    for v in value:")
+            body.extend(self.value_size(self.item_schema(schema), "        "))
+        else:
+            raise InvalidDataType(schema)
+
+        self.lines.append(f"def {name}(value):")
+        self.lines.append("    if isinstance(value, BaseType):")
+        self.lines.append("        return value.encoded_size()")
+        self.lines.extend(body)
+        self.lines.append("    return size")
+        self.lines.append("")
+        return name
+
+    def value_size(self, schema, indent: str) -> list[str]:
+        """
+        Returns the lines that add the encoded size of the value `v` of the given schema to size.
+        """
+        if schema is None:
+            return [f"{indent}size += v.encoded_size()"]
+        if isinstance(schema, (dict, list)):
+            return [f"{indent}size += {self.size_node(schema)}(v)"]
+        if schema == "null":
+            return [f"{indent}size += 1"]
+        if schema in ("bool", "byte"):
+            return [f"{indent}size += 2"]
+        if schema in _SCHEMA_SCALARS:
+            return [f"{indent}size += {struct.calcsize(_SCHEMA_SCALARS[schema][1])}"]
+        if schema == "utf_string":
+            return [
+                f'{indent}size += 3 + (len(v) if v.isascii() else len(v.encode("utf-8")))'
+            ]
+        if schema in _SCHEMA_NUMERIC_ARRAYS:
+            _, typecode, fmt = _SCHEMA_NUMERIC_ARRAYS[schema]
+            return [
+                f"{indent}size += {struct.calcsize(fmt)} + numeric_array_size(v, {typecode!r})"
+            ]
+        if schema == "utf_string_array":
+            return [
+                f"{indent}size += 3",
+                f"{indent}for s in v:",
+                f'{indent}    size += 2 + (len(s) if s.isascii() else len(s.encode("utf-8")))',
+            ]
+        raise InvalidDataType(schema)
+
+def compile_schema(schema: dict | list) -> typing.Callable[[bytearray, typing.Any], None]:
+    """
+    Compiles a schema into a function that appends the SFS encoding of plain Python values to a buffer.
+
+    A schema has the shape SFSObject.tokenize() and SFSArray.tokenize() produce: an object is a
+    dict mapping each key to a type name ("int", "utf_string", ...) or to a nested schema, and an
+    array is a list holding the schema of its items. Keys are written in schema order, keys whose
+    value is None (or missing) are left out, and any SFS value (SFSObject, SFSArray, ...) found
+    where an object or array is expected is written as is. Compiled encoders are cached per schema.
+
+    Args:
+        schema (dict | list): The schema of the value to encode.
+
+    Returns:
+        Callable[[bytearray, Any], None]: A function appending the encoded value, type id included, to a bytearray.
+
+    Raises:
+        InvalidDataType: If the schema names an unknown type or describes an array with mixed items.
+    """
+    key = json.dumps(schema)
+    encoder = _compiled_schemas.get(key)
+    if encoder is None:
+        encoder = _compile_schema_functions(schema, _SchemaCompiler.node)
+        _compiled_schemas[key] = encoder
+    return encoder
+
+
+def compile_schema_size(schema: dict | list) -> typing.Callable[[typing.Any], int]:
+    """
+    Compiles a schema into a function returning the size of what compile_schema's encoder writes.
+
+    Args:
+        schema (dict | list): The schema of the value to measure, see compile_schema.
+
+    Returns:
+        Callable[[Any], int]: A function returning the encoded size of a value, type id included.
+
+    Raises:
+        InvalidDataType: If the schema names an unknown type or describes an array with mixed items.
+    """
+    key = json.dumps(schema)
+    size = _compiled_schema_sizes.get(key)
+    if size is None:
+        size = _compile_schema_functions(schema, _SchemaCompiler.size_node)
+        _compiled_schema_sizes[key] = size
+    return size
+
+
+def _compile_schema_functions(schema: dict | list, emit_node) -> typing.Callable:
+    """
+    Generates the functions of a schema with one of the node emitters and returns the root one.
+    """
+    compiler = _SchemaCompiler()
+    name = emit_node(compiler, schema)
+    exec(compile("\n".join(compiler.lines), "<sfs schema>", "exec"), compiler.namespace)
+    return compiler.namespace[name]
+
+
+class SFSSchema:
+    """
+    A recurring message shape with its compiled encoders.
+
+    Create one per shape at import time and pass plain dicts and lists to it instead of building
+    an SFSObject for every message.
+
+    Attributes:
+        schema (dict | list): The schema the encoders were compiled from.
+
+    Methods:
+        pack(value): Returns the encoded value, type id included.
+        pack_into(buf, value): Appends the encoded value to buf.
+        pack_extension_into(buf, cmd, value): Appends an extension response carrying value to buf.
+        encoded_size(value): Returns the size of the encoded value, without encoding it.
+        extension_size(cmd, value): Returns the size of what pack_extension_into appends.
+        from_sfs(sfs): Static method that returns the schema of an existing SFSObject or SFSArray.
+    """
+
+    def __init__(self, schema: dict | list):
+        """
+        Compiles the encoders of a schema.
+
+        Args:
+            schema (dict | list): The schema of the values to encode, see compile_schema.
+        """
+        self.schema = schema
+        self._encode = compile_schema(schema)
+        self._size = compile_schema_size(schema)
+        # Same envelope as SFSServerClient.send_extension builds.
+        envelope = {
+            "c": "byte",
+            "a": "short",
+            "p": {"c": "utf_string", "r": "int", "p": schema},
+        }
+        self._encode_extension = compile_schema(envelope)
+        self._size_extension = compile_schema_size(envelope)
+
+    def __repr__(self):
+        return f"SFSSchema({self.schema!r})"
+
+    def pack(self, value) -> bytes:
+        """
+        Encodes a value of this shape.
+
+        Args:
+            value: The plain Python value to encode.
+
+        Returns:
+            bytes: The encoded value, type id included.
+        """
+        buf = bytearray()
+        self._encode(buf, value)
+        return bytes(buf)
+
+    def pack_into(self, buf: bytearray, value) -> bytearray:
+        """
+        Appends the encoding of a value of this shape to buf.
+
+        Args:
+            buf (bytearray): The buffer to append to.
+            value: The plain Python value to encode.
+
+        Returns:
+            bytearray: buf.
+        """
+        self._encode(buf, value)
+        return buf
+
+    def pack_extension_into(self, buf: bytearray, cmd: str, value) -> bytearray:
+        """
+        Appends an extension response for cmd carrying a value of this shape to buf.
+
+        Args:
+            buf (bytearray): The buffer to append to.
+            cmd (str): The command of the response.
+            value: The plain Python value sent as the response parameters.
+
+        Returns:
+            bytearray: buf.
+        """
+        self._encode_extension(buf, {"c": 1, "a": 13, "p": {"c": cmd, "r": -1, "p": value}})
+        return buf
+
+    def encoded_size(self, value) -> int:
+        """
+        Returns the number of bytes pack writes for a value, without encoding it.
+
+        Args:
+            value: The plain Python value to measure.
+
+        Returns:
+            int: The encoded size, type id included.
+        """
+        return self._size(value)
+
+    def extension_size(self, cmd: str, value) -> int:
+        """
+        Returns the number of bytes pack_extension_into appends, without encoding anything.
+
+        Args:
+            cmd (str): The command of the response.
+            value: The plain Python value sent as the response parameters.
+
+        Returns:
+            int: The size of the packet body.
+        """
+        return self._size_extension({"c": 1, "a": 13, "p": {"c": cmd, "r": -1, "p": value}})
+
+    @staticmethod
+    def from_sfs(sfs: BaseType) -> SFSSchema:
+        """
+        Returns the schema of an existing SFSObject or SFSArray.
+
+        Args:
+            sfs (SFSObject | SFSArray): The value whose shape to compile.
+
+        Returns:
+            SFSSchema: The compiled schema.
+        """
+        return SFSSchema(sfs.tokenize())
@@ -0,0 +1,211 @@
+import asyncio
+import time
+from collections import deque
+from collections.abc import Iterable
+
+# localmodules:start
+from ZewSFS.Server.ServerClient import SFSServerClient
+# localmodules:end
+
+
+class _TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self, now: float) -> bool:
+        tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if tokens < 1:
+            self.tokens = tokens
+            return False
+        self.tokens = tokens - 1
+        return True
+
+
+class SFSAdmissionControl:
+    """
+    Decides which requests an SFSServer takes on, so excess load is refused before it reaches handlers.
+
+    Two checks apply:
+    - Rate: every extension request takes a token from its client's bucket (client_rate per
+      second, up to client_burst) and from its command's bucket, if command_rates has one. A
+      request finding a bucket empty is rejected at once.
+    - Concurrency: at most max_expensive expensive requests (expensive_commands, plus logins if
+      expensive_login) run at the same time. Others wait for a slot in arrival order, but no
+      more than max_waiting of them and no longer than max_wait seconds; past that they are
+      rejected. Requests answered from the response cache never need a slot.
+
+    Attributes:
+        client_rate (float | None): The requests per second a client may send, if limited.
+        client_burst (float): The requests a client may send at once.
+        command_rates (dict): The (per second, burst) limits of commands over all clients.
+        expensive_commands (tuple): Commands limited by max_expensive; "prefix*" matches by prefix.
+        expensive_login (bool): Whether logins are limited by max_expensive too.
+        max_expensive (int): The expensive requests handled at the same time.
+        max_waiting (int): The expensive requests that may wait for a slot.
+        max_wait (float): The seconds an expensive request may wait for a slot.
+        rejection_message (str): The message requests are rejected with, see SFSServer.rejection_callback.
+
+    Methods:
+        admit(client, cmd): Takes the rate tokens of a request, telling whether it may go on.
+        is_expensive(cmd): Tells whether a command needs a slot.
+        acquire(): Waits for a slot, telling whether one was given.
+        release(): Gives a slot back.
+        forget(client): Drops the bucket of a disconnected client.
+        get_stats(): Returns the admission counters.
+    """
+
+    def __init__(
+        self,
+        client_rate: float | None = None,
+        client_burst: float | None = None,
+        command_rates: dict[str, tuple[float, float]] | None = None,
+        expensive_commands: Iterable[str] = (),
+        expensive_login: bool = False,
+        max_expensive: int = 8,
+        max_waiting: int = 256,
+        max_wait: float = 5.0,
+        rejection_message: str = "SERVER_BUSY",
+    ):
+        self.client_rate = client_rate
+        self.client_burst = client_burst if client_burst is not None else client_rate
+        self.command_rates = dict(command_rates or {})
+        self.expensive_commands = tuple(expensive_commands)
+        self.expensive_login = expensive_login
+        self.max_expensive = max_expensive
+        self.max_waiting = max_waiting
+        self.max_wait = max_wait
+        self.rejection_message = rejection_message
+
+        self._client_buckets: dict[SFSServerClient, _TokenBucket] = {}
+        self._command_buckets = {
+            cmd: _TokenBucket(rate, burst)
+            for cmd, (rate, burst) in self.command_rates.items()
+        }
+        self._expensive: dict[str, bool] = {}
+        self._active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.rate_limited = 0
+        self.rejected = 0
+
+    def admit(self, client: SFSServerClient, cmd: str) -> bool:
+        """
+        Takes a token from the buckets of a request's client and command.
+
+        Args:
+            client (SFSServerClient): The client sending the request.
+            cmd (str): The command of the request.
+
+        Returns:
+            bool: False if a bucket is empty and the request must be rejected.
+        """
+        now = time.monotonic()
+        if self.client_rate is not None:
+            bucket = self._client_buckets.get(client)
+            if bucket is None:
+                bucket = self._client_buckets[client] = _TokenBucket(
+                    self.client_rate, self.client_burst
+                )
+            if not bucket.take(now):
+                self.rate_limited += 1
+                return False
+        bucket = self._command_buckets.get(cmd)
+        if bucket is not None and not bucket.take(now):
+            self.rate_limited += 1
+            return False
+        self.admitted += 1
+        return True
+
+    def is_expensive(self, cmd: str) -> bool:
+        """
+        Tells whether a command is one of expensive_commands.
+
+        Args:
+            cmd (str): The command.
+
+        Returns:
+            bool: True if its requests need a slot.
+        """
+        expensive = self._expensive.get(cmd)
+        if expensive is None:
+            expensive = self._expensive[cmd] = any(
+                cmd.startswith(pattern[:-1]) if pattern.endswith("*") else cmd == pattern
+                for pattern in self.expensive_commands
+            )
+        return expensive
+
+    async def acquire(self) -> bool:
+        """
+        Waits for one of the max_expensive slots, for at most max_wait seconds.
+
+        Every successful acquire() must be followed by a release().
+
+        Returns:
+            bool: False if the request was rejected: too many requests wait, or none came free in time.
+        """
+        if self._active < self.max_expensive:
+            # Requests only wait while every slot is taken, so none is waiting now.
+            self._active += 1
+            return True
+        if len(self._waiters) >= self.max_waiting:
+            self.rejected += 1
+            return False
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.max_wait)
+        except asyncio.TimeoutError:
+            self._waiters.remove(waiter)
+            self.rejected += 1
+            return False
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the request was cancelled.
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+        return True
+
+    def release(self):
+        """
+        Gives a slot back, handing it to the longest waiting request if any.
+        """
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    def forget(self, client: SFSServerClient):
+        """
+        Drops the rate bucket of a client.
+
+        Args:
+            client (SFSServerClient): The disconnected client.
+        """
+        self._client_buckets.pop(client, None)
+
+    def get_stats(self) -> dict:
+        """
+        Returns the admission counters.
+
+        Returns:
+            dict: The requests admitted ("admitted"), refused by a rate limit ("rate_limited") or
+                for want of a slot ("rejected"), and the expensive requests running ("active")
+                and waiting ("waiting") now.
+        """
+        return {
+            "admitted": self.admitted,
+            "rate_limited": self.rate_limited,
+            "rejected": self.rejected,
+            "active": self._active,
+            "waiting": len(self._waiters),
+        }
@@ -0,0 +1,113 @@
+import asyncio
+import math
+
+# localmodules:start
+from ZewSFS.Server.ServerClient import SFSServerClient
+# localmodules:end
+
+
+class SFSIdleReaper:
+    """
+    Closes connections that have sent nothing for idle_timeout seconds, using a hashed timer wheel.
+
+    The wheel has one slot per tick (tick_interval seconds) of the timeout. A client sits in the
+    slot of the tick its deadline falls on. Activity only records the current tick on the client
+    (SFSServerClient.last_activity), so it costs a single attribute write. When the wheel reaches a
+    slot, each client in it has either been active since it was placed there and moves to the slot
+    of its new deadline, or is idle and evicted. Each tick thus only visits the clients due then,
+    and each client is visited about once per timeout.
+
+    Attributes:
+        idle_timeout (float): The seconds a client may stay silent.
+        tick_interval (float): The seconds between two turns of the wheel, the precision of the timeout.
+        tick (int): The current tick, recorded on clients as their last activity.
+
+    Methods:
+        add(client): Starts watching a client.
+        remove(client): Stops watching a client.
+        touch(client): Records activity of a client.
+        start(): Starts turning the wheel on the running event loop.
+        stop(): Stops turning the wheel.
+    """
+
+    def __init__(self, idle_timeout: float, tick_interval: float = 1.0):
+        self.idle_timeout = idle_timeout
+        self.tick_interval = tick_interval
+        self.tick = 0
+        self._timeout_ticks = max(1, math.ceil(idle_timeout / tick_interval))
+        # One more slot than the timeout spans, so a deadline never lands on the slot being reaped.
+        self._slots: list[dict[SFSServerClient, None]] = [
+            {} for _ in range(self._timeout_ticks + 1)
+        ]
+        self._handle: asyncio.TimerHandle | None = None
+
+    def add(self, client: SFSServerClient):
+        """
+        Starts watching a client, counting it as active now.
+
+        Args:
+            client (SFSServerClient): The client.
+        """
+        client.last_activity = self.tick
+        slot = (self.tick + self._timeout_ticks) % len(self._slots)
+        client.idle_slot = slot
+        self._slots[slot][client] = None
+
+    def remove(self, client: SFSServerClient):
+        """
+        Stops watching a client.
+
+        Args:
+            client (SFSServerClient): The client.
+        """
+        if client.idle_slot is not None:
+            self._slots[client.idle_slot].pop(client, None)
+            client.idle_slot = None
+
+    def touch(self, client: SFSServerClient):
+        """
+        Records that a client was active.
+
+        Args:
+            client (SFSServerClient): The client.
+        """
+        client.last_activity = self.tick
+
+    def start(self):
+        """
+        Starts turning the wheel every tick_interval seconds on the running event loop.
+        """
+        if self._handle is None:
+            self._handle = asyncio.get_running_loop().call_later(
+                self.tick_interval, self._turn
+            )
+
+    def stop(self):
+        """
+        Stops turning the wheel.
+        """
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _turn(self):
+        self._handle = asyncio.get_running_loop().call_later(
+            self.tick_interval, self._turn
+        )
+        self.tick += 1
+        tick = self.tick
+        slots = self._slots
+        index = tick % len(slots)
+        due = slots[index]
+        if not due:
+            return
+        slots[index] = {}
+        for client in due:
+            deadline = client.last_activity + self._timeout_ticks
+            if deadline > tick:
+                slot = deadline % len(slots)
+                client.idle_slot = slot
+                slots[slot][client] = None
+            else:
+                client.idle_slot = None
+                client.evict(f"no data for {self.idle_timeout}s")
@@ -0,0 +1,207 @@
+import asyncio
+import logging
+import math
+import signal
+
+logger = logging.getLogger("ZewSFS/SFSServer")
+
+# Latency histograms have this many buckets per power of two. A bucket spans 1/32 of its
+# octave's upper bound, so a percentile read from one is at most 1/16 (6.25%) above the real value.
+_TIMING_SUB_BUCKETS = 16
+# Power-of-two microsecond ranges covered, from 1us up to 2**28us (about 4.5 minutes).
+_TIMING_OCTAVES = 28
+_TIMING_BUCKETS = _TIMING_SUB_BUCKETS * (_TIMING_OCTAVES + 1)
+
+
+class SFSMiddleware:
+    """
+    Hooks run around the handler of every extension request.
+
+    Middlewares added to an SFSServer run around every command, the ones added to an SFSRouter
+    around the commands of that router only, after the server's. before() hooks run in the
+    order the middlewares were added and after() hooks in the reverse order. Both are plain
+    functions called on the event loop, so they must be quick and must not raise.
+
+    Methods:
+        before(client, cmd, params): Runs before the handler; may answer the request instead.
+        after(client, cmd, elapsed, size, error): Runs once the response is sent or the handler failed.
+    """
+
+    def before(self, client, cmd: str, params):
+        """
+        Runs before the handler of a request.
+
+        Args:
+            client (SFSServerClient): The client sending the request.
+            cmd (str): The command of the request.
+            params (SFSObject): The parameters of the request.
+
+        Returns:
+            SFSObject | str | None: None to go on, or a response (or error message) to send
+                instead of running the handler and the remaining before() hooks.
+        """
+        return None
+
+    def after(self, client, cmd: str, elapsed: float, size: int, error: Exception | None):
+        """
+        Runs after a request is handled, for every middleware whose before() ran.
+
+        Args:
+            client (SFSServerClient): The client that sent the request.
+            cmd (str): The command of the request.
+            elapsed (float): The seconds from the first before() hook to the response being queued.
+            size (int): The bytes of the response frame, before compression; 0 if none was sent.
+            error (Exception | None): The exception the request failed with, if any.
+        """
+
+
+class _CommandTimings:
+    __slots__ = ("buckets", "count", "errors", "total", "max", "bytes", "max_bytes")
+
+    def __init__(self):
+        self.buckets = [0] * _TIMING_BUCKETS
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.bytes = 0
+        self.max_bytes = 0
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Returns the upper bound of the bucket holding the given fraction of the samples, in seconds.
+        """
+        rank = math.ceil(self.count * fraction)
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                octave, sub = divmod(index, _TIMING_SUB_BUCKETS)
+                upper = (0.5 + (sub + 1) / (2 * _TIMING_SUB_BUCKETS)) * 2.0**octave / 1e6
+                return min(upper, self.max)
+        return self.max
+
+
+class SFSTimingMiddleware(SFSMiddleware):
+    """
+    Records per-command latency histograms, response sizes and error counts.
+
+    Recording a request costs a few arithmetic operations and a list update, with no allocation
+    once a command has been seen, so it can stay on in production. Latencies are bucketed on a
+    log-linear scale, so percentiles are approximate (within 6.25%); max is exact.
+
+    Methods:
+        get_stats(cmd): Returns the metrics of one command or of all of them.
+        format_report(): Returns the metrics of every command as a table.
+        dump(): Logs the table.
+        install_signal_handler(signum): Dumps the table whenever the process gets a signal.
+        reset(): Forgets every recorded request.
+    """
+
+    def __init__(self):
+        self._commands: dict[str, _CommandTimings] = {}
+
+    def after(self, client, cmd: str, elapsed: float, size: int, error: Exception | None):
+        timings = self._commands.get(cmd)
+        if timings is None:
+            timings = self._commands[cmd] = _CommandTimings()
+        micros = elapsed * 1e6
+        if micros < 1:
+            index = 0
+        else:
+            mantissa, exponent = math.frexp(micros)
+            index = min(
+                exponent * _TIMING_SUB_BUCKETS
+                + int((mantissa - 0.5) * 2 * _TIMING_SUB_BUCKETS),
+                _TIMING_BUCKETS - 1,
+            )
+        timings.buckets[index] += 1
+        timings.count += 1
+        timings.total += elapsed
+        if elapsed > timings.max:
+            timings.max = elapsed
+        timings.bytes += size
+        if size > timings.max_bytes:
+            timings.max_bytes = size
+        if error is not None:
+            timings.errors += 1
+
+    def get_stats(self, cmd: str | None = None) -> dict:
+        """
+        Returns the metrics recorded for a command, or for every command.
+
+        Args:
+            cmd (str | None): The command, or None for all of them.
+
+        Returns:
+            dict: For one command: "count", "errors", latencies in milliseconds ("mean", "p50",
+                "p95", "p99", "max") and response sizes ("bytes", "mean_bytes", "max_bytes").
+                For all of them, those dicts keyed by command.
+        """
+        if cmd is None:
+            return {cmd: self.get_stats(cmd) for cmd in self._commands}
+        timings = self._commands.get(cmd)
+        if timings is None or not timings.count:
+            return {"count": 0, "errors": 0}
+        return {
+            "count": timings.count,
+            "errors": timings.errors,
+            "mean": timings.total / timings.count * 1000,
+            "p50": timings.percentile(0.5) * 1000,
+            "p95": timings.percentile(0.95) * 1000,
+            "p99": timings.percentile(0.99) * 1000,
+            "max": timings.max * 1000,
+            "bytes": timings.bytes,
+            "mean_bytes": timings.bytes // timings.count,
+            "max_bytes": timings.max_bytes,
+        }
+
+    def format_report(self) -> str:
+        """
+        Returns the metrics of every command as a table, busiest command first.
+
+        Returns:
+            str: The table, latencies in milliseconds.
+        """
+        lines = [
+            f"{'command':<32} {'count':>8} {'errors':>6} {'p50':>8} {'p95':>8} "
+            f"{'p99':>8} {'max':>8} {'mean_bytes':>10} {'max_bytes':>10}"
+        ]
+        stats = self.get_stats()
+        for cmd in sorted(stats, key=lambda cmd: -stats[cmd]["count"]):
+            s = stats[cmd]
+            lines.append(
+                f"{cmd:<32} {s['count']:>8} {s['errors']:>6} {s['p50']:>8.2f} "
+                f"{s['p95']:>8.2f} {s['p99']:>8.2f} {s['max']:>8.2f} "
+                f"{s['mean_bytes']:>10} {s['max_bytes']:>10}"
+            )
+        return "\n".join(lines)
+
+    def dump(self):
+        """
+        Logs the metrics of every command.
+        """
+        logger.info("Request timings:\n" + self.format_report())
+
+    def install_signal_handler(self, signum: int = signal.SIGUSR1) -> bool:
+        """
+        Dumps the metrics whenever the process receives a signal, from the running event loop.
+
+        Args:
+            signum (int): The signal, SIGUSR1 by default.
+
+        Returns:
+            bool: False if the event loop can't handle signals here, like outside the main thread.
+        """
+        try:
+            asyncio.get_running_loop().add_signal_handler(signum, self.dump)
+        except (NotImplementedError, RuntimeError, ValueError) as e:
+            logger.warning(f"Can't dump request timings on signal {signum}: {e}")
+            return False
+        return True
+
+    def reset(self):
+        """
+        Forgets every recorded request.
+        """
+        self._commands.clear()
@@ -0,0 +1,344 @@
+import asyncio
+import logging
+import traceback
+from collections import deque
+
+# localmodules:start
+from ZewSFS.Capture import CAPTURE_IN
+from ZewSFS.Exceptions import CompilePacketException
+from ZewSFS.Server.ServerClient import SFSServerClient
+from ZewSFS.Types import LazySFSObject
+from ZewSFS.Utils import decompress_packet_body, parse_packet_header
+# localmodules:end
+
+logger = logging.getLogger("ZewSFS/SFSServer")
+
+# Initial size of the receive buffer of a connection.
+_PROTOCOL_BUFFER_SIZE = 65536
+# Reading is paused while this many parsed requests wait to be handled, and resumed once they are.
+_PROTOCOL_MAX_PENDING = 64
+
+
+class SFSTransportWriter:
+    """
+    The write side of a connection served by SFSServerProtocol, shaped like asyncio.StreamWriter.
+
+    Methods:
+        write(data): Queues data on the transport.
+        writelines(data): Queues several buffers on the transport at once.
+        drain(): Waits until the transport's write buffer is below its high-water mark.
+        close(): Closes the connection once the buffered data is sent.
+        abort(): Closes the connection at once, discarding the buffered data.
+        is_closing(): Tells whether the connection is closing or closed.
+        get_write_buffer_size(): Returns the number of bytes the transport has yet to send.
+        get_extra_info(name, default): Returns transport information, like "peername".
+    """
+
+    def __init__(self, transport: asyncio.Transport, protocol: "SFSServerProtocol"):
+        self.transport = transport
+        self.protocol = protocol
+
+    def write(self, data: bytes | bytearray | memoryview):
+        self.transport.write(data)
+
+    def writelines(self, data):
+        self.transport.writelines(data)
+
+    async def drain(self):
+        """
+        Waits until the peer has taken enough data for the write buffer to drop below its low-water mark.
+
+        Raises:
+            ConnectionResetError: If the connection was lost.
+        """
+        await self.protocol.wait_writable()
+
+    def close(self):
+        self.transport.close()
+
+    def abort(self):
+        self.transport.abort()
+
+    def is_closing(self) -> bool:
+        return self.transport.is_closing()
+
+    def get_write_buffer_size(self) -> int:
+        return self.transport.get_write_buffer_size()
+
+    def get_extra_info(self, name: str, default=None):
+        return self.transport.get_extra_info(name, default)
+
+
+class SFSServerProtocol(asyncio.BufferedProtocol):
+    """
+    Frames the byte stream of one client connection and feeds its requests to the SFSServer.
+
+    The event loop receives straight into a reusable buffer. Every complete frame found after a
+    receive is parsed in the same call, so pipelined requests cost no extra await or syscall, and
+    the partial frame left at the end is moved to the front of the buffer before the next receive.
+    Requests are handled one at a time, in order, by a task per connection; reading is paused
+    while too many of them are waiting.
+
+    Attributes:
+        server (SFSServer): The server the connection belongs to.
+        client (SFSServerClient): The client of the connection, once it is made.
+
+    Methods:
+        get_buffer(sizehint): Returns the free part of the receive buffer.
+        buffer_updated(nbytes): Parses every complete frame received so far.
+        wait_writable(): Waits until writing is no longer paused.
+        stop_reading(): Stops taking requests from the client for good, for a drain.
+        is_idle(): Tells whether every request received has been handled.
+        wait_finished(): Waits until the connection is done with, disconnect callback included.
+    """
+
+    def __init__(self, server):
+        self.server = server
+        self.client: SFSServerClient | None = None
+        self.transport: asyncio.Transport | None = None
+        self._task: asyncio.Task | None = None
+        self._buffer = bytearray(_PROTOCOL_BUFFER_SIZE)
+        self._start = 0
+        self._end = 0
+        # Size of the frame at the start of the buffer, once its header has been read.
+        self._frame_size = 0
+        self._requests: deque[LazySFSObject] = deque()
+        self._request_waiter: asyncio.Future | None = None
+        self._reading_paused = False
+        self._write_waiters: list[asyncio.Future] = []
+        self._writing_paused = False
+        self._closed = False
+        self._stopped_reading = False
+        # Whether the request taken from the queue is still being dispatched.
+        self._handling = False
+
+    def connection_made(self, transport: asyncio.Transport):
+        self.transport = transport
+        transport.set_write_buffer_limits(
+            self.server.outbound_high_water, self.server.outbound_low_water
+        )
+        address = transport.get_extra_info("peername")[0]
+        logger.info(f"New connection from {address}")
+        self.client = SFSServerClient(
+            None, address, SFSTransportWriter(transport, self), self.server
+        )
+        if self.server.capture is not None:
+            self.server.capture.open(self.client)
+        self._task = asyncio.get_running_loop().create_task(self._handle_requests())
+
+    def connection_lost(self, exc: Exception | None):
+        self._closed = True
+        if self.client.capture is not None:
+            self.client.capture.close_connection(self.client)
+        self._requests.clear()
+        self._wake_handler()
+        for waiter in self._write_waiters:
+            if not waiter.done():
+                waiter.set_exception(ConnectionResetError("Connection lost"))
+        self._write_waiters.clear()
+        if self._writing_paused:
+            # Nothing is buffered any more, which also stops the eviction deadline.
+            self._writing_paused = False
+            self.client.resume_writing()
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        """
+        Returns the free part of the receive buffer, making room for the pending frame first.
+
+        Args:
+            sizehint (int): The size the transport would like to receive, ignored.
+
+        Returns:
+            memoryview: The writable tail of the buffer.
+        """
+        start = self._start
+        if start:
+            pending = self._end - start
+            self._buffer[:pending] = self._buffer[start : self._end]
+            self._start = 0
+            self._end = pending
+        if self._frame_size > len(self._buffer):
+            # A frame larger than the buffer: grow it to hold the frame in one piece.
+            buffer = bytearray(self._frame_size)
+            buffer[: self._end] = self._buffer[: self._end]
+            self._buffer = buffer
+        elif self._end == len(self._buffer):
+            self._buffer.extend(bytes(_PROTOCOL_BUFFER_SIZE))
+        return memoryview(self._buffer)[self._end :]
+
+    def buffer_updated(self, nbytes: int):
+        """
+        Parses every complete frame received so far and queues its request.
+
+        Args:
+            nbytes (int): The number of bytes received into the buffer.
+        """
+        self._end += nbytes
+        if self.server.idle_reaper is not None:
+            self.server.idle_reaper.touch(self.client)
+        buffer = self._buffer
+        view = memoryview(buffer)
+        start = self._start
+        end = self._end
+        max_size = self.server.max_message_size
+        capture = self.client.capture
+        try:
+            while start < end:
+                header = parse_packet_header(buffer[start])
+                if header is None:
+                    raise CompilePacketException(
+                        f"Unsupported frame header {buffer[start]:#04x}"
+                    )
+                packet_size_len, compressed = header
+                body_start = start + 1 + packet_size_len
+                if body_start > end:
+                    break
+                packet_size = int.from_bytes(buffer[start + 1 : body_start], "big")
+                if packet_size > max_size:
+                    raise CompilePacketException(
+                        f"Frame of {packet_size} bytes exceeds the {max_size} bytes limit"
+                    )
+                body_end = body_start + packet_size
+                if body_end > end:
+                    self._frame_size = body_end - start
+                    break
+                if capture is not None:
+                    capture.record(
+                        self.client.capture_id, CAPTURE_IN, view[start:body_end]
+                    )
+                if compressed:
+                    request = decompress_packet_body(view[body_start:body_end], max_size)
+                else:
+                    # Requests decode lazily from their buffer, so each one gets its own copy
+                    # of the body and the receive buffer can be reused right away.
+                    request = bytes(view[body_start:body_end])
+                # The frame body starts with the type id of the root object. Nested objects
+                # are only decoded once a handler reads them.
+                self._requests.append(
+                    LazySFSObject.unpack_from(memoryview(request), 1, end=len(request))[0]
+                )
+                self._frame_size = 0
+                start = body_end
+        except CompilePacketException as e:
+            logger.warning(f"Refusing frame from {self.client.identifier}: {e}")
+            self.transport.close()
+            return
+        finally:
+            view.release()
+
+        if start == end:
+            start = end = 0
+            if len(buffer) > _PROTOCOL_BUFFER_SIZE:
+                # Drop the room a large frame needed once it has been handled.
+                self._buffer = bytearray(_PROTOCOL_BUFFER_SIZE)
+        self._start = start
+        self._end = end
+        if self._requests:
+            self._wake_handler()
+            if len(self._requests) >= _PROTOCOL_MAX_PENDING and not self._reading_paused:
+                self._reading_paused = True
+                self.transport.pause_reading()
+
+    def eof_received(self):
+        # Let the transport close itself.
+        return None
+
+    def pause_writing(self):
+        self._writing_paused = True
+        self.client.pause_writing()
+
+    def resume_writing(self):
+        self._writing_paused = False
+        self.client.resume_writing()
+        for waiter in self._write_waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        self._write_waiters.clear()
+
+    async def wait_writable(self):
+        """
+        Waits until the transport's write buffer has room again.
+
+        Raises:
+            ConnectionResetError: If the connection was lost.
+        """
+        if self._closed:
+            raise ConnectionResetError("Connection lost")
+        if not self._writing_paused:
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._write_waiters.append(waiter)
+        await waiter
+
+    def stop_reading(self):
+        """
+        Stops reading from the connection for good; requests already received are still handled.
+        """
+        self._stopped_reading = True
+        if not self._closed:
+            self.transport.pause_reading()
+
+    def is_idle(self) -> bool:
+        """
+        Tells whether every request received so far has been handled.
+
+        Returns:
+            bool: True if no request is waiting or being handled, or the connection is lost.
+        """
+        return self._closed or not (
+            self._requests or self._handling or self.client.request_tasks
+        )
+
+    async def wait_finished(self):
+        """
+        Waits until the requests of the connection stopped being handled after it was lost.
+        """
+        if self._task is not None:
+            await asyncio.shield(self._task)
+
+    def _wake_handler(self):
+        waiter = self._request_waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    async def _handle_requests(self):
+        """
+        Hands the queued requests to the server one at a time, until the connection is lost.
+        """
+        server = self.server
+        client = self.client
+        if not await server.connection_callback(client):
+            return await client.kick()
+
+        try:
+            while True:
+                while not self._requests:
+                    if self._closed:
+                        raise ConnectionError
+                    self._request_waiter = asyncio.get_running_loop().create_future()
+                    await self._request_waiter
+                request = self._requests.popleft()
+                if (
+                    self._reading_paused
+                    and not self._requests
+                    and not self._stopped_reading
+                ):
+                    self._reading_paused = False
+                    self.transport.resume_reading()
+                self._handling = True
+                try:
+                    await server._dispatch_request(client, request)
+                finally:
+                    self._handling = False
+        except ConnectionError:
+            ...
+        except Exception:
+            logging.exception(traceback.format_exc())
+
+        server.remove_client(client)
+        logger.info(f"Disconnected from {client.address}")
+        try:
+            await server.disconnect_callback(client)
+        except Exception:
+            logging.exception(traceback.format_exc())
+        asyncio.create_task(client.kick())
@@ -0,0 +1,188 @@
+from collections.abc import Callable, Iterator
+
+# localmodules:start
+from ZewSFS.Server.ServerClient import SFSServerClient
+# localmodules:end
+
+
+class SFSClientRegistry:
+    """
+    The clients connected to one SFSServer, indexed by identifier, address and logged-in bbb_id.
+
+    Adding and removing a client and every lookup take constant time. Iterating goes over a
+    snapshot of the clients, so clients may connect or disconnect while a broadcast is running.
+
+    Methods:
+        add(client): Registers a client.
+        remove(client): Unregisters a client, returning whether it was registered.
+        set_identifier(client, identifier): Sets the identifier of a client and indexes it.
+        set_bbb_id(client, bbb_id): Indexes a client by the bbb_id it logged in with.
+        get_by_identifier(identifier): Returns the client with an identifier, if any.
+        get_by_address(address): Returns the clients connected from an address.
+        get_by_bbb_id(bbb_id): Returns the clients logged in with a bbb_id.
+        snapshot(): Returns the clients connected right now.
+    """
+
+    def __init__(self):
+        # Registered clients, in connection order, with the identifier and bbb_id they are indexed by.
+        self._clients: dict[SFSServerClient, list] = {}
+        self._by_identifier: dict[str, SFSServerClient] = {}
+        self._by_address: dict[str, dict[SFSServerClient, None]] = {}
+        self._by_bbb_id: dict[int, dict[SFSServerClient, None]] = {}
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def __contains__(self, client: SFSServerClient) -> bool:
+        return client in self._clients
+
+    def __iter__(self) -> Iterator[SFSServerClient]:
+        return iter(tuple(self._clients))
+
+    def add(self, client: SFSServerClient):
+        """
+        Registers a client, indexed by its identifier (if it has one yet) and address.
+
+        Args:
+            client (SFSServerClient): The client to register.
+        """
+        if client in self._clients:
+            return
+        self._clients[client] = [None, None]
+        self._by_address.setdefault(client.address, {})[client] = None
+        if client.identifier is not None:
+            self.set_identifier(client, client.identifier)
+
+    def remove(self, client: SFSServerClient) -> bool:
+        """
+        Unregisters a client and drops it from every index.
+
+        Args:
+            client (SFSServerClient): The client to unregister.
+
+        Returns:
+            bool: True if the client was registered.
+        """
+        keys = self._clients.pop(client, None)
+        if keys is None:
+            return False
+        identifier, bbb_id = keys
+        if identifier is not None and self._by_identifier.get(identifier) is client:
+            del self._by_identifier[identifier]
+        self._discard(self._by_address, client.address, client)
+        if bbb_id is not None:
+            self._discard(self._by_bbb_id, bbb_id, client)
+        return True
+
+    def set_identifier(self, client: SFSServerClient, identifier: str):
+        """
+        Sets the identifier of a client and indexes the client by it.
+
+        Args:
+            client (SFSServerClient): The client.
+            identifier (str): Its new identifier.
+        """
+        client.identifier = identifier
+        keys = self._clients.get(client)
+        if keys is None:
+            return
+        if keys[0] is not None and self._by_identifier.get(keys[0]) is client:
+            del self._by_identifier[keys[0]]
+        keys[0] = identifier
+        self._by_identifier[identifier] = client
+
+    def set_bbb_id(self, client: SFSServerClient, bbb_id: int):
+        """
+        Indexes a client by the bbb_id it logged in with.
+
+        Args:
+            client (SFSServerClient): The client.
+            bbb_id (int): The id of the player it logged in as.
+        """
+        keys = self._clients.get(client)
+        if keys is None:
+            return
+        if keys[1] is not None:
+            self._discard(self._by_bbb_id, keys[1], client)
+        keys[1] = bbb_id
+        if bbb_id is not None:
+            self._by_bbb_id.setdefault(bbb_id, {})[client] = None
+
+    def get_by_identifier(self, identifier: str) -> SFSServerClient | None:
+        """
+        Returns the client with an identifier.
+
+        Args:
+            identifier (str): The identifier of the client.
+
+        Returns:
+            SFSServerClient | None: The client, or None if no client has that identifier.
+        """
+        return self._by_identifier.get(identifier)
+
+    def get_by_address(self, address: str) -> list[SFSServerClient]:
+        """
+        Returns the clients connected from an address.
+
+        Args:
+            address (str): The address of the clients.
+
+        Returns:
+            list[SFSServerClient]: The clients, in connection order.
+        """
+        return list(self._by_address.get(address, ()))
+
+    def get_by_bbb_id(self, bbb_id: int) -> list[SFSServerClient]:
+        """
+        Returns the clients logged in with a bbb_id.
+
+        Args:
+            bbb_id (int): The id of the player.
+
+        Returns:
+            list[SFSServerClient]: The clients, in connection order.
+        """
+        return list(self._by_bbb_id.get(bbb_id, ()))
+
+    def snapshot(self) -> tuple[SFSServerClient, ...]:
+        """
+        Returns the clients connected right now, unaffected by later connections and disconnections.
+
+        Returns:
+            tuple[SFSServerClient, ...]: The clients, in connection order.
+        """
+        return tuple(self._clients)
+
+    @staticmethod
+    def _discard(index: dict, key, client: SFSServerClient):
+        clients = index.get(key)
+        if clients is not None:
+            clients.pop(client, None)
+            if not clients:
+                del index[key]
+
+
+def is_logged_in(client: SFSServerClient) -> bool:
+    """
+    Tells whether a client has logged in, as a predicate for SFSServer.broadcast.
+    """
+    return client.state == "play"
+
+
+def has_arg(key: str, *values) -> Callable[[SFSServerClient], bool]:
+    """
+    Returns a predicate for SFSServer.broadcast selecting the clients whose argument is one of values.
+
+    Args:
+        key (str): The argument, like "client_version".
+        *values: The values selected.
+
+    Returns:
+        Callable[[SFSServerClient], bool]: The predicate.
+    """
+    values = frozenset(values)
+
+    def predicate(client: SFSServerClient) -> bool:
+        return client.args.get(key) in values
+
+    return predicate
@@ -0,0 +1,326 @@
+import asyncio
+import struct
+import time
+import zlib
+
+# localmodules:start
+from ZewSFS.Types.LazySFSObject import skip_sfs_value
+from ZewSFS.Utils import (
+    PACKET_BIG_SIZE,
+    PACKET_BINARY,
+    PACKET_COMPRESSED,
+    compress_packet,
+    packet_body_size,
+)
+# localmodules:end
+
+_CACHE_LENGTH = struct.Struct(">H")
+_CACHE_LONG = struct.Struct(">q")
+
+
+def _find_object_item(buffer: bytes | bytearray, offset: int, key: str) -> tuple[int, int]:
+    """
+    Finds an item of an encoded SFSObject without decoding it.
+
+    Args:
+        buffer (bytes | bytearray): The buffer holding the object.
+        offset (int): The position of the item count of the object, just past its type id.
+        key (str): The key of the item.
+
+    Returns:
+        tuple[int, int]: The type id of the item and the position of its value, or (-1, -1).
+    """
+    encoded_key = key.encode("utf-8")
+    length = _CACHE_LENGTH.unpack_from(buffer, offset)[0]
+    offset += 2
+    for _ in range(length):
+        start = offset + 2
+        offset = start + _CACHE_LENGTH.unpack_from(buffer, offset)[0]
+        type_id = buffer[offset]
+        if buffer[start:offset] == encoded_key:
+            return type_id, offset + 1
+        offset = skip_sfs_value(buffer, type_id, offset + 1)
+    return -1, -1
+
+
+def find_time_offsets(frame: bytes | bytearray, fields) -> list[int]:
+    """
+    Finds the Long time fields among the parameters of a compiled extension response.
+
+    Args:
+        frame (bytes | bytearray): The compiled, uncompressed response.
+        fields (Iterable[str]): The keys of the time fields, like "server_time".
+
+    Returns:
+        list[int]: The positions of the 8-byte values of the fields found in frame, in order.
+    """
+    offset = (5 if frame[0] & PACKET_BIG_SIZE else 3) + 1
+    for key in ("p", "p"):
+        type_id, offset = _find_object_item(frame, offset, key)
+        if type_id != 18:
+            return []
+    offsets = []
+    for field in fields:
+        type_id, value_offset = _find_object_item(frame, offset, field)
+        if type_id == 5:
+            offsets.append(value_offset)
+    return sorted(offsets)
+
+
+class _CachedResponse:
+    """
+    A cached response, rendered with the current time in its time fields on every hit.
+
+    Small responses keep their frame, which is copied and patched in place. Responses large
+    enough to be compressed are split at their first time field: the part before it is
+    compressed once and flushed to a byte boundary, so every hit only compresses the few
+    bytes after it and extends the checksum of the stored part. When that part is too small
+    to shrink, the whole patched frame is compressed on every hit instead.
+    """
+
+    __slots__ = (
+        "expires_at",
+        "frame",
+        "offsets",
+        "prefix",
+        "prefix_adler",
+        "level",
+        "compress_whole",
+    )
+
+    def __init__(
+        self,
+        frame: bytes | bytearray,
+        offsets: list[int],
+        expires_at: float | None,
+        compression_threshold: int,
+        level: int,
+    ):
+        self.expires_at = expires_at
+        self.level = level
+        self.prefix = None
+        self.compress_whole = False
+        body_start = 5 if frame[0] & PACKET_BIG_SIZE else 3
+        if packet_body_size(frame) <= compression_threshold:
+            self.frame = bytes(frame)
+            self.offsets = offsets
+            return
+
+        body = memoryview(frame)[body_start:]
+        split = offsets[0] - body_start if offsets else len(body)
+        compressor = zlib.compressobj(level)
+        prefix = compressor.compress(body[:split]) + compressor.flush(zlib.Z_FULL_FLUSH)
+        if len(prefix) >= split:
+            # The part before the first time field doesn't shrink on its own: compress the
+            # whole frame on every hit, unless that doesn't shrink either.
+            self.frame = bytes(frame)
+            self.offsets = offsets
+            self.compress_whole = compress_packet(frame, level) is not frame
+            return
+        self.prefix = prefix
+        self.prefix_adler = zlib.adler32(body[:split])
+        self.frame = bytes(body[split:])
+        self.offsets = [offset - body_start - split for offset in offsets]
+
+    def render(self) -> bytes:
+        """
+        Returns the frame to send, with the current time in its time fields.
+        """
+        frame = self.frame
+        if self.offsets:
+            frame = bytearray(frame)
+            now_ms = round(time.time() * 1000)
+            for offset in self.offsets:
+                _CACHE_LONG.pack_into(frame, offset, now_ms)
+        if self.prefix is None:
+            if self.compress_whole:
+                return compress_packet(frame, self.level)
+            return frame
+
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        tail = compressor.compress(frame) + compressor.flush()
+        checksum = zlib.adler32(frame, self.prefix_adler).to_bytes(4, "big")
+        packet_size = len(self.prefix) + len(tail) + 4
+        if packet_size < 65535:
+            header = bytes((PACKET_BINARY | PACKET_COMPRESSED,))
+            header += packet_size.to_bytes(2, "big")
+        else:
+            header = bytes((PACKET_BINARY | PACKET_COMPRESSED | PACKET_BIG_SIZE,))
+            header += packet_size.to_bytes(4, "big")
+        return b"".join((header, self.prefix, tail, checksum))
+
+
+class SFSResponseCache:
+    """
+    The compiled responses of static commands, reused across clients.
+
+    Responses are cached per command, client version and platform (the client args named in
+    key_args) and content_version, and expire after the TTL their command was registered with.
+    The Long time fields of a response (server_time) are located once when it is stored and
+    set to the current time whenever it is served, without encoding it again.
+
+    Responses prebuilt at startup have no client to be keyed by: they are served to every client
+    version and platform that has no response of its own.
+
+    Attributes:
+        commands (dict): The cached commands, with their TTL in seconds (None to never expire).
+        key_args (tuple): The client args responses are cached per.
+        time_fields (tuple): The response parameters patched with the current time.
+        content_version (int): Part of every key; bumped to drop all responses at once.
+        hits (int): The number of requests served from the cache.
+        misses (int): The number of requests of cached commands the cache couldn't serve.
+
+    Methods:
+        get(client, cmd): Returns the frame for a request, or None on a miss.
+        store(client, cmd, frame): Caches the compiled response to a request and returns the frame to send.
+        prebuild(cmd, frame): Caches a compiled response for every client.
+        make_template(frame): Returns an uncached response whose time fields are patched on every send.
+        invalidate(cmd): Drops the responses of a command, or all of them.
+        bump_content_version(): Drops all responses, for content that changed.
+        get_stats(): Returns the hit and miss counters.
+    """
+
+    def __init__(
+        self,
+        server,
+        commands: dict,
+        key_args=("client_version", "client_platform"),
+        time_fields=("server_time",),
+    ):
+        self.server = server
+        self.commands = commands
+        self.key_args = tuple(key_args)
+        self.time_fields = tuple(time_fields)
+        self.content_version = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[tuple, _CachedResponse] = {}
+
+    def _key(self, client, cmd: str) -> tuple:
+        if client is None:
+            return (cmd, self.content_version) + (None,) * len(self.key_args)
+        return (cmd, self.content_version) + tuple(
+            client.get_arg(arg) for arg in self.key_args
+        )
+
+    def _lookup(self, key: tuple) -> _CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at is not None:
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+        return entry
+
+    def get(self, client, cmd: str) -> bytes | bytearray | None:
+        """
+        Returns the cached response to a request, with the current time in its time fields.
+
+        Args:
+            client (SFSServerClient): The client sending the request.
+            cmd (str): The command of the request.
+
+        Returns:
+            bytes | bytearray | None: The frame to send, or None if nothing valid is cached.
+        """
+        entry = self._lookup(self._key(client, cmd))
+        if entry is None and self.key_args:
+            entry = self._lookup(self._key(None, cmd))
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry.render()
+
+    async def store(self, client, cmd: str, frame: bytes | bytearray) -> bytes | bytearray:
+        """
+        Caches the compiled response to a request and returns the frame to send for it.
+
+        Large responses are compressed in the event loop's default thread pool, see
+        SFSServer.compression_offload_size.
+
+        Args:
+            client (SFSServerClient): The client the response is for.
+            cmd (str): The command of the response.
+            frame (bytes | bytearray): The compiled, uncompressed response.
+
+        Returns:
+            bytes | bytearray: The frame to send.
+        """
+        entry = await self._build(cmd, frame)
+        self._entries[self._key(client, cmd)] = entry
+        return entry.render()
+
+    async def prebuild(self, cmd: str, frame: bytes | bytearray):
+        """
+        Caches the compiled response to a command for every client, ahead of any request.
+
+        Args:
+            cmd (str): The command of the response.
+            frame (bytes | bytearray): The compiled, uncompressed response.
+        """
+        self._entries[self._key(None, cmd)] = await self._build(cmd, frame)
+
+    def make_template(self, frame: bytes | bytearray) -> _CachedResponse:
+        """
+        Returns a response whose render() gives frame with the current time in its time fields.
+
+        The template is not stored in the cache and never expires.
+
+        Args:
+            frame (bytes | bytearray): The compiled, uncompressed response.
+
+        Returns:
+            _CachedResponse: The template.
+        """
+        return _CachedResponse(
+            frame,
+            find_time_offsets(frame, self.time_fields),
+            None,
+            self.server.compression_threshold,
+            self.server.compression_level,
+        )
+
+    async def _build(self, cmd: str, frame: bytes | bytearray) -> _CachedResponse:
+        server = self.server
+        ttl = self.commands.get(cmd)
+        args = (
+            frame,
+            find_time_offsets(frame, self.time_fields),
+            None if ttl is None else time.monotonic() + ttl,
+            server.compression_threshold,
+            server.compression_level,
+        )
+        if packet_body_size(frame) < server.compression_offload_size:
+            return _CachedResponse(*args)
+        return await asyncio.get_running_loop().run_in_executor(
+            None, _CachedResponse, *args
+        )
+
+    def invalidate(self, cmd: str | None = None):
+        """
+        Drops the cached responses of a command, or every cached response.
+
+        Args:
+            cmd (str | None): The command, or None for all of them.
+        """
+        if cmd is None:
+            self._entries.clear()
+        else:
+            for key in [key for key in self._entries if key[0] == cmd]:
+                del self._entries[key]
+
+    def bump_content_version(self):
+        """
+        Drops every cached response, for when the content they were built from changed.
+        """
+        self.content_version += 1
+        self._entries.clear()
+
+    def get_stats(self) -> dict:
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: The hits ("hits"), misses ("misses") and cached responses ("entries").
+        """
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
@@ -8,26 +8,70 @@ from ZewSFS.Types import SFSObject
 class SFSRouter:
     """
     Represents the class which handles requests and routes they to server.
+
+    Handlers marked read_only don't change any state, so a server handling requests concurrently
+    may run them alongside the client's other requests. Every other handler is state-mutating
+    and runs one at a time per player, in the order the requests arrived.
+
+    Middlewares added to a router run around its own handlers, see SFSMiddleware. They must be
+    added before the router is included in the server.
+
+    Responses of handlers marked cached are kept in the server's response cache, for cache_ttl
+    seconds (forever if None), and served to other clients without running the handler again.
     """
 
     request_handlers: dict[
         str, Callable[["SFSServerClient", "SFSObject"], Awaitable[Any]]
     ] = {}
     cached: bool = None
+    read_only: bool = None
+    cache_ttl: float | None = None
 
-    def on_request(self, message, cached: bool = None):
+    def on_request(
+        self,
+        message,
+        cached: bool = None,
+        read_only: bool = None,
+        cache_ttl: float | None = None,
+    ):
         """
         Decorator for setting a request handler for a specific command.
         """
 
         def decorator(func):
             if cached or self.cached:
-                self.cached_requests[message] = None
+                self.cached_requests[message] = (
+                    cache_ttl if cache_ttl is not None else self.cache_ttl
+                )
+            if read_only or self.read_only:
+                self.read_only_requests.add(message)
+            self.routed_requests.add(message)
             self.request_handlers[message] = func
             return func
 
         return decorator
 
-    def __init__(self, cached: bool = False):
+    def __init__(
+        self,
+        cached: bool = False,
+        read_only: bool = False,
+        cache_ttl: float | None = None,
+    ):
+        # Cached commands, with the seconds their responses stay cached (None for ever).
         self.cached_requests = dict()
         self.cached = cached
+        self.cache_ttl = cache_ttl
+        self.read_only_requests = set()
+        self.read_only = read_only
+        # Commands handled by this router, for its middlewares.
+        self.routed_requests = set()
+        self.middlewares = []
+
+    def add_middleware(self, middleware: "SFSMiddleware"):
+        """
+        Adds a middleware around the handlers, inside the middlewares added before it.
+
+        Args:
+            middleware (SFSMiddleware): The middleware.
+        """
+        self.middlewares.append(middleware)
@@ -12,25 +12,43 @@ Exceptions:
 
 Functions:
     - empty_callback: A placeholder function that returns True. Used as a default callback.
+    - reject_request: Answers a request refused by admission control. Used as the default rejection callback.
 """
 
 import asyncio
 import logging
 import secrets
+import time
 import traceback
-from asyncio import StreamReader, StreamWriter
-from collections.abc import Awaitable, Callable, Coroutine
+from collections.abc import Awaitable, Callable, Coroutine, Iterable
 from typing import Any
 
 # localmodules:start
+from ZewSFS.Capture import SFSFrameCapture
+from ZewSFS.Server.Admission import SFSAdmissionControl
+from ZewSFS.Server.IdleReaper import SFSIdleReaper
+from ZewSFS.Server.Middleware import SFSMiddleware
+from ZewSFS.Server.Protocol import SFSServerProtocol
+from ZewSFS.Server.Registry import SFSClientRegistry
+from ZewSFS.Server.ResponseCache import SFSResponseCache
 from ZewSFS.Server.Router import SFSRouter
 from ZewSFS.Server.ServerClient import SFSServerClient
+from ZewSFS.Schema import SFSSchema
 from ZewSFS.Types import SFSObject
+from ZewSFS.Utils import (
+    compile_extension_packet,
+    compile_extension_response,
+    compress_packet,
+    packet_body_size,
+)
 
 # localmodules:end
 
 logger = logging.getLogger("ZewSFS/SFSServer")
 
+# How often a drain checks whether the clients' requests and queues are done.
+_SERVER_DRAIN_POLL_INTERVAL = 0.05
+
 
 class UnhandledRequest(Exception):
     """
@@ -58,22 +76,62 @@ async def empty_callback(*args, **kwargs):
     return True
 
 
+async def reject_request(client: "SFSServerClient", cmd: str | None):
+    """
+    Answers a request refused by admission control: a login by disconnecting the client, an
+    extension request with success=false and the admission's rejection_message.
+    """
+    if cmd is None:
+        return await client.kick()
+    await client.send_extension(
+        cmd,
+        SFSObject()
+        .putBool("success", False)
+        .putUtfString("message", client.server.admission.rejection_message),
+    )
+
+
 class SFSServer(SFSRouter):
     """
     Represents the main server which manages client connections and handles requests.
 
     Attributes:
-        clients (list): A list of connected clients.
+        clients (SFSClientRegistry): The connected clients, indexed by identifier, address and bbb_id.
         connection_callback (Callable): The callback for handling new connections.
         handshake_callback (Callable): The callback for handling handshake requests.
         login_callback (Callable): The callback for handling login requests.
         error_callback (Callable): The callback for handling errors.
+        disconnect_callback (Callable): The callback for handling disconnections.
+        drain_callback (Callable): The callback saving pending state while the server drains.
+        rejection_callback (Callable): The callback answering a request refused by admission control,
+            with the command of the request (None for a login).
         request_handlers (dict): A dictionary of request handlers for specific commands.
+        max_message_size (int): The largest message body accepted or sent, advertised to clients as "ms".
+        compression_threshold (int): Bodies larger than this are zlib compressed, advertised to clients as "ct".
+        compression_level (int): The zlib level outgoing bodies are compressed with.
+        compression_offload_size (int): Bodies at least this large are compressed in a worker thread.
+        outbound_high_water (int): Bytes buffered for a client past which it counts as not reading.
+        outbound_low_water (int): Bytes buffered for a client under which it counts as reading again.
+        outbound_queue_limit (int): Bytes queued for a client that is not reading past which it is evicted.
+        slow_client_timeout (float): Seconds a client may stay not reading before it is evicted.
+        droppable_commands (set): Commands whose queued frame is replaced by a newer one while a client is not reading.
+        read_only_requests (set): Commands whose handlers don't change any state.
+        concurrent_requests (bool): Whether a client's requests may be handled concurrently.
+        max_concurrent_requests (int): The most requests of one client handled at the same time.
+        reuse_port (bool): Whether to listen with SO_REUSEPORT, so several worker processes share the port.
+        cached_requests (dict): The commands whose responses are cached, with their TTL in seconds.
+        response_cache (SFSResponseCache): The cached responses, keyed by command, client version and platform.
+        middlewares (list): The middlewares run around every extension request, see SFSMiddleware.
+        idle_reaper (SFSIdleReaper | None): Closes clients that send nothing for idle_timeout seconds, if set.
+        admission (SFSAdmissionControl | None): Rate and concurrency limits requests are admitted under, if set.
+        draining (bool): Whether the server is shutting down, see drain.
+        capture (SFSFrameCapture | None): The capture recording the frames of new connections, see start_capture.
+        player_timeout (float | None): If set, state-mutating requests first wait up to this many seconds
+            for SFSServerClient.player_ready; a client whose player doesn't load is disconnected.
+        keep_alive_command (str | None): The command whose requests without params are answered with
+            server_time patched into a template frame, skipping the handler, middlewares and logging.
     """
 
-    clients: list["SFSServerClient"] = []
-    cached_requests = dict()
-
     connection_callback: Callable[["SFSServerClient"], Coroutine[Any, Any, bool]] = (
         empty_callback
     )
@@ -86,13 +144,76 @@ class SFSServer(SFSRouter):
     error_callback: Callable[["SFSServerClient", Exception, str], Awaitable[None]] = (
         empty_callback
     )
+    disconnect_callback: Callable[["SFSServerClient"], Awaitable[None]] = (
+        empty_callback
+    )
+    drain_callback: Callable[[], Awaitable[None]] = empty_callback
+    rejection_callback: Callable[["SFSServerClient", str | None], Awaitable[None]] = (
+        staticmethod(reject_request)
+    )
 
     def __init__(
-        self, host: str = "0.0.0.0", port: int = 9933, zone_name: str | None = None
+        self,
+        host: str = "0.0.0.0",
+        port: int = 9933,
+        zone_name: str | None = None,
+        max_message_size: int = 8000000,
+        compression_threshold: int = 1000000,
+        compression_level: int = 6,
+        compression_offload_size: int = 65536,
+        outbound_high_water: int = 1048576,
+        outbound_low_water: int = 262144,
+        outbound_queue_limit: int = 8388608,
+        slow_client_timeout: float = 30.0,
+        droppable_commands: Iterable[str] = (),
+        concurrent_requests: bool = False,
+        max_concurrent_requests: int = 16,
+        reuse_port: bool = False,
+        cache_key_args: Iterable[str] = ("client_version", "client_platform"),
+        cache_time_fields: Iterable[str] = ("server_time",),
+        idle_timeout: float | None = None,
+        keep_alive_command: str | None = None,
+        admission: SFSAdmissionControl | None = None,
+        player_timeout: float | None = None,
     ):
         self.host = host
         self.port = port
         self.zone_name = zone_name
+        self.max_message_size = max_message_size
+        self.compression_threshold = compression_threshold
+        self.compression_level = compression_level
+        self.compression_offload_size = compression_offload_size
+        self.outbound_high_water = outbound_high_water
+        self.outbound_low_water = outbound_low_water
+        self.outbound_queue_limit = outbound_queue_limit
+        self.slow_client_timeout = slow_client_timeout
+        self.droppable_commands = set(droppable_commands)
+        self.clients = SFSClientRegistry()
+        self.read_only_requests = set()
+        self.concurrent_requests = concurrent_requests
+        self.max_concurrent_requests = max_concurrent_requests
+        self.reuse_port = reuse_port
+        self.cached_requests = dict()
+        self.response_cache = SFSResponseCache(
+            self, self.cached_requests, cache_key_args, cache_time_fields
+        )
+        self.routed_requests = set()
+        self.middlewares = []
+        self.idle_reaper = SFSIdleReaper(idle_timeout) if idle_timeout else None
+        self.keep_alive_command = keep_alive_command
+        self.admission = admission
+        self.player_timeout = player_timeout
+        self.draining = False
+        self._drained = asyncio.Event()
+        self._listener: asyncio.Server | None = None
+        self.capture: SFSFrameCapture | None = None
+        self._keep_alive_template = None
+        # Middlewares of the routers, by command, and the full chain of each command seen.
+        self._command_middlewares: dict[str, list[SFSMiddleware]] = {}
+        self._middleware_chains: dict[str, tuple[SFSMiddleware, ...]] = {}
+        # Locks serialising the state-mutating requests of each player, with how many
+        # requests hold or wait for them.
+        self._player_locks: dict[Any, list] = {}
 
     def get_client_by_address(self, address: str):
         """
@@ -104,7 +225,7 @@ class SFSServer(SFSRouter):
         Returns:
             list: A list of clients with the specified address.
         """
-        return [client for client in self.clients if client.address == address]
+        return self.clients.get_by_address(address)
 
     def get_client_by_identifier(self, identifier: str):
         """
@@ -116,7 +237,8 @@ class SFSServer(SFSRouter):
         Returns:
             list: A list of clients with the specified identifier.
         """
-        return [client for client in self.clients if client.identifier == identifier]
+        client = self.clients.get_by_identifier(identifier)
+        return [] if client is None else [client]
 
     def is_client_exists(self, identifier: str):
         """
@@ -128,7 +250,19 @@ class SFSServer(SFSRouter):
         Returns:
             bool: True if the client exists, otherwise False.
         """
-        return len(self.get_client_by_identifier(identifier)) > 0
+        return self.clients.get_by_identifier(identifier) is not None
+
+    def get_clients_by_bbb_id(self, bbb_id: int):
+        """
+        Gets a list of clients by the bbb_id they logged in with.
+
+        Args:
+            bbb_id (int): The id of the player.
+
+        Returns:
+            list: A list of clients logged in as the player.
+        """
+        return self.clients.get_by_bbb_id(bbb_id)
 
     def add_client(self, client: "SFSServerClient"):
         """
@@ -137,7 +271,9 @@ class SFSServer(SFSRouter):
         Args:
             client (SFSServerClient): The client to add.
         """
-        self.clients.append(client)
+        self.clients.add(client)
+        if self.idle_reaper is not None:
+            self.idle_reaper.add(client)
 
     def remove_client(self, client: "SFSServerClient"):
         """
@@ -146,10 +282,133 @@ class SFSServer(SFSRouter):
         Args:
             client (SFSServerClient): The client to remove.
         """
+        self.clients.remove(client)
+        if self.idle_reaper is not None:
+            self.idle_reaper.remove(client)
+        if self.admission is not None:
+            self.admission.forget(client)
+
+    def get_outbound_stats(self) -> dict:
+        """
+        Returns the outbound queue metrics summed over the connected clients.
+
+        Returns:
+            dict: The connected clients ("clients"), the deepest queue of any client ("max_depth"),
+                and the other metrics of SFSServerClient.get_outbound_stats summed over the clients.
+        """
+        stats = {"clients": len(self.clients), "max_depth": 0}
+        for client in self.clients:
+            for key, value in client.get_outbound_stats().items():
+                if key == "max_depth":
+                    stats[key] = max(stats[key], value)
+                else:
+                    stats[key] = stats.get(key, 0) + value
+        return stats
+
+    async def _dispatch_request(self, client: "SFSServerClient", request: "SFSObject"):
+        """
+        Hands a request to _process_request, concurrently with the client's other requests if enabled.
+
+        With concurrent_requests, extension requests of a logged-in client run as tasks: read-only
+        ones right away, state-mutating ones one after another per player, in arrival order. Each
+        handler still sends its own frames in order. The handshake and login are always handled
+        before the next request is read.
+
+        Args:
+            client (SFSServerClient): The client sending the request.
+            request (SFSObject): The request data.
+        """
+        if client.state != "play":
+            return await self._process_request(client, request)
+        if self.keep_alive_command is not None:
+            try:
+                if self._answer_keep_alive(client, request):
+                    return
+            except Exception as e:
+                asyncio.create_task(
+                    self.error_callback(client, e, traceback.format_exc())
+                )
+                return
+        if not self.concurrent_requests:
+            return await self._process_request(client, request)
+
+        tasks = client.request_tasks
+        while len(tasks) >= self.max_concurrent_requests:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        if self._request_command(request) in self.read_only_requests:
+            handling = self._process_request(client, request)
+        else:
+            handling = self._process_serialized(client, request)
+        task = asyncio.create_task(self._run_request(client, handling))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    def _answer_keep_alive(self, client: "SFSServerClient", request: "SFSObject") -> bool:
+        """
+        Answers a keep_alive_command request without params from the template frame.
+
+        Returns:
+            bool: False if the request must go through its handler instead.
+        """
+        cmd = self._request_command(request)
+        if cmd != self.keep_alive_command:
+            return False
+        # _request_command found the envelope, so only its params may be missing.
+        params = request.getSFSObject("p").getSFSObject("p")
+        if params is not None and params.get_value():
+            # The handler echoes params, which the template can't.
+            return False
+        template = self._keep_alive_template
+        if template is None:
+            template = self._keep_alive_template = self.response_cache.make_template(
+                compile_extension_response(
+                    cmd, SFSObject().putLong("server_time", 0), self.max_message_size
+                )
+            )
+        client.enqueue(template.render(), cmd)
+        return True
+
+    @staticmethod
+    def _request_command(request: "SFSObject") -> str | None:
+        """
+        Returns the command of an extension request, or None for any other or malformed request.
+        """
+        if request.getByte("c") == b"\x01" and request.getShort("a") in (12, 13):
+            envelope = request.getSFSObject("p")
+            if envelope is not None:
+                return envelope.getUtfString("c")
+        return None
+
+    async def _process_serialized(
+        self, client: "SFSServerClient", request: "SFSObject"
+    ):
+        """
+        Processes a state-mutating request once the player's earlier ones are done.
+        """
+        key = client.get_arg("bbb_id", client)
+        entry = self._player_locks.get(key)
+        if entry is None:
+            entry = self._player_locks[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
         try:
-            self.clients.remove(client)
-        except:
-            ...
+            async with entry[0]:
+                await self._process_request(client, request)
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._player_locks[key]
+
+    @staticmethod
+    async def _run_request(client: "SFSServerClient", handling: Awaitable[None]):
+        """
+        Runs a request handled as a task, closing the connection if it turns out to be lost.
+        """
+        try:
+            await handling
+        except (ConnectionError, asyncio.IncompleteReadError):
+            client.writer.close()
+        except Exception:
+            logging.exception(traceback.format_exc())
 
     async def _process_request(self, client: "SFSServerClient", request: "SFSObject"):
         """
@@ -160,37 +419,50 @@ class SFSServer(SFSRouter):
             request (SFSObject): The request data.
         """
         if client.state == "handshake":
-            if request.get("c") == b"\x00" and request.get("a") == 0:
+            if request.getByte("c") == b"\x00" and request.getShort("a") == 0:
                 identifier = secrets.token_urlsafe(32)
-                client.identifier = identifier
+                self.clients.set_identifier(client, identifier)
                 logger.info(f"HandshakeRequest from {client.identifier}")
                 logger.debug(request)
                 client.state = "login"
 
-                asyncio.create_task(client.send_handshake())
+                await client.send_handshake()
                 if not await self.handshake_callback(client, request):
                     return await client.kick()
 
             return
 
         if client.state == "login":
-            if request.get("c") == b"\x00" and request.get("a") == 1:
+            if request.getByte("c") == b"\x00" and request.getShort("a") == 1:
                 logger.info(f"LoginRequest from {client.identifier}")
                 logger.debug(request)
-                params: SFSObject = request.get("p")
-                zone_name = params.get("zn")
-                username = params.get("un")
-                password = params.get("pw")
-                auth_params: SFSObject = params.get("p")
+                params: SFSObject = request.getSFSObject("p")
+                zone_name = params.getUtfString("zn")
+                username = params.getUtfString("un")
+                password = params.getUtfString("pw")
+                auth_params: SFSObject = params.getSFSObject("p")
 
                 client.state = "play"
 
                 if zone_name != self.zone_name and self.zone_name is not None:
                     return client.kick()
 
-                if not await self.login_callback(
-                    client, username, password, auth_params
-                ):
+                admission = self.admission
+                if admission is not None and admission.expensive_login:
+                    if not await admission.acquire():
+                        logger.warning(f"Refused login of {client.identifier}: server busy")
+                        return await self.rejection_callback(client, None)
+                    try:
+                        logged_in = await self.login_callback(
+                            client, username, password, auth_params
+                        )
+                    finally:
+                        admission.release()
+                else:
+                    logged_in = await self.login_callback(
+                        client, username, password, auth_params
+                    )
+                if not logged_in:
                     await asyncio.sleep(1)
                     return await client.kick()
 
@@ -199,46 +471,28 @@ class SFSServer(SFSRouter):
             return
 
         if client.state == "play":
-            if request.get("c") == b"\x01" and request.get("a") in (12, 13):
+            if request.getByte("c") == b"\x01" and request.getShort("a") in (12, 13):
                 try:
-                    cmd: str = request.get("p").get("c")
-                    params: "SFSObject" = request.get("p").get("p")
+                    cmd: str = request.getSFSObject("p").getUtfString("c")
+                    params: "SFSObject" = request.getSFSObject("p").getSFSObject("p")
 
                     logger.info(f"ExtensionRequest from {client.identifier}: {cmd}")
                     logger.debug(params)
 
-                    if (
-                        cached_response := self.cached_requests.get(cmd, None)
-                    ) is not None:
-                        logger.info(f"Loaded {cmd} from cache")
-                        await client.send(cached_response)
+                    if self.admission is not None and not self.admission.admit(client, cmd):
+                        logger.warning(f"Rate limited {cmd} from {client.identifier}")
+                        await self.rejection_callback(client, cmd)
                         return
 
-                    handler = self.request_handlers.get(cmd)
-                    if handler is not None:
-                        resp = await handler(client, params)
-                        if type(resp) is str:
-                            await client.send_extension(
-                                cmd,
-                                SFSObject(resp)
-                                .putBool("success", False)
-                                .putUtfString("message", resp),
-                            )
-                        elif type(resp) is SFSObject:
-                            await client.send_extension(
-                                cmd, resp, cache=cmd in self.cached_requests
-                            )
+                    chain = self._middleware_chains.get(cmd)
+                    if chain is None:
+                        chain = self._middleware_chains[cmd] = tuple(
+                            self.middlewares
+                        ) + tuple(self._command_middlewares.get(cmd, ()))
+                    if chain:
+                        await self._handle_with_middlewares(chain, client, cmd, params)
                     else:
-                        # Как в Legacy default: success=false, те же params
-                        logger.warning(
-                            f"Unhandled request from {client.identifier}: {cmd}"
-                        )
-                        from ZewSFS.Types import SFSObject as SFSObj
-
-                        default_resp = SFSObj(params) if params else SFSObj()
-                        default_resp.putBool("success", False)
-                        await client.send_extension(cmd, default_resp)
-
+                        await self._handle_extension(client, cmd, params)
                 except (ConnectionError, asyncio.IncompleteReadError) as e:
                     asyncio.create_task(
                         self.error_callback(client, e, traceback.format_exc())
@@ -251,54 +505,377 @@ class SFSServer(SFSRouter):
             else:
                 logger.info(f"Invalid message from {client.identifier}: {request}")
 
-    async def _handle_connection(self, reader: "StreamReader", writer: "StreamWriter"):
+    async def _handle_extension(
+        self, client: "SFSServerClient", cmd: str, params: "SFSObject"
+    ) -> int:
         """
-        Handles a new client connection.
+        Answers an extension request from the response cache or through its handler.
 
-        Args:
-            reader (StreamReader): Stream reader for communication.
-            writer (StreamWriter): Stream writer for communication.
+        Returns:
+            int: The bytes of the response frame, before compression; 0 if none was sent.
         """
-        addr = writer.get_extra_info("peername")[0]
-        logger.info(f"New connection from {addr}")
-
-        client = SFSServerClient(None, addr, reader, writer, self)
-        if not await self.connection_callback(client):
-            return await client.kick()
+        if cmd in self.cached_requests and (
+            cached_response := self.response_cache.get(client, cmd)
+        ) is not None:
+            logger.info(f"Loaded {cmd} from cache")
+            await client.send(cached_response)
+            return len(cached_response)
+
+        handler = self.request_handlers.get(cmd)
+        if handler is not None:
+            if (
+                self.player_timeout is not None
+                and client.player is None
+                and cmd not in self.read_only_requests
+            ):
+                try:
+                    await client.wait_player(self.player_timeout)
+                except Exception as e:
+                    logger.warning(
+                        f"Player of {client.identifier} not ready for {cmd}: {e!r}"
+                    )
+                    await client.kick()
+                    return 0
+            admission = self.admission
+            if admission is not None and admission.is_expensive(cmd):
+                if not await admission.acquire():
+                    logger.warning(f"Refused {cmd} from {client.identifier}: server busy")
+                    await self.rejection_callback(client, cmd)
+                    return 0
+                try:
+                    resp = await handler(client, params)
+                finally:
+                    admission.release()
+            else:
+                resp = await handler(client, params)
+            return await self._send_response(
+                client, cmd, resp, cache=cmd in self.cached_requests
+            )
+
+        # Как в Legacy default: success=false, те же params
+        logger.warning(f"Unhandled request from {client.identifier}: {cmd}")
+        from ZewSFS.Types import SFSObject as SFSObj
+
+        default_resp = SFSObj(params) if params else SFSObj()
+        default_resp.putBool("success", False)
+        return await client.send_extension(cmd, default_resp)
+
+    @staticmethod
+    async def _send_response(
+        client: "SFSServerClient", cmd: str, resp, cache: bool = False
+    ) -> int:
+        """
+        Sends what a handler returned: an SFSObject as it is, a string as an error message.
 
+        Returns:
+            int: The bytes of the response frame, before compression; 0 if none was sent.
+        """
+        if type(resp) is str:
+            return await client.send_extension(
+                cmd,
+                SFSObject(resp).putBool("success", False).putUtfString("message", resp),
+            )
+        if type(resp) is SFSObject:
+            return await client.send_extension(cmd, resp, cache=cache)
+        return 0
+
+    async def _handle_with_middlewares(
+        self,
+        chain: tuple[SFSMiddleware, ...],
+        client: "SFSServerClient",
+        cmd: str,
+        params: "SFSObject",
+    ):
+        """
+        Handles an extension request between the before() and after() hooks of its middlewares.
+        """
+        started = time.perf_counter()
+        size = 0
+        error = None
+        ran = 0
         try:
-            while True:
-                await self._process_request(client, await client.read_request())
-        except ConnectionError:
-            ...
-        except asyncio.IncompleteReadError:
-            ...
-        except Exception:
-            logging.exception(traceback.format_exc())
-
-        self.remove_client(client)
-        logger.info(f"Disconnected from {addr}")
-        asyncio.create_task(client.kick())
+            for middleware in chain:
+                ran += 1
+                resp = middleware.before(client, cmd, params)
+                if resp is not None:
+                    size = await self._send_response(client, cmd, resp)
+                    break
+            else:
+                size = await self._handle_extension(client, cmd, params)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            for middleware in reversed(chain[:ran]):
+                middleware.after(client, cmd, elapsed, size, error)
 
     async def serve_forever(self):
         """
-        Starts the server and listens for incoming connections.
+        Starts the server and listens for incoming connections, until the server is drained.
         """
-        server = await asyncio.start_server(
-            self._handle_connection, self.host, self.port
+        loop = asyncio.get_running_loop()
+        if self.idle_reaper is not None:
+            self.idle_reaper.start()
+        server = await loop.create_server(
+            lambda: SFSServerProtocol(self),
+            self.host,
+            self.port,
+            reuse_port=self.reuse_port or None,
         )
+        self._listener = server
         async with server:
             logger.info(f"Serving on {self.host}:{self.port}")
-            while 1:
+            while not self.draining:
                 try:
                     await server.serve_forever()
+                except asyncio.CancelledError:
+                    # drain() closing the listener cancels serve_forever.
+                    if not self.draining:
+                        raise
                 except Exception:
                     await asyncio.sleep(5)
                     logging.exception(traceback.format_exc())
+            await self._drained.wait()
+
+    async def drain(
+        self,
+        timeout: float = 30.0,
+        notice: tuple[str, "SFSObject"] | None = None,
+    ):
+        """
+        Shuts the server down gracefully, within timeout seconds.
+
+        New connections are refused and the connected clients stop being read from, after
+        receiving notice if given. The requests already received are handled, drain_callback
+        runs (to save state that isn't yet), the outbound queues are flushed and the connections
+        closed, each client's disconnect callback included. Whatever isn't done by the deadline
+        is cut off. serve_forever returns once the drain is over; calling drain again waits for it.
+
+        Args:
+            timeout (float): The seconds the drain may take.
+            notice (tuple[str, SFSObject] | None): The command and params of a message sent to every client first.
+        """
+        if self.draining:
+            return await self._drained.wait()
+        self.draining = True
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        if self._listener is not None:
+            self._listener.close()
+        if self.idle_reaper is not None:
+            self.idle_reaper.stop()
+
+        clients = self.clients.snapshot()
+        logger.info(f"Draining {len(clients)} clients")
+        for client in clients:
+            client.writer.protocol.stop_reading()
+        if notice is not None:
+            try:
+                await self.broadcast(*notice)
+            except Exception:
+                logging.exception(traceback.format_exc())
+
+        while loop.time() < deadline and not all(
+            client.writer.protocol.is_idle() for client in clients
+        ):
+            await asyncio.sleep(_SERVER_DRAIN_POLL_INTERVAL)
+        try:
+            await asyncio.wait_for(
+                self.drain_callback(), max(0.0, deadline - loop.time())
+            )
+        except asyncio.TimeoutError:
+            logger.warning("The drain callback didn't finish in time")
+        except Exception:
+            logging.exception(traceback.format_exc())
+
+        while loop.time() < deadline and any(
+            client.outbound_depth or client.writer.get_write_buffer_size()
+            for client in clients
+            if not client.writer.is_closing()
+        ):
+            await asyncio.sleep(_SERVER_DRAIN_POLL_INTERVAL)
+        for client in clients:
+            if client.writer.is_closing():
+                continue
+            if client.outbound_depth or client.writer.get_write_buffer_size():
+                client.evict("drain deadline reached")
+            else:
+                client.writer.close()
+
+        finishing = [client.writer.protocol.wait_finished() for client in clients]
+        if finishing:
+            # Disconnect callbacks release what the clients held, give them a moment at least.
+            await asyncio.wait(
+                [asyncio.ensure_future(f) for f in finishing],
+                timeout=max(_SERVER_DRAIN_POLL_INTERVAL, deadline - loop.time()),
+            )
+        self.stop_capture()
+        logger.info("Drained")
+        self._drained.set()
+
+    async def prebuild_responses(self, cmds: Iterable[str] | None = None) -> list[str]:
+        """
+        Runs the handlers of cached commands ahead of any request and caches their responses.
+
+        The handlers are called with no client and empty params, so only commands whose response
+        is the same for every client belong here. They run concurrently, and large responses are
+        compressed in the event loop's default thread pool.
+
+        Args:
+            cmds (Iterable[str] | None): The commands to prebuild, or None for every cached command.
+
+        Returns:
+            list[str]: The commands whose response was prebuilt.
+        """
+
+        async def prebuild(cmd: str) -> bool:
+            handler = self.request_handlers.get(cmd)
+            if handler is None:
+                return False
+            try:
+                resp = await handler(None, SFSObject())
+                if type(resp) is not SFSObject:
+                    return False
+                await self.response_cache.prebuild(
+                    cmd, compile_extension_response(cmd, resp, self.max_message_size)
+                )
+            except Exception:
+                logger.exception(f"Could not prebuild the response to {cmd}")
+                return False
+            return True
+
+        cmds = list(self.cached_requests if cmds is None else cmds)
+        built = await asyncio.gather(*(prebuild(cmd) for cmd in cmds))
+        return [cmd for cmd, ok in zip(cmds, built) if ok]
+
+    async def broadcast(
+        self,
+        cmd: str,
+        params: "SFSObject | dict",
+        predicate: Callable[["SFSServerClient"], bool] | None = None,
+        schema: SFSSchema | None = None,
+    ) -> dict:
+        """
+        Sends one extension response to many clients, encoding and compressing it only once.
+
+        The frame is queued on every target client as the same bytes object, so a broadcast to
+        thousands of clients costs one encoding and one queue append per client. Clients that
+        aren't reading keep it queued like any other frame, and are evicted the same way if their
+        queue grows too large.
+
+        Args:
+            cmd (str): The command to send.
+            params (SFSObject | dict): The parameters, plain Python values if schema is given.
+            predicate (Callable | None): Selects the clients to send to, like is_logged_in or
+                has_arg("client_version", ...); every client past the handshake if None.
+            schema (SFSSchema | None): The shape of params, to encode them without building an SFSObject.
+
+        Returns:
+            dict: The clients the frame was queued for ("sent"), not selected ("skipped"),
+                already closing ("closed") and evicted by it ("evicted"), those of the sent ones
+                not reading at the moment ("waiting"), and the bytes of the frame ("bytes").
+
+        Raises:
+            CompilePacketException: If the frame is larger than max_message_size.
+        """
+        if schema is not None:
+            compiled = compile_extension_packet(schema, cmd, params, self.max_message_size)
+        else:
+            compiled = compile_extension_response(cmd, params, self.max_message_size)
+        frame = compiled
+        packet_size = packet_body_size(compiled)
+        if packet_size > self.compression_threshold:
+            if packet_size < self.compression_offload_size:
+                frame = compress_packet(compiled, self.compression_level)
+            else:
+                frame = await asyncio.get_running_loop().run_in_executor(
+                    None, compress_packet, compiled, self.compression_level
+                )
+        # Shared by every queue, so it must not be patched in place.
+        frame = bytes(frame)
+
+        stats = {"sent": 0, "skipped": 0, "closed": 0, "evicted": 0, "waiting": 0}
+        for client in self.clients:
+            if predicate is None:
+                selected = client.state != "handshake"
+            else:
+                selected = predicate(client)
+            if not selected:
+                stats["skipped"] += 1
+                continue
+            if client.writer.is_closing():
+                stats["closed"] += 1
+                continue
+            client.enqueue(frame, cmd)
+            if client.writer.is_closing():
+                stats["evicted"] += 1
+                continue
+            stats["sent"] += 1
+            if client.writing_paused:
+                stats["waiting"] += 1
+        stats["bytes"] = len(frame)
+        logger.info(
+            f"Broadcast {cmd} ({len(frame)} bytes) to {stats['sent']} clients, "
+            f"{stats['skipped']} skipped, {stats['closed'] + stats['evicted']} closed"
+        )
+        return stats
+
+    def start_capture(self, path: str) -> SFSFrameCapture:
+        """
+        Starts recording every frame of the connections opened from now on, see SFSFrameCapture.
+
+        Connections opened earlier aren't recorded, as a replay of them would miss their login.
+
+        Args:
+            path (str): The file to append the records to.
+
+        Returns:
+            SFSFrameCapture: The capture.
+        """
+        self.stop_capture()
+        self.capture = SFSFrameCapture(path)
+        logger.info(f"Capturing frames to {path}")
+        return self.capture
+
+    def stop_capture(self):
+        """
+        Stops recording frames and writes the records still buffered to the capture file.
+        """
+        if self.capture is not None:
+            capture, self.capture = self.capture, None
+            capture.close()
+            logger.info(
+                f"Captured {capture.frames} frames ({capture.bytes} bytes) to {capture.path}"
+            )
+
+    def get_cache_stats(self) -> dict:
+        """
+        Returns the hit and miss counters of the response cache.
+
+        Returns:
+            dict: The hits ("hits"), misses ("misses") and cached responses ("entries").
+        """
+        return self.response_cache.get_stats()
 
     def include_router(self, router: "SFSRouter"):
         self.request_handlers |= router.request_handlers
         self.cached_requests |= router.cached_requests
+        self.read_only_requests |= router.read_only_requests
+        if router.middlewares:
+            for cmd in router.routed_requests:
+                self._command_middlewares[cmd] = router.middlewares
+            self._middleware_chains.clear()
+
+    def add_middleware(self, middleware: SFSMiddleware):
+        """
+        Adds a middleware around every extension request, inside the middlewares added before it.
+
+        Args:
+            middleware (SFSMiddleware): The middleware.
+        """
+        self.middlewares.append(middleware)
+        self._middleware_chains.clear()
 
     def on_connect(self):
         """
@@ -333,6 +910,39 @@ class SFSServer(SFSRouter):
 
         return decorator
 
+    def on_disconnect(self):
+        """
+        Decorator for setting the disconnect callback.
+        """
+
+        def decorator(func):
+            self.disconnect_callback = func
+            return func
+
+        return decorator
+
+    def on_drain(self):
+        """
+        Decorator for setting the drain callback.
+        """
+
+        def decorator(func):
+            self.drain_callback = func
+            return func
+
+        return decorator
+
+    def on_reject(self):
+        """
+        Decorator for setting the rejection callback.
+        """
+
+        def decorator(func):
+            self.rejection_callback = func
+            return func
+
+        return decorator
+
     def on_login(self):
         """
         Decorator for setting the login callback.
@@ -1,11 +1,19 @@
 import asyncio
-import io
 import logging
-from asyncio import StreamReader, StreamWriter
+from collections import deque
+from collections.abc import Awaitable
 
 # localmodules:start
+from ZewSFS.Capture import CAPTURE_OUT
 from ZewSFS.Types import SFSObject
-from ZewSFS.Utils import compile_packet
+from ZewSFS.Schema import SFSSchema
+from ZewSFS.Utils import (
+    compile_extension_packet,
+    compile_extension_response,
+    compile_packet,
+    compress_packet,
+    packet_body_size,
+)
 # localmodules:end
 
 # from database.player import Player
@@ -20,96 +28,280 @@ class SFSServerClient:
     Attributes:
         identifier (str): The identifier for the client.
         address (str): The address of the client.
-        reader (StreamReader): Stream reader for client communication.
-        writer (StreamWriter): Stream writer for client communication.
+        writer (SFSTransportWriter): Writer for client communication.
         server (SFSServer): The server instance to which this client is connected.
         state (str): The current state of the client (e.g., 'handshake', 'login', 'play').
         args (dict): Arguments associated with the client, such as username and password.
+        player: The player the client plays as, once loaded.
+        player_ready (asyncio.Future): Resolves with the player once it is loaded, or with the error loading it.
+        max_outbound_depth (int): The most frames that were ever waiting in the outbound queue at once.
+        frames_sent (int): The number of frames written to the connection.
+        frames_shed (int): The number of stale frames dropped while the client wasn't reading.
+        flushes (int): The number of writes the frames were coalesced into.
+        last_activity (int): The tick of the server's idle reaper the client last sent data on.
+        idle_slot (int | None): The slot of the idle reaper's wheel the client is in, if watched.
+        capture (SFSFrameCapture | None): The capture recording the frames of the connection, if any.
+        capture_id (int): The id of the connection in its capture.
     """
 
     def __init__(
         self,
         identifier: str,
         address: str,
-        reader: "StreamReader",
-        writer: "StreamWriter",
+        writer: "SFSTransportWriter",
         server,
     ):
         self.identifier = identifier
-        self.reader = reader
         self.writer = writer
         self.address = address
         self.server = server
         self.state = "handshake"
         self.args = {}
         self.player = None
+        self.player_ready: asyncio.Future = asyncio.get_running_loop().create_future()
+
+        # Frames waiting for the end of the event loop tick, or for a slow client to catch up,
+        # in send order and with the command they answer. A frame still being compressed in a
+        # worker thread is queued as the future of its result.
+        self._outbound: deque[tuple[bytes | bytearray | asyncio.Future, str | None]] = deque()
+        self._outbound_size = 0
+        self._flush_handle: asyncio.Handle | None = None
+        self._write_paused = False
+        self._evict_handle: asyncio.TimerHandle | None = None
+        self.max_outbound_depth = 0
+        self.frames_sent = 0
+        self.frames_shed = 0
+        self.flushes = 0
+        # Requests being handled concurrently, see SFSServer.concurrent_requests.
+        self.request_tasks: set[asyncio.Task] = set()
+        # See SFSIdleReaper.
+        self.last_activity = 0
+        self.idle_slot: int | None = None
+        # See SFSServer.start_capture.
+        self.capture = None
+        self.capture_id = 0
 
         self.server.add_client(self)
         asyncio.create_task(self.on_created())
 
-    async def read_request(self):
+    def enqueue(self, data: bytes | bytearray | asyncio.Future, cmd: str | None = None):
         """
-        Reads a request from the client.
+        Queues a frame for the client without waiting for it to be written.
 
-        Returns:
-            SFSObject: The request object.
-        Raises:
-            ConnectionError: If the client disconnects unexpectedly.
-        """
-        packet_type = await self.reader.read(1)
-        packet_size = b""
+        Frames are written in the order they were queued. Every frame queued during one tick of
+        the event loop is written with a single writelines call once that tick's callbacks have run.
 
-        if not packet_type:
-            raise ConnectionError
+        While the client is not reading (its transport buffer is over the server's
+        outbound_high_water), frames stay in the queue instead: a frame for one of the server's
+        droppable_commands replaces the queued frame of the same command, and a client whose
+        queue grows past outbound_queue_limit is evicted.
 
-        if packet_type == b"\x88":
-            packet_size_len = 4
-        elif packet_type == b"\x80":
-            packet_size_len = 2
-        else:
+        Args:
+            data (bytes | bytearray | asyncio.Future): The frame, or a future resolving to it.
+            cmd (str | None): The command the frame answers, if it is an extension response.
+        """
+        if self.writer.is_closing():
             return
+        outbound = self._outbound
+        if self._write_paused and cmd in self.server.droppable_commands:
+            for i, (frame, queued_cmd) in enumerate(outbound):
+                if queued_cmd == cmd and not isinstance(frame, asyncio.Future):
+                    # Only the latest state of the client matters, the older frame is stale.
+                    del outbound[i]
+                    self._outbound_size -= len(frame)
+                    self.frames_shed += 1
+                    break
+        outbound.append((data, cmd))
+        if not isinstance(data, asyncio.Future):
+            self._outbound_size += len(data)
+        depth = len(outbound)
+        if depth > self.max_outbound_depth:
+            self.max_outbound_depth = depth
+        if self._write_paused:
+            if self._outbound_size > self.server.outbound_queue_limit:
+                self.evict(f"{self._outbound_size} bytes waiting to be sent")
+        elif self._outbound_size >= self.server.outbound_high_water:
+            # Don't hold a whole burst until the end of the tick, hand it to the transport now.
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_soon(self._flush)
+
+    def _flush(self):
+        """
+        Writes the queued frames up to the first one that is still being compressed.
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        outbound = self._outbound
+        if self.writer.is_closing():
+            outbound.clear()
+            self._outbound_size = 0
+            return
+        frames = []
+        while outbound and not self._write_paused:
+            frame = outbound[0][0]
+            if isinstance(frame, asyncio.Future):
+                if not frame.done():
+                    frame.add_done_callback(self._schedule_flush)
+                    break
+                outbound.popleft()
+                if frame.cancelled() or frame.exception() is not None:
+                    logger.error(
+                        f"Dropping a frame for {self.identifier} that failed to compress"
+                    )
+                    continue
+                frames.append(frame.result())
+                continue
+            outbound.popleft()
+            self._outbound_size -= len(frame)
+            frames.append(frame)
+        if frames:
+            self.writer.writelines(frames)
+            self.frames_sent += len(frames)
+            self.flushes += 1
+            if self.capture is not None:
+                self.capture.record_many(self.capture_id, CAPTURE_OUT, frames)
+
+    def _schedule_flush(self, _future: asyncio.Future = None):
+        if self._flush_handle is None and not self._write_paused:
+            self._flush_handle = asyncio.get_running_loop().call_soon(self._flush)
+
+    def pause_writing(self):
+        """
+        Called when the transport buffer goes over the server's outbound_high_water.
 
-        while packet_size_len > 0:
-            new = await self.reader.read(packet_size_len)
-            packet_size += new
-            packet_size_len -= len(new)
+        Frames are kept in the queue from now on, and the client is evicted if it is still
+        not reading after the server's slow_client_timeout.
+        """
+        self._write_paused = True
+        if self._evict_handle is None:
+            self._evict_handle = asyncio.get_running_loop().call_later(
+                self.server.slow_client_timeout,
+                self.evict,
+                f"not reading for {self.server.slow_client_timeout} seconds",
+            )
+
+    def resume_writing(self):
+        """
+        Called when the transport buffer drops under the server's outbound_low_water.
+        """
+        self._write_paused = False
+        if self._evict_handle is not None:
+            self._evict_handle.cancel()
+            self._evict_handle = None
+        self._schedule_flush()
+
+    def evict(self, reason: str):
+        """
+        Drops the connection of a client that doesn't keep up, discarding everything not yet sent.
 
-        packet_size = int.from_bytes(packet_size, "big")
+        Args:
+            reason (str): Why the client is evicted, for the log.
+        """
+        logger.warning(f"Evicting {self.identifier} ({self.address}): {reason}")
+        if self._evict_handle is not None:
+            self._evict_handle.cancel()
+            self._evict_handle = None
+        self._outbound.clear()
+        self._outbound_size = 0
+        self.server.remove_client(self)
+        # Unlike close(), abort() doesn't wait for the peer to take the buffered data.
+        self.writer.abort()
+
+    @property
+    def writing_paused(self) -> bool:
+        """
+        Whether the client isn't reading, so frames wait in the outbound queue.
+        """
+        return self._write_paused
 
-        request = io.BytesIO()
+    @property
+    def outbound_depth(self) -> int:
+        """
+        The number of frames waiting in the outbound queue.
+        """
+        return len(self._outbound)
 
-        rlen = 0
-        while rlen < packet_size:
-            chunk_size = min(packet_size - rlen, 4096 * 4)
-            request.write(await self.reader.read(chunk_size))
-            rlen = len(request.getbuffer())
+    def get_outbound_stats(self) -> dict:
+        """
+        Returns the outbound queue metrics of the client.
 
-        request.seek(0)
-        request = SFSObject.unpack(request, skip_type=True)
-        return request
+        Returns:
+            dict: The queued frames ("depth") and bytes ("queued"), the largest depth seen
+                ("max_depth"), the frames written ("frames"), shed ("shed") and the writes they
+                took ("flushes"), and the bytes the transport still holds ("buffered").
+        """
+        return {
+            "depth": len(self._outbound),
+            "queued": self._outbound_size,
+            "max_depth": self.max_outbound_depth,
+            "frames": self.frames_sent,
+            "shed": self.frames_shed,
+            "flushes": self.flushes,
+            "buffered": self.writer.get_write_buffer_size(),
+        }
 
     async def send(self, data: bytes):
         """
         Sends data to the client.
 
+        The frame is queued behind the ones sent before it, and the call waits until the
+        connection can take more data.
+
         Args:
             data (bytes): The data to be sent.
         """
+        self.enqueue(data)
         try:
-            self.writer.write(data)
             await self.writer.drain()
         except ConnectionError:
             logger.error("Client closed connection, can't send!")
             self.server.remove_client(self)
             return
 
+    async def compress(self, packet: bytes | bytearray) -> bytes | bytearray:
+        """
+        Compresses a compiled packet whose body is larger than the server's compression_threshold.
+
+        Bodies of at least compression_offload_size bytes are compressed in the event loop's
+        default thread pool, so a large response doesn't stall the other clients; zlib releases
+        the GIL while it works.
+
+        Args:
+            packet (bytes | bytearray): The compiled packet.
+
+        Returns:
+            bytes | bytearray: The packet to send, compressed or not.
+        """
+        packet = self._start_compress(packet)
+        if isinstance(packet, asyncio.Future):
+            packet = await packet
+        return packet
+
+    def _start_compress(
+        self, packet: bytes | bytearray
+    ) -> bytes | bytearray | asyncio.Future:
+        """
+        Compresses a packet as compress() does, returning a future if the work went to a thread.
+        """
+        server = self.server
+        packet_size = packet_body_size(packet)
+        if packet_size <= server.compression_threshold:
+            return packet
+        if packet_size < server.compression_offload_size:
+            return compress_packet(packet, server.compression_level)
+        return asyncio.get_running_loop().run_in_executor(
+            None, compress_packet, packet, server.compression_level
+        )
+
     async def send_handshake(self):
         """
         Sends a handshake response to the client.
         """
         params = SFSObject()
-        params.putInt("ct", 1000000)
-        params.putInt("ms", 8000000)
+        params.putInt("ct", self.server.compression_threshold)
+        params.putInt("ms", self.server.max_message_size)
         params.putUtfString("tk", "5c4ac8dbfb323e39053dcb3ee261bc93")
 
         resp = SFSObject()
@@ -117,7 +309,7 @@ class SFSServerClient:
         resp.putShort("a", 0)
         resp.putSFSObject("p", params)
 
-        asyncio.create_task(self.send(compile_packet(resp)))
+        self.enqueue(compile_packet(resp))
 
     async def send_and_wait(self, cmd, params):
         """
@@ -137,45 +329,64 @@ class SFSServerClient:
         packet.putShort("a", 13)
         packet.putSFSObject("p", request)
 
-        pkg = compile_packet(packet)
-        await self.send(pkg)
+        pkg = compile_packet(packet, self.server.max_message_size)
+        await self.send(self._start_compress(pkg))
 
-    async def send_extension(self, cmd, params, cache: bool = False):
+    async def send_extension(
+        self, cmd, params, cache: bool = False, schema: SFSSchema | None = None
+    ):
         """
         Sends an extension request to the client.
 
         Args:
             cmd (str): The command to be sent.
-            params (SFSObject): The parameters for the command.
-        """
-        request = SFSObject()
-        request.putUtfString("c", cmd)
-        request.putInt("r", -1)
-        request.putSFSObject("p", params)
+            params (SFSObject | dict): The parameters for the command, plain Python values if schema is given.
+            cache (bool): Whether to keep the compiled packet in the server's response cache.
+                Cached packets are compressed once, up to their time fields.
+            schema (SFSSchema | None): The shape of params, to encode them without building an SFSObject.
 
-        packet = SFSObject()
-        packet.putByte("c", 1)
-        packet.putShort("a", 13)
-        packet.putSFSObject("p", request)
+        Returns:
+            int: The bytes of the compiled packet, before compression.
 
+        Raises:
+            CompilePacketException: If the response is larger than the server's max_message_size.
+        """
         logger.info(f"Sending {cmd} to {self.identifier}")
         logger.debug(params)
 
-        compiled = compile_packet(packet)
+        if schema is not None:
+            compiled = compile_extension_packet(
+                schema, cmd, params, self.server.max_message_size
+            )
+        else:
+            compiled = compile_extension_response(
+                cmd, params, self.server.max_message_size
+            )
+        size = len(compiled)
         if cache:
-            self.server.cached_requests[cmd] = compiled
+            self.enqueue(
+                await self.server.response_cache.store(self, cmd, compiled), cmd
+            )
             logger.info(f"Saved {cmd} to cache")
-        asyncio.create_task(self.send(compiled))
+            return size
+        # Queued before compression finishes, so the frame keeps its place among the
+        # frames sent after it.
+        self.enqueue(self._start_compress(compiled), cmd)
+        return size
 
     def set_arg(self, key, value):
         """
         Sets an argument for the client.
 
+        Setting "bbb_id" also indexes the client by it in the server's client registry.
+
         Args:
             key (str): The key of the argument.
             value (Any): The value of the argument.
         """
         self.args[key] = value
+        if key == "bbb_id":
+            self.server.clients.set_bbb_id(self, value)
 
     def get_arg(self, key, default=None):
         """
@@ -190,6 +401,68 @@ class SFSServerClient:
         """
         return self.args.get(key, default)
 
+    def set_player(self, player):
+        """
+        Sets the player of the client and resolves player_ready with it.
+
+        Args:
+            player: The loaded player.
+        """
+        self.player = player
+        if not self.player_ready.done():
+            self.player_ready.set_result(player)
+
+    def prefetch_player(self, loader: Awaitable) -> asyncio.Task:
+        """
+        Loads the player of the client in the background.
+
+        player_ready resolves with what loader returns, or with the exception it raises.
+
+        Args:
+            loader (Awaitable): Loads and returns the player.
+
+        Returns:
+            asyncio.Task: The task loading the player.
+        """
+        task = asyncio.ensure_future(loader)
+        task.add_done_callback(self._on_player_loaded)
+        return task
+
+    def _on_player_loaded(self, task: asyncio.Task):
+        if self.player_ready.done():
+            return
+        if task.cancelled():
+            error = ConnectionAbortedError("Player load cancelled")
+        elif task.exception() is not None:
+            error = task.exception()
+            logger.error(
+                f"Could not load the player of {self.identifier}", exc_info=error
+            )
+        else:
+            self.set_player(task.result())
+            return
+        self.player_ready.set_exception(error)
+        # Waiting for the player is optional, so the error counts as retrieved.
+        self.player_ready.exception()
+
+    async def wait_player(self, timeout: float | None = None):
+        """
+        Waits until the player of the client is loaded.
+
+        Args:
+            timeout (float | None): The most seconds to wait, or None to wait as long as it takes.
+
+        Returns:
+            The player.
+
+        Raises:
+            asyncio.TimeoutError: If the player isn't loaded within timeout.
+            Exception: Whatever loading the player failed with.
+        """
+        if self.player_ready.done():
+            return self.player_ready.result()
+        return await asyncio.wait_for(asyncio.shield(self.player_ready), timeout)
+
     async def kick(self):
         """
         Kicks the client from the server.
@@ -206,7 +479,6 @@ class SFSServerClient:
         Destructor for the client instance.
         """
         logger.info(f"Client {self.identifier} deleted")
-        del self.reader
         del self.writer
         del self.args
 
@@ -1,5 +1,11 @@
 # localmodules:start
 from .Server import *
 from .ServerClient import *
+from .Protocol import *
+from .Registry import *
+from .Middleware import *
+from .IdleReaper import *
+from .Admission import *
+from .ResponseCache import *
 from .Router import *
 # localmodules:end
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import array
+import struct
+import sys
+
+_NATIVE_LITTLE_ENDIAN = sys.byteorder == "little"
+# Kind of value held by each buffer format character, to tell compatible buffers apart.
+_ARRAY_ITEM_KINDS = (
+    dict.fromkeys("bhilqn", "signed")
+    | dict.fromkeys("BHILQN", "unsigned")
+    | dict.fromkeys("efd", "float")
+)
+
+
+def _is_little_endian(buffer_format: str) -> bool:
+    """
+    Tells whether a buffer format describes little-endian items.
+    """
+    if buffer_format[:1] in (">", "!"):
+        return False
+    if buffer_format[:1] == "<":
+        return True
+    return _NATIVE_LITTLE_ENDIAN
+
+
+def _check_encoded_size(nbytes: int, itemsize: int):
+    """
+    Raises ValueError if an already encoded buffer of nbytes doesn't end on an item boundary.
+    """
+    if nbytes % itemsize:
+        raise ValueError(
+            f"Encoded array of {nbytes} bytes is not a multiple of its {itemsize} bytes items"
+        )
+
+
+def encode_numeric_array(values, typecode: str) -> tuple[int, memoryview]:
+    """
+    Converts the items of a numeric array into their big-endian wire representation in one step.
+
+    Lists and tuples are converted by array.array. Any object exposing the buffer protocol
+    (array.array, bytes, bytearray, memoryview, NumPy arrays) is used as is: buffers already in
+    big-endian order are passed through without a copy, native ones are copied once and
+    byteswapped, and single-byte buffers given for wider items are treated as already encoded.
+    Strided buffers are copied into one contiguous run first, and items of another size or kind
+    are converted one by one in the byte order their format gives.
+
+    Args:
+        values: The items to encode.
+        typecode (str): The array.array typecode of a single item.
+
+    Returns:
+        tuple[int, memoryview]: The number of items and a byte view over their encoded form.
+
+    Raises:
+        ValueError: If an encoded byte buffer doesn't hold a whole number of items.
+    """
+    itemsize = array.array(typecode).itemsize
+    if isinstance(values, (list, tuple)):
+        items = array.array(typecode, values)
+    else:
+        view = memoryview(values)
+        buffer_format = view.format
+        # Strided buffers are copied into one contiguous run; buffer_format still describes it.
+        raw = view.cast("B") if view.c_contiguous else memoryview(view.tobytes())
+        if view.itemsize == 1 and (itemsize == 1 or buffer_format in ("B", "b", "c")):
+            _check_encoded_size(raw.nbytes, itemsize)
+            return raw.nbytes // itemsize, raw
+        item_format = buffer_format[-1:]
+        if view.itemsize != itemsize or _ARRAY_ITEM_KINDS.get(
+            item_format
+        ) != _ARRAY_ITEM_KINDS.get(typecode):
+            if item_format in ("n", "N"):
+                byte_order = "@"
+            else:
+                byte_order = "<" if _is_little_endian(buffer_format) else ">"
+            count = raw.nbytes // view.itemsize
+            items = array.array(
+                typecode, struct.unpack(f"{byte_order}{count}{item_format}", raw)
+            )
+        elif not _is_little_endian(buffer_format):
+            return raw.nbytes // itemsize, raw
+        else:
+            items = array.array(typecode)
+            items.frombytes(raw)
+            items.byteswap()
+            return len(items), memoryview(items).cast("B")
+    if _NATIVE_LITTLE_ENDIAN and itemsize > 1:
+        items.byteswap()
+    return len(items), memoryview(items).cast("B")
+
+
+def numeric_array_size(values, typecode: str) -> int:
+    """
+    Returns the number of bytes encode_numeric_array produces for values, without encoding them.
+
+    Args:
+        values: The items to encode.
+        typecode (str): The array.array typecode of a single item.
+
+    Returns:
+        int: The size of the encoded items, without their count prefix.
+
+    Raises:
+        ValueError: If an encoded byte buffer doesn't hold a whole number of items.
+    """
+    itemsize = array.array(typecode).itemsize
+    if isinstance(values, (list, tuple)):
+        return len(values) * itemsize
+    view = memoryview(values)
+    if view.itemsize == 1 and (itemsize == 1 or view.format in ("B", "b", "c")):
+        _check_encoded_size(view.nbytes, itemsize)
+        return view.nbytes
+    return view.nbytes // view.itemsize * itemsize
+
+
+def decode_numeric_array(buffer: memoryview | bytes, typecode: str) -> array.array:
+    """
+    Decodes big-endian numeric items from a buffer in one step.
+
+    Args:
+        buffer (memoryview | bytes): The encoded items, without their count prefix.
+        typecode (str): The array.array typecode of a single item.
+
+    Returns:
+        array.array: The decoded items in native byte order.
+    """
+    items = array.array(typecode)
+    items.frombytes(buffer)
+    if _NATIVE_LITTLE_ENDIAN and items.itemsize > 1:
+        items.byteswap()
+    return items
@@ -1,9 +1,27 @@
+import functools
 import io
 import typing
 
 OBJType = typing.TypeVar("OBJType")
 
 
+@functools.lru_cache(maxsize=4096)
+def encode_sfs_name(name: str) -> bytes:
+    """
+    Encodes a key name as it is written on the wire: a 2-byte big-endian byte length followed by UTF-8.
+
+    Results are cached, since the same handful of keys is written for every object of a given shape.
+
+    Args:
+        name (str): The name to encode.
+
+    Returns:
+        bytes: The length-prefixed UTF-8 name.
+    """
+    encoded = name.encode("utf-8")
+    return len(encoded).to_bytes(2, "big") + encoded
+
+
 class BaseType:
     """
     BaseType is a class that represents a base type.
@@ -12,6 +30,7 @@ class BaseType:
         __type (str): The type of the object.
         __name (str): The name of the object.
         __value (OBJType): The value of the object.
+        is_fragment (bool): Whether the object is an encoded RawSFS standing in for an SFSObject or SFSArray.
 
     Methods:
         __str__(self) -> str: Returns a string representation of the object.
@@ -21,14 +40,24 @@ class BaseType:
         set_type(self, new_type: OBJType): Sets the type of the object.
         get_value(self) -> OBJType: Returns the value of the object.
         set_value(self, new_value: OBJType): Sets the value of the object.
+        pack(self) -> bytes: Returns the packed name and value of the object.
+        pack_into(self, buf: bytearray, offset: int) -> int: Writes the packed name and value into buf.
+        pack_value_into(self, buf: bytearray, offset: int) -> int: Writes the type id and value into buf.
+        encoded_size(self) -> int: Returns the number of bytes pack_value_into writes.
         pack_name(self) -> bytes: Returns the packed name of the object.
         unpack_name(buffer: io.BytesIO) -> str: Unpacks the name from the buffer.
     """
 
-    __type: str = "undefined"
+    # Values are stored in slots rather than a per-instance __dict__, which keeps the
+    # many small nodes of a large object tree compact.
+    __slots__ = ("__type", "__name", "__value")
+
+    __type: str
     __name: str
     __value: OBJType
 
+    is_fragment = False
+
     def __init__(self, object_type: str, name: str, value: OBJType):
         """
         Constructs a new BaseType object.
@@ -116,12 +145,63 @@ class BaseType:
             bytes: The packed name of the object, or an empty byte string if the name is empty.
         """
         if isinstance(self.__name, str) and len(self.__name) != 0:
-            name_length = len(self.__name)
-            encoded_name = self.__name.encode("utf-8")
-            return name_length.to_bytes(2, "big") + encoded_name
+            return encode_sfs_name(self.__name)
         else:
             return b""
 
+    def pack(self) -> bytes:
+        """
+        Returns the packed name of the object followed by its type id and value.
+
+        Returns:
+            bytes: The packed representation of the object.
+        """
+        buf = bytearray()
+        self.pack_into(buf, 0)
+        return bytes(buf)
+
+    def pack_into(self, buf: bytearray | memoryview, offset: int = 0) -> int:
+        """
+        Writes the packed name of the object followed by its type id and value into buf.
+
+        A bytearray grows as needed when writing at its end; a memoryview must already be large enough.
+
+        Args:
+            buf (bytearray | memoryview): The buffer to write into.
+            offset (int): The position in buf to start writing at.
+
+        Returns:
+            int: The offset just past the written data.
+        """
+        if isinstance(self.__name, str) and len(self.__name) != 0:
+            encoded_name = encode_sfs_name(self.__name)
+            end = offset + len(encoded_name)
+            buf[offset:end] = encoded_name
+            offset = end
+        return self.pack_value_into(buf, offset)
+
+    def pack_value_into(self, buf: bytearray | memoryview, offset: int = 0) -> int:
+        """
+        Writes the type id and value of the object (without its name) into buf.
+
+        Args:
+            buf (bytearray | memoryview): The buffer to write into.
+            offset (int): The position in buf to start writing at.
+
+        Returns:
+            int: The offset just past the written data.
+        """
+        raise NotImplementedError(f"{type(self).__name__} can't be packed")
+
+    def encoded_size(self) -> int:
+        """
+        Returns the number of bytes pack_value_into writes, without encoding the object.
+
+        Returns:
+            int: The size of the type id and value of the object.
+        """
+        raise NotImplementedError(f"{type(self).__name__} can't be packed")
+
     @staticmethod
     def unpack_name(buffer: io.BytesIO | bytes) -> str:
         """
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import io
+import struct
 
 # localmodules:start
 from .BaseType import BaseType
 # localmodules:end
 
+_BOOL_ENTRY = struct.Struct(">B?")
+
 
 class Bool(BaseType):
     """
@@ -14,9 +17,14 @@ class Bool(BaseType):
     Methods:
         __init__(self, name: str, value: bool): Constructs a new Bool object.
         pack(self) -> bytes: Returns the packed name of the object followed by a byte representing the boolean value.
+        pack_value_into(self, buf: bytearray, offset: int) -> int: Writes the type id followed by a byte representing the boolean value into buf.
+        encoded_size(self) -> int: Returns the number of bytes pack_value_into writes.
         unpack(buffer: io.BytesIO, name: str | None = None) -> Bool: Unpacks a Bool object from the given buffer.
+        unpack_from(buffer: memoryview, offset: int, name: str | None = None) -> tuple[Bool, int]: Decodes a Bool object from a buffer without copying it.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, value: bool):
         """
         Constructs a new Bool object.
@@ -27,14 +35,29 @@ class Bool(BaseType):
         """
         super().__init__("bool", name, value)
 
-    def pack(self) -> bytes:
+    def pack_value_into(self, buf: bytearray | memoryview, offset: int = 0) -> int:
+        """
+        Writes the type id followed by a byte representing the boolean value into buf.
+
+        Args:
+            buf (bytearray | memoryview): The buffer to write into.
+            offset (int): The position in buf to start writing at.
+
+        Returns:
+            int: The offset just past the written data.
+        """
+        end = offset + 2
+        buf[offset:end] = _BOOL_ENTRY.pack(1, self.get_value())
+        return end
+
+    def encoded_size(self) -> int:
         """
-        Returns the packed name of the Bool object followed by a byte representing the boolean value.
+        Returns the number of bytes pack_value_into writes: the type id and the boolean value.
 
         Returns:
-            bytes: The packed name of the object followed by a byte representing the boolean value.
+            int: The encoded size.
         """
-        return self.pack_name() + bytes([1]) + self.get_value().to_bytes(1, "big")
+        return 2
 
     @staticmethod
     def unpack(buffer: io.BytesIO | bytes, name: str | None | bool = None) -> Bool:
@@ -53,3 +76,20 @@ class Bool(BaseType):
         if isinstance(name, bool) and name:
             name = BaseType.unpack_name(buffer)
         return Bool(name, bool.from_bytes(buffer.read(1), "big"))
+
+    @staticmethod
+    def unpack_from(
+        buffer: memoryview | bytes, offset: int = 0, name: str | None = None
+    ) -> tuple[Bool, int]:
+        """
+        Decodes a boolean value starting at offset, just past its type id.
+
+        Args:
+            buffer (memoryview | bytes): The buffer to decode from.
+            offset (int): The position of the value in buffer.
+            name (str | None): The name of the Bool object.
+
+        Returns:
+            tuple[Bool, int]: The decoded Bool object and the offset just past it.
+        """
+        return Bool(name, buffer[offset] != 0), offset + 1
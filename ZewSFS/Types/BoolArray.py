@@ -4,9 +4,17 @@ import io
 import struct
 
 # localmodules:start
+from .ArrayCodec import (
+    decode_numeric_array,
+    encode_numeric_array,
+    numeric_array_size,
+)
 from .BaseType import BaseType
 # localmodules:end
 
+_BOOL_ARRAY_HEADER = struct.Struct(">BH")
+_BOOL_ARRAY_LENGTH = struct.Struct(">H")
+
 
 class BoolArray(BaseType):
     """
@@ -18,9 +26,14 @@ class BoolArray(BaseType):
 
     Methods:
         pack(): Returns a bytes representation of the boolean array.
+        pack_value_into(buf, offset): Writes the type id followed by the length-prefixed boolean array into buf.
+        encoded_size(): Returns the number of bytes pack_value_into writes.
         unpack(buffer, name): Static method that returns a BoolArray instance from a bytes buffer.
+        unpack_from(buffer, offset, name, typed): Static method that decodes a BoolArray instance from a memoryview, optionally as a typed array.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, value: list[bool]):
         """
         Constructs a new BoolArray instance.
@@ -31,17 +44,35 @@ class BoolArray(BaseType):
         """
         super().__init__("bool_array", name, value)
 
-    def pack(self) -> bytes:
+    def pack_value_into(self, buf: bytearray | memoryview, offset: int = 0) -> int:
+        """
+        Writes the type id followed by the length-prefixed boolean array into buf.
+
+        The items are encoded in one step; array.array, bytes-like and other buffer
+        objects are accepted as the value alongside lists.
+
+        Args:
+            buf (bytearray | memoryview): The buffer to write into.
+            offset (int): The position in buf to start writing at.
+
+        Returns:
+            int: The offset just past the written data.
+        """
+        length, payload = encode_numeric_array(self.get_value(), "B")
+        start = offset + 3
+        end = start + len(payload)
+        buf[offset:start] = _BOOL_ARRAY_HEADER.pack(9, length)
+        buf[start:end] = payload
+        return end
+
+    def encoded_size(self) -> int:
         """
-        Packs the boolean array into bytes.
+        Returns the number of bytes pack_value_into writes: the type id, the item count and the items.
 
         Returns:
-            bytes: The bytes representation of the boolean array.
+            int: The encoded size.
         """
-        result = len(self.get_value()).to_bytes(2, "big")
-        for i in self.get_value():
-            result += bytes([i])
-        return self.pack_name() + bytes([9]) + result
+        return 3 + numeric_array_size(self.get_value(), "B")
 
     @staticmethod
     def unpack(buffer: io.BytesIO | bytes, name: str | None = None) -> BoolArray:
@@ -61,7 +92,29 @@ class BoolArray(BaseType):
             name = BaseType.unpack_name(buffer)
 
         length = int.from_bytes(buffer.read(2), "big")
-        array = []
-        for _ in range(length):
-            array.append(bool.from_bytes(buffer.read(1), "big"))
-        return BoolArray(name, array)
+        items = decode_numeric_array(buffer.read(length), "B")
+        return BoolArray(name, [i != 0 for i in items])
+
+    @staticmethod
+    def unpack_from(
+        buffer: memoryview | bytes,
+        offset: int = 0,
+        name: str | None = None,
+        typed: bool = False,
+    ) -> tuple[BoolArray, int]:
+        """
+        Decodes a length-prefixed boolean array starting at offset, just past its type id.
+
+        Args:
+            buffer (memoryview | bytes): The buffer to decode from.
+            offset (int): The position of the value in buffer.
+            name (str | None): The name of the BoolArray object.
+            typed (bool): Whether to keep the items as an array.array('B') instead of a list.
+
+        Returns:
+            tuple[BoolArray, int]: The decoded BoolArray object and the offset just past it.
+        """
+        start = offset + 2
+        end = start + _BOOL_ARRAY_LENGTH.unpack_from(buffer, offset)[0]
+        items = decode_numeric_array(buffer[start:end], "B")
+        return BoolArray(name, items if typed else [i != 0 for i in items]), end
@@ -14,9 +14,14 @@ class Byte(BaseType):
     Methods:
         __init__(self, name: str, value: int | bytes): Constructs a new Byte object.
         pack(self) -> bytes: Returns the packed name of the object followed by a byte representing the byte value.
+        pack_value_into(self, buf: bytearray, offset: int) -> int: Writes the type id followed by the byte value into buf.
+        encoded_size(self) -> int: Returns the number of bytes pack_value_into writes.
         unpack(buffer: io.BytesIO, name: str | None = None) -> Byte: Unpacks a Byte object from the given buffer.
+        unpack_from(buffer: memoryview, offset: int, name: str | None = None) -> tuple[Byte, int]: Decodes a Byte object from a buffer without copying it.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, value: int | bytes):
         """
         Constructs a new Byte object.
@@ -29,14 +34,29 @@ class Byte(BaseType):
             value = value.to_bytes(1, "big", signed=True)
         super().__init__("byte", name, value)
 
-    def pack(self) -> bytes:
+    def pack_value_into(self, buf: bytearray | memoryview, offset: int = 0) -> int:
         """
-        Returns the packed name of the Byte object followed by a byte representing the byte value.
+        Writes the type id followed by the byte value into buf.
+
+        Args:
+            buf (bytearray | memoryview): The buffer to write into.
+            offset (int): The position in buf to start writing at.
 
         Returns:
-            bytes: The packed name of the object followed by a byte representing the byte value.
+            int: The offset just past the written data.
+        """
+        end = offset + 2
+        buf[offset:end] = b"\x02" + self.get_value()
+        return end
+
+    def encoded_size(self) -> int:
         """
-        return self.pack_name() + bytes([2]) + self.get_value()
+        Returns the number of bytes pack_value_into writes: the type id and the byte value.
+
+        Returns:
+            int: The encoded size.
+        """
+        return 2
 
     @staticmethod
     def unpack(buffer: io.BytesIO | bytes, name: str | None = None) -> Byte:
@@ -55,3 +75,21 @@ class Byte(BaseType):
         if isinstance(name, bool) and name:
             name = BaseType.unpack_name(buffer)
         return Byte(name, buffer.read(1))
+
+    @staticmethod
+    def unpack_from(
+        buffer: memoryview | bytes, offset: int = 0, name: str | None = None
+    ) -> tuple[Byte, int]:
+        """
+        Decodes a byte value starting at offset, just past its type id.
+
+        Args:
+            buffer (memoryview | bytes): The buffer to decode from.
+            offset (int): The position of the value in buffer.
+            name (str | None): The name of the Byte object.
+
+        Returns:
+            tuple[Byte, int]: The decoded Byte object and the offset just past it.
+        """
+        end = offset + 1
+        return Byte(name, bytes(buffer[offset:end])), end
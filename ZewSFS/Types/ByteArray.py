@@ -4,9 +4,17 @@ import io
 import struct
 
 # localmodules:start
+from .ArrayCodec import (
+    decode_numeric_array,
+    encode_numeric_array,
+    numeric_array_size,
+)
 from .BaseType import BaseType
 # localmodules:end
 
+_BYTE_ARRAY_HEADER = struct.Struct(">BI")
+_BYTE_ARRAY_LENGTH = struct.Struct(">I")
+
 
 class ByteArray(BaseType):
     """
@@ -18,32 +26,53 @@ class ByteArray(BaseType):
 
     Methods:
         pack(): Returns a bytes representation of the bytearray.
+        pack_value_into(buf, offset): Writes the type id followed by the length-prefixed bytearray into buf.
+        encoded_size(): Returns the number of bytes pack_value_into writes.
         unpack(buffer, name): Static method that returns a ByteArray instance from a bytes buffer.
+        unpack_from(buffer, offset, name, typed): Static method that decodes a ByteArray instance from a memoryview, optionally as a typed array.
     """
 
-    def __init__(self, name: str, value: list[int] | bytearray):
+    __slots__ = ()
+
+    def __init__(self, name: str, value: list[int] | bytes | bytearray):
         """
         Constructs a new ByteArray instance.
 
         Args:
             name (str): The name of the bytearray.
-            value (list[int] | bytearray): The bytearray or list of integers.
+            value (list[int] | bytes | bytearray): The list of integers or a bytes-like object, which is kept as is.
         """
-        if isinstance(value, bytearray):
-            value = list(value)
         super().__init__("byte_array", name, value)
 
-    def pack(self) -> bytes:
+    def pack_value_into(self, buf: bytearray | memoryview, offset: int = 0) -> int:
+        """
+        Writes the type id followed by the length-prefixed bytearray into buf.
+
+        The items are encoded in one step; array.array, bytes-like and other buffer
+        objects are accepted as the value alongside lists.
+
+        Args:
+            buf (bytearray | memoryview): The buffer to write into.
+            offset (int): The position in buf to start writing at.
+
+        Returns:
+            int: The offset just past the written data.
+        """
+        length, payload = encode_numeric_array(self.get_value(), "b")
+        start = offset + 5
+        end = start + len(payload)
+        buf[offset:start] = _BYTE_ARRAY_HEADER.pack(10, length)
+        buf[start:end] = payload
+        return end
+
+    def encoded_size(self) -> int:
         """
-        Packs the bytearray into bytes.
+        Returns the number of bytes pack_value_into writes: the type id, the item count and the items.
 
         Returns:
-            bytes: The bytes representation of the bytearray.
+            int: The encoded size.
         """
-        result = len(self.get_value()).to_bytes(4, "big")
-        for i in self.get_value():
-            result += i.to_bytes(1, "big", signed=True)
-        return self.pack_name() + bytes([10]) + result
+        return 5 + numeric_array_size(self.get_value(), "b")
 
     @staticmethod
     def unpack(buffer: io.BytesIO | bytes, name: str | None = None) -> ByteArray:
@@ -63,7 +92,29 @@ class ByteArray(BaseType):
             name = BaseType.unpack_name(buffer)
 
         length = int.from_bytes(buffer.read(4), "big")
-        array = []
-        for _ in range(length):
-            array.append(int.from_bytes(buffer.read(1), "big", signed=True))
-        return ByteArray(name, array)
+        items = decode_numeric_array(buffer.read(length), "b")
+        return ByteArray(name, items.tolist())
+
+    @staticmethod
+    def unpack_from(
+        buffer: memoryview | bytes,
+        offset: int = 0,
+        name: str | None = None,
+        typed: bool = False,
+    ) -> tuple[ByteArray, int]:
+        """
+        Decodes a length-prefixed bytearray starting at offset, just past its type id.
+
+        Args:
+            buffer (memoryview | bytes): The buffer to decode from.
+            offset (int): The position of the value in buffer.
+            name (str | None): The name of the ByteArray object.
+            typed (bool): Whether to keep the items as an array.array('b') instead of a list.
+
+        Returns:
+            tuple[ByteArray, int]: The decoded ByteArray object and the offset just past it.
+        """
+        start = offset + 4
+        end = start + _BYTE_ARRAY_LENGTH.unpack_from(buffer, offset)[0]
+        items = decode_numeric_array(buffer[start:end], "b")
+        return ByteArray(name, items if typed else items.tolist()), end
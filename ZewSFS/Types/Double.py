@@ -7,6 +7,9 @@ import struct
 from .BaseType import BaseType
 # localmodules:end
 
+_DOUBLE_ENTRY = struct.Struct(">Bd")
+_DOUBLE_VALUE = struct.Struct(">d")
+
 
 class Double(BaseType):
     """
@@ -15,9 +18,14 @@ class Double(BaseType):
     Methods:
         __init__(self, name: str, value: int | bytes): Constructs a new Double object.
         pack(self) -> bytes: Returns the packed name of the object followed by a byte representing the double value.
+        pack_value_into(self, buf: bytearray, offset: int) -> int: Writes the type id followed by the double value into buf.
+        encoded_size(self) -> int: Returns the number of bytes pack_value_into writes.
         unpack(buffer: io.BytesIO, name: str | None = None) -> Byte: Unpacks a Double object from the given buffer.
+        unpack_from(buffer: memoryview, offset: int, name: str | None = None) -> tuple[Double, int]: Decodes a Double object from a buffer without copying it.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, value: float):
         """
         Constructs a new Double object.
@@ -28,18 +36,29 @@ class Double(BaseType):
         """
         super().__init__("double", name, value)
 
-    def pack(self) -> bytes:
+    def pack_value_into(self, buf: bytearray | memoryview, offset: int = 0) -> int:
+        """
+        Writes the type id followed by the double value into buf.
+
+        Args:
+            buf (bytearray | memoryview): The buffer to write into.
+            offset (int): The position in buf to start writing at.
+
+        Returns:
+            int: The offset just past the written data.
+        """
+        end = offset + 9
+        buf[offset:end] = _DOUBLE_ENTRY.pack(7, self.get_value())
+        return end
+
+    def encoded_size(self) -> int:
         """
-        Returns the packed name of the Double object followed by a byte representing the double value.
+        Returns the number of bytes pack_value_into writes: the type id and the double value.
 
         Returns:
-            bytes: The packed name of the object followed by a byte representing the double value.
+            int: The encoded size.
         """
-        return (
-            self.pack_name()
-            + bytes([7])
-            + bytearray(struct.pack("d", self.get_value()))[::-1]
-        )
+        return 9
 
     @staticmethod
     def unpack(buffer: io.BytesIO | bytes, name: str | None = None) -> Double:
@@ -59,3 +78,20 @@ class Double(BaseType):
             name = BaseType.unpack_name(buffer)
 
         return Double(name, float(struct.unpack("d", buffer.read(8)[::-1])[0]))
+
+    @staticmethod
+    def unpack_from(
+        buffer: memoryview | bytes, offset: int = 0, name: str | None = None
+    ) -> tuple[Double, int]:
+        """
+        Decodes a double value starting at offset, just past its type id.
+
+        Args:
+            buffer (memoryview | bytes): The buffer to decode from.
+            offset (int): The position of the value in buffer.
+            name (str | None): The name of the Double object.
+
+        Returns:
+            tuple[Double, int]: The decoded Double object and the offset just past it.
+        """
+        return Double(name, _DOUBLE_VALUE.unpack_from(buffer, offset)[0]), offset + 8
@@ -7,6 +7,10 @@ import struct
 from .BaseType import BaseType
 # localmodules:end
 
+# Scalar floats have always been written in native byte order, unlike FloatArray.
+_FLOAT_ENTRY = struct.Struct("=Bf")
+_FLOAT_VALUE = struct.Struct("=f")
+
 
 class Float(BaseType):
     """
@@ -15,9 +19,14 @@ class Float(BaseType):
     Methods:
         __init__(self, name: str, value: int | bytes): Constructs a new Float object.
         pack(self) -> bytes: Returns the packed name of the object followed by a byte representing the float value.
+        pack_value_into(self, buf: bytearray, offset: int) -> int: Writes the type id followed by the float value into buf.
+        encoded_size(self) -> int: Returns the number of bytes pack_value_into writes.
         unpack(buffer: io.BytesIO, name: str | None = None) -> Byte: Unpacks a Float object from the given buffer.
+        unpack_from(buffer: memoryview, offset: int, name: str | None = None) -> tuple[Float, int]: Decodes a Float object from a buffer without copying it.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, value: float):
         """
         Constructs a new Float object.
@@ -28,18 +37,29 @@ class Float(BaseType):
         """
         super().__init__("float", name, value)
 
-    def pack(self) -> bytes:
+    def pack_value_into(self, buf: bytearray | memoryview, offset: int = 0) -> int:
+        """
+        Writes the type id followed by the float value into buf.
+
+        Args:
+            buf (bytearray | memoryview): The buffer to write into.
+            offset (int): The position in buf to start writing at.
+
+        Returns:
+            int: The offset just past the written data.
+        """
+        end = offset + 5
+        buf[offset:end] = _FLOAT_ENTRY.pack(6, self.get_value())
+        return end
+
+    def encoded_size(self) -> int:
         """
-        Returns the packed name of the Float object followed by a byte representing the float value.
+        Returns the number of bytes pack_value_into writes: the type id and the float value.
 
         Returns:
-            bytes: The packed name of the object followed by a byte representing the float value.
+            int: The encoded size.
         """
-        return (
-            self.pack_name()
-            + bytes([6])
-            + bytearray(struct.pack("f", self.get_value()))
-        )
+        return 5
 
     @staticmethod
     def unpack(buffer: io.BytesIO | bytes, name: str | None = None) -> Float:
@@ -59,3 +79,20 @@ class Float(BaseType):
             name = BaseType.unpack_name(buffer)
 
         return Float(name, float(struct.unpack("f", buffer.read(4))[0]))
+
+    @staticmethod
+    def unpack_from(
+        buffer: memoryview | bytes, offset: int = 0, name: str | None = None
+    ) -> tuple[Float, int]:
+        """
+        Decodes a float value starting at offset, just past its type id.
+
+        Args:
+            buffer (memoryview | bytes): The buffer to decode from.
+            offset (int): The position of the value in buffer.
+            name (str | None): The name of the Float object.
+
+        Returns:
+            tuple[Float, int]: The decoded Float object and the offset just past it.
+        """
+        return Float(name, _FLOAT_VALUE.unpack_from(buffer, offset)[0]), offset + 4
@@ -4,9 +4,17 @@ import io
 import struct
 
 # localmodules:start
+from .ArrayCodec import (
+    decode_numeric_array,
+    encode_numeric_array,
+    numeric_array_size,
+)
 from .BaseType import BaseType
 # localmodules:end
 
+_FLOAT_ARRAY_HEADER = struct.Struct(">BH")
+_FLOAT_ARRAY_LENGTH = struct.Struct(">H")
+
 
 class FloatArray(BaseType):
     """
@@ -18,9 +26,14 @@ class FloatArray(BaseType):
 
     Methods:
         pack(): Returns a bytes representation of the float array.
+        pack_value_into(buf, offset): Writes the type id followed by the length-prefixed float array into buf.
+        encoded_size(): Returns the number of bytes pack_value_into writes.
         unpack(buffer, name): Static method that returns a FloatArray instance from a bytes buffer.
+        unpack_from(buffer, offset, name, typed): Static method that decodes a FloatArray instance from a memoryview, optionally as a typed array.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, value: list[float]):
         """
         Constructs a new FloatArray instance.
@@ -32,19 +45,35 @@ class FloatArray(BaseType):
 
         super().__init__("float_array", name, value)
 
-    def pack(self) -> bytes:
+    def pack_value_into(self, buf: bytearray | memoryview, offset: int = 0) -> int:
+        """
+        Writes the type id followed by the length-prefixed float array into buf.
+
+        The items are encoded in one step; array.array, bytes-like and other buffer
+        objects are accepted as the value alongside lists.
+
+        Args:
+            buf (bytearray | memoryview): The buffer to write into.
+            offset (int): The position in buf to start writing at.
+
+        Returns:
+            int: The offset just past the written data.
+        """
+        length, payload = encode_numeric_array(self.get_value(), "f")
+        start = offset + 3
+        end = start + len(payload)
+        buf[offset:start] = _FLOAT_ARRAY_HEADER.pack(14, length)
+        buf[start:end] = payload
+        return end
+
+    def encoded_size(self) -> int:
         """
-        Packs the float array into bytes.
+        Returns the number of bytes pack_value_into writes: the type id, the item count and the items.
 
         Returns:
-            bytes: The bytes representation of the float array.
+            int: The encoded size.
         """
-        result = len(self.get_value()).to_bytes(2, "big")
-        for i in self.get_value():
-            result += int.from_bytes(
-                struct.pack("f", i), "little", signed=True
-            ).to_bytes(4, "big", signed=True)
-        return self.pack_name() + bytes([14]) + result
+        return 3 + numeric_array_size(self.get_value(), "f")
 
     @staticmethod
     def unpack(buffer: io.BytesIO | bytes, name: str | None = None) -> FloatArray:
@@ -64,7 +93,29 @@ class FloatArray(BaseType):
             name = BaseType.unpack_name(buffer)
 
         length = int.from_bytes(buffer.read(2), "big")
-        array = []
-        for _ in range(length):
-            array.append(round(struct.unpack("f", buffer.read(4)[::-1])[0], 6))
-        return FloatArray(name, array)
+        items = decode_numeric_array(buffer.read(length * 4), "f")
+        return FloatArray(name, [round(i, 6) for i in items])
+
+    @staticmethod
+    def unpack_from(
+        buffer: memoryview | bytes,
+        offset: int = 0,
+        name: str | None = None,
+        typed: bool = False,
+    ) -> tuple[FloatArray, int]:
+        """
+        Decodes a length-prefixed float array starting at offset, just past its type id.
+
+        Args:
+            buffer (memoryview | bytes): The buffer to decode from.
+            offset (int): The position of the value in buffer.
+            name (str | None): The name of the FloatArray object.
+            typed (bool): Whether to keep the items as an array.array('f') instead of a list.
+
+        Returns:
+            tuple[FloatArray, int]: The decoded FloatArray object and the offset just past it.
+        """
+        start = offset + 2
+        end = start + _FLOAT_ARRAY_LENGTH.unpack_from(buffer, offset)[0] * 4
+        items = decode_numeric_array(buffer[start:end], "f")
+        return FloatArray(name, items if typed else [round(i, 6) for i in items]), end
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import io
+import struct
 
 # localmodules:start
 from .BaseType import BaseType
 # localmodules:end
 
+_INT_ENTRY = struct.Struct(">Bi")
+_INT_VALUE = struct.Struct(">i")
+
 
 class Int(BaseType):
     """
@@ -14,9 +18,14 @@ class Int(BaseType):
     Methods:
         __init__(self, name: str, value: int | bytes): Constructs a new Int object.
         pack(self) -> bytes: Returns the packed name of the object followed by a byte representing the int value.
+        pack_value_into(self, buf: bytearray, offset: int) -> int: Writes the type id followed by the int value into buf.
+        encoded_size(self) -> int: Returns the number of bytes pack_value_into writes.
         unpack(buffer: io.BytesIO, name: str | None = None) -> Byte: Unpacks an Int object from the given buffer.
+        unpack_from(buffer: memoryview, offset: int, name: str | None = None) -> tuple[Int, int]: Decodes a Int object from a buffer without copying it.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, value: int):
         """
         Constructs a new Int object.
@@ -27,18 +36,29 @@ class Int(BaseType):
         """
         super().__init__("int", name, value)
 
-    def pack(self) -> bytes:
+    def pack_value_into(self, buf: bytearray | memoryview, offset: int = 0) -> int:
+        """
+        Writes the type id followed by the int value into buf.
+
+        Args:
+            buf (bytearray | memoryview): The buffer to write into.
+            offset (int): The position in buf to start writing at.
+
+        Returns:
+            int: The offset just past the written data.
+        """
+        end = offset + 5
+        buf[offset:end] = _INT_ENTRY.pack(4, self.get_value())
+        return end
+
+    def encoded_size(self) -> int:
         """
-        Returns the packed name of the Int object followed by a byte representing the int value.
+        Returns the number of bytes pack_value_into writes: the type id and the int value.
 
         Returns:
-            bytes: The packed name of the object followed by a byte representing the int value.
+            int: The encoded size.
         """
-        return (
-            self.pack_name()
-            + bytes([4])
-            + self.get_value().to_bytes(4, "big", signed=True)
-        )
+        return 5
 
     @staticmethod
     def unpack(buffer: io.BytesIO | bytes, name: str | None = None) -> Int:
@@ -58,3 +78,20 @@ class Int(BaseType):
             name = BaseType.unpack_name(buffer)
 
         return Int(name, int.from_bytes(buffer.read(4), "big", signed=True))
+
+    @staticmethod
+    def unpack_from(
+        buffer: memoryview | bytes, offset: int = 0, name: str | None = None
+    ) -> tuple[Int, int]:
+        """
+        Decodes an int value starting at offset, just past its type id.
+
+        Args:
+            buffer (memoryview | bytes): The buffer to decode from.
+            offset (int): The position of the value in buffer.
+            name (str | None): The name of the Int object.
+
+        Returns:
+            tuple[Int, int]: The decoded Int object and the offset just past it.
+        """
+        return Int(name, _INT_VALUE.unpack_from(buffer, offset)[0]), offset + 4
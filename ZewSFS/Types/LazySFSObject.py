@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+import struct
+
+# localmodules:start
+from .SFSArray import SFSArray
+from .SFSObject import SFSObject
+from ..Exceptions import InvalidDataType
+# localmodules:end
+
+_LAZY_LENGTH = struct.Struct(">H")
+_LAZY_BYTE_ARRAY_LENGTH = struct.Struct(">I")
+
+# Payload sizes of the fixed-width scalars (null .. double), indexed by type id.
+_LAZY_SCALAR_SIZES = (0, 1, 1, 2, 4, 8, 4, 8)
+# Item sizes of the numeric arrays (bool_array .. double_array), indexed by type id - 9.
+_LAZY_ARRAY_ITEM_SIZES = (1, 1, 2, 4, 8, 4, 8)
+
+
+def skip_sfs_value(buffer: memoryview | bytes, type_id: int, offset: int) -> int:
+    """
+    Finds the end of an encoded value without decoding it.
+
+    Args:
+        buffer (memoryview | bytes): The buffer holding the value.
+        type_id (int): The wire type id of the value.
+        offset (int): The position of the value in buffer, just past its type id.
+
+    Returns:
+        int: The offset just past the value.
+
+    Raises:
+        InvalidDataType: If the value, or anything nested in it, has an unknown type id.
+    """
+    if type_id < 8:
+        return offset + _LAZY_SCALAR_SIZES[type_id]
+    if type_id == 8:
+        return offset + 2 + _LAZY_LENGTH.unpack_from(buffer, offset)[0]
+    if type_id == 10:
+        return offset + 4 + _LAZY_BYTE_ARRAY_LENGTH.unpack_from(buffer, offset)[0]
+    if type_id < 16:
+        length = _LAZY_LENGTH.unpack_from(buffer, offset)[0]
+        return offset + 2 + length * _LAZY_ARRAY_ITEM_SIZES[type_id - 9]
+    if type_id == 16:
+        length = _LAZY_LENGTH.unpack_from(buffer, offset)[0]
+        offset += 2
+        for _ in range(length):
+            offset += 2 + _LAZY_LENGTH.unpack_from(buffer, offset)[0]
+        return offset
+    if type_id == 17:
+        length = _LAZY_LENGTH.unpack_from(buffer, offset)[0]
+        offset += 2
+        for _ in range(length):
+            offset = skip_sfs_value(buffer, buffer[offset], offset + 1)
+        return offset
+    if type_id == 18:
+        length = _LAZY_LENGTH.unpack_from(buffer, offset)[0]
+        offset += 2
+        for _ in range(length):
+            offset += 2 + _LAZY_LENGTH.unpack_from(buffer, offset)[0]
+            offset = skip_sfs_value(buffer, buffer[offset], offset + 1)
+        return offset
+    raise InvalidDataType(type_id)
+
+
+class LazySFSObject(SFSObject):
+    """
+    An SFSObject backed by its encoded bytes, decoded one level at a time on first access.
+
+    Creating one only records where the object lives in the buffer. The first call that needs
+    its items (get_value, and so every accessor built on it) decodes the direct items: scalars
+    are decoded right away, nested objects and arrays become lazy themselves. An object that was
+    never accessed is packed back by copying its original bytes, so echoing a request only
+    decodes the levels a handler actually reads.
+
+    The object keeps the underlying buffer alive until it has been decoded.
+
+    Methods:
+        get_value(): Decodes the items if needed and returns them.
+        set_value(value): Replaces the items, dropping the underlying buffer.
+        pack_value_into(buf, offset): Copies the original bytes if the object was never decoded.
+        encoded_size(): Returns the encoded size, without decoding the object.
+        unpack_from(buffer, offset, name, end): Static method that wraps an encoded object without decoding it.
+    """
+
+    __slots__ = ("_buffer", "_offset", "_end")
+
+    def __init__(
+        self,
+        name: str = None,
+        buffer: memoryview | bytes = None,
+        offset: int = 0,
+        end: int = 0,
+    ):
+        """
+        Constructs a new LazySFSObject instance.
+
+        Args:
+            name (str, optional): The name of the SFS object. Defaults to None.
+            buffer (memoryview | bytes, optional): The buffer holding the encoded object. Defaults to None.
+            offset (int): The position of the item count in buffer.
+            end (int): The offset just past the encoded object.
+        """
+
+        super().__init__(name)
+        self._buffer = buffer
+        self._offset = offset
+        self._end = end
+
+    def get_value(self) -> dict:
+        """
+        Returns the items of the SFS object, decoding them on first access.
+
+        Returns:
+            dict: The dictionary of values in the SFS object.
+        """
+
+        if self._buffer is not None:
+            self._decode()
+        return super().get_value()
+
+    def set_value(self, new_value: dict):
+        """
+        Replaces the items of the SFS object, detaching it from the underlying buffer.
+
+        Args:
+            new_value (dict): The new dictionary of values.
+        """
+
+        self._buffer = None
+        super().set_value(new_value)
+
+    def _decode(self):
+        """
+        Decodes the direct items of the object, leaving nested objects and arrays lazy.
+        """
+
+        # localmodules:start
+        from . import sfs2x_lazy_decoders
+        # localmodules:end
+
+        buffer = self._buffer
+        offset = self._offset
+        length = _LAZY_LENGTH.unpack_from(buffer, offset)[0]
+        offset += 2
+        items = {}
+        for _ in range(length):
+            start = offset + 2
+            offset = start + _LAZY_LENGTH.unpack_from(buffer, offset)[0]
+            key = str(buffer[start:offset], "utf8")
+            type_id = buffer[offset]
+            if type_id > 18:
+                raise InvalidDataType(type_id)
+            items[key], offset = sfs2x_lazy_decoders[type_id](buffer, offset + 1, key)
+        self.set_value(items)
+
+    def pack_value_into(self, buf: bytearray | memoryview, offset: int = 0) -> int:
+        """
+        Writes the SFS object into buf, copying its original bytes if it was never decoded.
+
+        Args:
+            buf (bytearray | memoryview): The buffer to write into.
+            offset (int): The position in buf to start writing at.
+
+        Returns:
+            int: The offset just past the written data.
+        """
+
+        if self._buffer is None:
+            return super().pack_value_into(buf, offset)
+        start = offset + 1
+        end = start + self._end - self._offset
+        buf[offset:start] = b"\x12"
+        buf[start:end] = self._buffer[self._offset : self._end]
+        return end
+
+    def encoded_size(self) -> int:
+        """
+        Returns the number of bytes pack_value_into writes, known without decoding if never accessed.
+
+        Returns:
+            int: The encoded size.
+        """
+        if self._buffer is None:
+            return super().encoded_size()
+        return 1 + self._end - self._offset
+
+    @staticmethod
+    def unpack_from(
+        buffer: memoryview | bytes,
+        offset: int = 0,
+        name: str | None = None,
+        end: int | None = None,
+    ) -> tuple[LazySFSObject, int]:
+        """
+        Wraps an encoded SFS object starting at offset, just past its type id, without decoding it.
+
+        Args:
+            buffer (memoryview | bytes): The buffer holding the object.
+            offset (int): The position of the item count in buffer.
+            name (str | None): The name of the SFS object.
+            end (int | None): The offset just past the object, if already known.
+
+        Returns:
+            tuple[LazySFSObject, int]: The lazy object and the offset just past it.
+        """
+
+        if end is None:
+            end = skip_sfs_value(buffer, 18, offset)
+        return LazySFSObject(name, buffer, offset, end), end
+
+
+class LazySFSArray(SFSArray):
+    """
+    An SFSArray backed by its encoded bytes, decoded one level at a time on first access.
+
+    See LazySFSObject for how decoding and packing behave.
+
+    Methods:
+        get_value(): Decodes the items if needed and returns them.
+        set_value(value): Replaces the items, dropping the underlying buffer.
+        pack_value_into(buf, offset): Copies the original bytes if the array was never decoded.
+        encoded_size(): Returns the encoded size, without decoding the array.
+        unpack_from(buffer, offset, name, end): Static method that wraps an encoded array without decoding it.
+    """
+
+    __slots__ = ("_buffer", "_offset", "_end")
+
+    def __init__(
+        self,
+        name: str = None,
+        buffer: memoryview | bytes = None,
+        offset: int = 0,
+        end: int = 0,
+    ):
+        """
+        Constructs a new LazySFSArray instance.
+
+        Args:
+            name (str, optional): The name of the SFSArray. Defaults to None.
+            buffer (memoryview | bytes, optional): The buffer holding the encoded array. Defaults to None.
+            offset (int): The position of the item count in buffer.
+            end (int): The offset just past the encoded array.
+        """
+
+        super().__init__(name)
+        self._buffer = buffer
+        self._offset = offset
+        self._end = end
+
+    def get_value(self) -> list:
+        """
+        Returns the items of the SFSArray, decoding them on first access.
+
+        Returns:
+            list: The list of values in the SFSArray.
+        """
+
+        if self._buffer is not None:
+            self._decode()
+        return super().get_value()
+
+    def set_value(self, new_value: list):
+        """
+        Replaces the items of the SFSArray, detaching it from the underlying buffer.
+
+        Args:
+            new_value (list): The new list of values.
+        """
+
+        self._buffer = None
+        super().set_value(new_value)
+
+    def _decode(self):
+        """
+        Decodes the direct items of the array, leaving nested objects and arrays lazy.
+        """
+
+        # localmodules:start
+        from . import sfs2x_lazy_decoders
+        # localmodules:end
+
+        buffer = self._buffer
+        offset = self._offset
+        length = _LAZY_LENGTH.unpack_from(buffer, offset)[0]
+        offset += 2
+        items = []
+        for _ in range(length):
+            type_id = buffer[offset]
+            if type_id > 18:
+                raise InvalidDataType(type_id)
+            item, offset = sfs2x_lazy_decoders[type_id](buffer, offset + 1, "")
+            items.append(item)
+        self.set_value(items)
+
+    def pack_value_into(self, buf: bytearray | memoryview, offset: int = 0) -> int:
+        """
+        Writes the SFSArray into buf, copying its original bytes if it was never decoded.
+
+        Args:
+            buf (bytearray | memoryview): The buffer to write into.
+            offset (int): The position in buf to start writing at.
+
+        Returns:
+            int: The offset just past the written data.
+        """
+
+        if self._buffer is None:
+            return super().pack_value_into(buf, offset)
+        start = offset + 1
+        end = start + self._end - self._offset
+        buf[offset:start] = b"\x11"
+        buf[start:end] = self._buffer[self._offset : self._end]
+        return end
+
+    def encoded_size(self) -> int:
+        """
+        Returns the number of bytes pack_value_into writes, known without decoding if never accessed.
+
+        Returns:
+            int: The encoded size.
+        """
+        if self._buffer is None:
+            return super().encoded_size()
+        return 1 + self._end - self._offset
+
+    @staticmethod
+    def unpack_from(
+        buffer: memoryview | bytes,
+        offset: int = 0,
+        name: str | None = None,
+        end: int | None = None,
+    ) -> tuple[LazySFSArray, int]:
+        """
+        Wraps an encoded SFSArray starting at offset, just past its type id, without decoding it.
+
+        Args:
+            buffer (memoryview | bytes): The buffer holding the array.
+            offset (int): The position of the item count in buffer.
+            name (str | None): The name of the SFSArray.
+            end (int | None): The offset just past the array, if already known.
+
+        Returns:
+            tuple[LazySFSArray, int]: The lazy array and the offset just past it.
+        """
+
+        if end is None:
+            end = skip_sfs_value(buffer, 17, offset)
+        return LazySFSArray(name, buffer, offset, end), end
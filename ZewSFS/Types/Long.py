@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import io
+import struct
 
 # localmodules:start
 from .BaseType import BaseType
 # localmodules:end
 
+_LONG_ENTRY = struct.Struct(">Bq")
+_LONG_VALUE = struct.Struct(">q")
+
 
 class Long(BaseType):
     """
@@ -14,9 +18,14 @@ class Long(BaseType):
     Methods:
         __init__(self, name: str, value: int | bytes): Constructs a new Long object.
         pack(self) -> bytes: Returns the packed name of the object followed by a byte representing the long value.
+        pack_value_into(self, buf: bytearray, offset: int) -> int: Writes the type id followed by the long value into buf.
+        encoded_size(self) -> int: Returns the number of bytes pack_value_into writes.
         unpack(buffer: io.BytesIO, name: str | None = None) -> Byte: Unpacks a Long object from the given buffer.
+        unpack_from(buffer: memoryview, offset: int, name: str | None = None) -> tuple[Long, int]: Decodes a Long object from a buffer without copying it.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, value: int):
         """
         Constructs a new Long object.
@@ -27,18 +36,29 @@ class Long(BaseType):
         """
         super().__init__("long", name, value)
 
-    def pack(self) -> bytes:
+    def pack_value_into(self, buf: bytearray | memoryview, offset: int = 0) -> int:
+        """
+        Writes the type id followed by the long value into buf.
+
+        Args:
+            buf (bytearray | memoryview): The buffer to write into.
+            offset (int): The position in buf to start writing at.
+
+        Returns:
+            int: The offset just past the written data.
+        """
+        end = offset + 9
+        buf[offset:end] = _LONG_ENTRY.pack(5, self.get_value())
+        return end
+
+    def encoded_size(self) -> int:
         """
-        Returns the packed name of the Long object followed by a byte representing the long value.
+        Returns the number of bytes pack_value_into writes: the type id and the long value.
 
         Returns:
-            bytes: The packed name of the object followed by a byte representing the long value.
+            int: The encoded size.
         """
-        return (
-            self.pack_name()
-            + bytes([5])
-            + self.get_value().to_bytes(8, "big", signed=True)
-        )
+        return 9
 
     @staticmethod
     def unpack(buffer: io.BytesIO | bytes, name: str | None = None) -> Long:
@@ -58,3 +78,20 @@ class Long(BaseType):
             name = BaseType.unpack_name(buffer)
 
         return Long(name, int.from_bytes(buffer.read(8), "big", signed=True))
+
+    @staticmethod
+    def unpack_from(
+        buffer: memoryview | bytes, offset: int = 0, name: str | None = None
+    ) -> tuple[Long, int]:
+        """
+        Decodes a long value starting at offset, just past its type id.
+
+        Args:
+            buffer (memoryview | bytes): The buffer to decode from.
+            offset (int): The position of the value in buffer.
+            name (str | None): The name of the Long object.
+
+        Returns:
+            tuple[Long, int]: The decoded Long object and the offset just past it.
+        """
+        return Long(name, _LONG_VALUE.unpack_from(buffer, offset)[0]), offset + 8
@@ -4,9 +4,17 @@ import io
 import struct
 
 # localmodules:start
+from .ArrayCodec import (
+    decode_numeric_array,
+    encode_numeric_array,
+    numeric_array_size,
+)
 from .BaseType import BaseType
 # localmodules:end
 
+_LONG_ARRAY_HEADER = struct.Struct(">BH")
+_LONG_ARRAY_LENGTH = struct.Struct(">H")
+
 
 class LongArray(BaseType):
     """
@@ -18,9 +26,14 @@ class LongArray(BaseType):
 
         Methods:
             pack(): Returns a bytes representation of the long array.
+            pack_value_into(buf, offset): Writes the type id followed by the length-prefixed long array into buf.
+        encoded_size(): Returns the number of bytes pack_value_into writes.
             unpack(buffer, name): Static method that returns a LongArray instance from a bytes buffer.
+            unpack_from(buffer, offset, name, typed): Static method that decodes a LongArray instance from a memoryview, optionally as a typed array.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, value: list[int]):
         """
         Constructs a new LongArray instance.
@@ -32,17 +45,35 @@ class LongArray(BaseType):
 
         super().__init__("long_array", name, value)
 
-    def pack(self) -> bytes:
+    def pack_value_into(self, buf: bytearray | memoryview, offset: int = 0) -> int:
+        """
+        Writes the type id followed by the length-prefixed long array into buf.
+
+        The items are encoded in one step; array.array, bytes-like and other buffer
+        objects are accepted as the value alongside lists.
+
+        Args:
+            buf (bytearray | memoryview): The buffer to write into.
+            offset (int): The position in buf to start writing at.
+
+        Returns:
+            int: The offset just past the written data.
+        """
+        length, payload = encode_numeric_array(self.get_value(), "q")
+        start = offset + 3
+        end = start + len(payload)
+        buf[offset:start] = _LONG_ARRAY_HEADER.pack(13, length)
+        buf[start:end] = payload
+        return end
+
+    def encoded_size(self) -> int:
         """
-        Packs the long array into bytes.
+        Returns the number of bytes pack_value_into writes: the type id, the item count and the items.
 
         Returns:
-            bytes: The bytes representation of the long array.
+            int: The encoded size.
         """
-        result = len(self.get_value()).to_bytes(2, "big")
-        for i in self.get_value():
-            result += i.to_bytes(8, "big", signed=True)
-        return self.pack_name() + bytes([13]) + result
+        return 3 + numeric_array_size(self.get_value(), "q")
 
     @staticmethod
     def unpack(buffer: io.BytesIO | bytes, name: str | None = None) -> LongArray:
@@ -62,7 +93,29 @@ class LongArray(BaseType):
             name = BaseType.unpack_name(buffer)
 
         length = int.from_bytes(buffer.read(2), "big")
-        array = []
-        for _ in range(length):
-            array.append(int.from_bytes(buffer.read(8), "big", signed=True))
-        return LongArray(name, array)
+        items = decode_numeric_array(buffer.read(length * 8), "q")
+        return LongArray(name, items.tolist())
+
+    @staticmethod
+    def unpack_from(
+        buffer: memoryview | bytes,
+        offset: int = 0,
+        name: str | None = None,
+        typed: bool = False,
+    ) -> tuple[LongArray, int]:
+        """
+        Decodes a length-prefixed long array starting at offset, just past its type id.
+
+        Args:
+            buffer (memoryview | bytes): The buffer to decode from.
+            offset (int): The position of the value in buffer.
+            name (str | None): The name of the LongArray object.
+            typed (bool): Whether to keep the items as an array.array('q') instead of a list.
+
+        Returns:
+            tuple[LongArray, int]: The decoded LongArray object and the offset just past it.
+        """
+        start = offset + 2
+        end = start + _LONG_ARRAY_LENGTH.unpack_from(buffer, offset)[0] * 8
+        items = decode_numeric_array(buffer[start:end], "q")
+        return LongArray(name, items if typed else items.tolist()), end
@@ -14,9 +14,14 @@ class Null(BaseType):
     Methods:
         __init__(self, name: str, value: None): Constructs a new Null object.
         pack(self) -> bytes: Returns the packed name of the object followed by a null byte.
+        pack_value_into(self, buf: bytearray, offset: int) -> int: Writes the type id followed by a null byte into buf.
+        encoded_size(self) -> int: Returns the number of bytes pack_value_into writes.
         unpack(buffer: io.BytesIO, name: str | None = None) -> Null: Unpacks a Null object from the given buffer.
+        unpack_from(buffer: memoryview, offset: int, name: str | None = None) -> tuple[Null, int]: Decodes a Null object from a buffer without copying it.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, value: None):
         """
         Constructs a new Null object.
@@ -27,14 +32,29 @@ class Null(BaseType):
         """
         super().__init__("null", name, None)
 
-    def pack(self) -> bytes:
+    def pack_value_into(self, buf: bytearray | memoryview, offset: int = 0) -> int:
         """
-        Returns the packed name of the Null object followed by a null byte.
+        Writes the type id followed by a null byte into buf.
+
+        Args:
+            buf (bytearray | memoryview): The buffer to write into.
+            offset (int): The position in buf to start writing at.
 
         Returns:
-            bytes: The packed name of the object followed by a null byte.
+            int: The offset just past the written data.
+        """
+        end = offset + 1
+        buf[offset:end] = b"\x00"
+        return end
+
+    def encoded_size(self) -> int:
         """
-        return super().pack_name() + bytes([0])
+        Returns the number of bytes pack_value_into writes: the type id.
+
+        Returns:
+            int: The encoded size.
+        """
+        return 1
 
     @staticmethod
     def unpack(buffer: io.BytesIO | bytes, name: str | None = None) -> Null:
@@ -54,3 +74,20 @@ class Null(BaseType):
             name = BaseType.unpack_name(buffer)
 
         return Null(name, buffer.read(1))
+
+    @staticmethod
+    def unpack_from(
+        buffer: memoryview | bytes, offset: int = 0, name: str | None = None
+    ) -> tuple[Null, int]:
+        """
+        Decodes a null value starting at offset, just past its type id.
+
+        Args:
+            buffer (memoryview | bytes): The buffer to decode from.
+            offset (int): The position of the value in buffer.
+            name (str | None): The name of the Null object.
+
+        Returns:
+            tuple[Null, int]: The decoded Null object and the offset just past it.
+        """
+        return Null(name, None), offset
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+# localmodules:start
+from .BaseType import BaseType
+from .SFSArray import SFSArray
+from .SFSObject import SFSObject
+from ..Exceptions import InvalidDataType
+# localmodules:end
+
+# Container type names by the wire type id a fragment starts with.
+_RAW_SFS_TYPES = {0x11: "sfs_array", 0x12: "sfs_object"}
+
+
+class RawSFS(BaseType):
+    """
+    An SFSObject or SFSArray kept in its encoded form, for splicing pieces that never change into responses.
+
+    The fragment is encoded once and copied verbatim whenever its parent is packed, so it can be
+    shared by any number of objects and arrays. It is read-only: get_value() decodes a fresh copy
+    of the items each time, and changes to that copy are not written back. The getters of the
+    parent (get, getSFSObject, getSFSArray) decode it in place instead, so what they return is
+    an SFSObject or SFSArray whose changes are packed with the parent.
+
+    Attributes:
+        name (str): The name of the fragment.
+        value (bytes): The encoded fragment, starting with its type id.
+
+    Methods:
+        get_value(): Decodes and returns the items of the fragment.
+        decode(): Decodes the fragment into a new SFSObject or SFSArray.
+        pack_value_into(buf, offset): Copies the encoded fragment into buf.
+        encoded_size(): Returns the size of the encoded fragment.
+        tokenize(): Returns the schema of the fragment.
+        to_python_object(detailed): Returns the fragment as Python objects.
+        from_sfs(sfs, name): Static method that encodes an SFSObject or SFSArray into a RawSFS.
+    """
+
+    __slots__ = ()
+
+    is_fragment = True
+
+    def __init__(self, name: str = None, value: bytes = b"\x12\x00\x00"):
+        """
+        Constructs a new RawSFS instance.
+
+        Args:
+            name (str, optional): The name of the fragment. Defaults to None.
+            value (bytes, optional): The encoded SFSObject or SFSArray, starting with its type id. Defaults to an empty SFSObject.
+
+        Raises:
+            InvalidDataType: If value does not hold an SFSObject or SFSArray.
+        """
+        value = bytes(value)
+        object_type = _RAW_SFS_TYPES.get(value[0] if value else None)
+        if object_type is None:
+            raise InvalidDataType(value[0] if value else None)
+        super().__init__(object_type, name, value)
+
+    def __str__(self) -> str:
+        return str(self.decode())
+
+    def __len__(self) -> int:
+        """
+        Returns the number of items in the fragment, read from its header.
+
+        Returns:
+            int: The number of items.
+        """
+        return int.from_bytes(super().get_value()[1:3], "big")
+
+    def get_value(self) -> dict | list:
+        """
+        Decodes and returns the items of the fragment.
+
+        Returns:
+            dict | list: A fresh copy of the items.
+        """
+        return self.decode().get_value()
+
+    def decode(self) -> SFSObject | SFSArray:
+        """
+        Decodes the fragment into a new SFSObject or SFSArray.
+
+        Returns:
+            SFSObject | SFSArray: The decoded fragment.
+        """
+        data = memoryview(super().get_value())
+        if self.get_type() == "sfs_object":
+            decoded = SFSObject.unpack_from(data, 1, self.get_name())[0]
+        else:
+            decoded = SFSArray.unpack_from(data, 1, self.get_name())[0]
+        return decoded
+
+    def pack_value_into(self, buf: bytearray | memoryview, offset: int = 0) -> int:
+        """
+        Copies the encoded fragment into buf.
+
+        Args:
+            buf (bytearray | memoryview): The buffer to write into.
+            offset (int): The position in buf to start writing at.
+
+        Returns:
+            int: The offset just past the written data.
+        """
+        data = super().get_value()
+        end = offset + len(data)
+        buf[offset:end] = data
+        return end
+
+    def encoded_size(self) -> int:
+        """
+        Returns the size of the encoded fragment.
+
+        Returns:
+            int: The encoded size.
+        """
+        return len(super().get_value())
+
+    def tokenize(self):
+        """
+        Returns the schema of the fragment, as SFSObject.tokenize() or SFSArray.tokenize() would.
+        """
+        return self.decode().tokenize()
+
+    def to_python_object(self, detailed=False):
+        """
+        Returns the fragment as Python objects.
+
+        Returns:
+            dict | list: The converted fragment.
+        """
+        return self.decode().to_python_object(detailed)
+
+    @staticmethod
+    def from_sfs(sfs: SFSObject | SFSArray, name: str = None) -> RawSFS:
+        """
+        Encodes an SFSObject or SFSArray into a RawSFS.
+
+        Args:
+            sfs (SFSObject | SFSArray): The value to encode.
+            name (str, optional): The name of the fragment. Defaults to None.
+
+        Returns:
+            RawSFS: The encoded fragment.
+        """
+        buf = bytearray()
+        sfs.pack_value_into(buf, 0)
+        return RawSFS(name, buf)
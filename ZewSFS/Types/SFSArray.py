@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import io
 import json
+import struct
 
 # localmodules:start
 from .BaseType import BaseType
@@ -25,8 +26,13 @@ from .UtfStringArray import UtfStringArray
 from ..Exceptions import InvalidDataType
 # localmodules:end
 
+_SFS_ARRAY_HEADER = struct.Struct(">BH")
+_SFS_ARRAY_LENGTH = struct.Struct(">H")
+
 
 class SFSArray(BaseType):
+    __slots__ = ()
+
     def __init__(self, name: str = None, value: list = None):
         """
         Constructs a new SFSArray instance.
@@ -102,19 +108,36 @@ class SFSArray(BaseType):
 
         self.remove_item(key)
 
-    def pack(self) -> bytes:
+    def pack_value_into(self, buf: bytearray | memoryview, offset: int = 0) -> int:
         """
-        Packs the SFSArray into bytes.
+        Writes the type id, item count and every item of the SFSArray into buf.
+
+        Args:
+            buf (bytearray | memoryview): The buffer to write into.
+            offset (int): The position in buf to start writing at.
 
         Returns:
-            bytes: The bytes representation of the SFSArray.
+            int: The offset just past the written data.
         """
 
-        packed = self.pack_name() + bytes([17]) + len(self).to_bytes(2, "big")
-        for i in self:
-            packed += i.pack()
+        items = self.get_value()
+        end = offset + 3
+        buf[offset:end] = _SFS_ARRAY_HEADER.pack(17, len(items))
+        for item in items:
+            end = item.pack_value_into(buf, end)
+        return end
 
-        return packed
+    def encoded_size(self) -> int:
+        """
+        Returns the number of bytes pack_value_into writes, without encoding the array.
+
+        Returns:
+            int: The size of the header and the items.
+        """
+        size = 3
+        for item in self.get_value():
+            size += item.encoded_size()
+        return size
 
     def tokenize(self):
         tokenized = []
@@ -135,45 +158,78 @@ class SFSArray(BaseType):
         return sorted(tokenized)
 
     @staticmethod
-    def unpack(buffer: io.BytesIO | bytes, name: str | None = None) -> SFSArray:
+    def unpack(
+        buffer: io.BytesIO | bytes,
+        name: str | None = None,
+        typed_arrays: bool = False,
+    ) -> SFSArray:
         """
         Unpacks a bytes buffer into an SFSArray instance.
 
         Args:
             buffer (io.BytesIO | bytes): The bytes buffer to unpack.
             name (str | None, optional): The name of the SFSArray. Defaults to None.
+            typed_arrays (bool): Whether numeric arrays keep their items as array.array instead of lists.
 
         Returns:
             SFSArray: The unpacked SFSArray instance.
         """
 
+        if isinstance(buffer, io.BytesIO):
+            offset = buffer.tell()
+            view = buffer.getbuffer()
+        else:
+            offset = 0
+            view = memoryview(buffer)
+
+        with view:
+            if isinstance(name, bool) and name:
+                start = offset + 2
+                offset = start + _SFS_ARRAY_LENGTH.unpack_from(view, offset)[0]
+                name = str(view[start:offset], "utf8")
+                offset += 1
+            result, offset = SFSArray.unpack_from(view, offset, name, typed_arrays)
+
+        if isinstance(buffer, io.BytesIO):
+            buffer.seek(offset)
+        return result
+
+    @staticmethod
+    def unpack_from(
+        buffer: memoryview | bytes,
+        offset: int = 0,
+        name: str | None = None,
+        typed_arrays: bool = False,
+    ) -> tuple[SFSArray, int]:
+        """
+        Decodes an SFSArray starting at offset, just past its type id.
+
+        Args:
+            buffer (memoryview | bytes): The buffer to decode from.
+            offset (int): The position of the item count in buffer.
+            name (str | None): The name of the SFSArray.
+            typed_arrays (bool): Whether numeric arrays keep their items as array.array instead of lists.
+
+        Returns:
+            tuple[SFSArray, int]: The decoded SFSArray and the offset just past it.
+        """
+
         # localmodules:start
-        from . import sfs2x_datatypes
-        from .SFSObject import SFSObject
+        from . import sfs2x_decoders, sfs2x_typed_decoders
         # localmodules:end
 
-        if isinstance(buffer, bytes):
-            buffer = io.BytesIO(buffer)
-        if isinstance(name, bool) and name:
-            name = BaseType.unpack_name(buffer)
-            buffer.read(1)
-
-        result = SFSArray(name)
-        length = int.from_bytes(buffer.read(2), "big")
+        decoders = sfs2x_typed_decoders if typed_arrays else sfs2x_decoders
+        length = _SFS_ARRAY_LENGTH.unpack_from(buffer, offset)[0]
+        offset += 2
+        items = []
         for _ in range(length):
-            value = None
-            type_id = int.from_bytes(buffer.read(1), "big")
+            type_id = buffer[offset]
             if type_id > 18:
-                raise InvalidDataType
-            if type_id == 18:
-                value = SFSObject.unpack(buffer, False)
-            elif type_id == 17:
-                value = SFSArray.unpack(buffer, False)
-            else:
-                value = list(sfs2x_datatypes.values())[type_id].unpack(buffer, False)
-            result.add_item(value)
+                raise InvalidDataType(type_id)
+            item, offset = decoders[type_id](buffer, offset + 1, "")
+            items.append(item)
 
-        return result
+        return SFSArray(name, items), offset
 
     def add_item(self, item: BaseType):
         """
@@ -514,7 +570,7 @@ class SFSArray(BaseType):
         Adds an sfs_array value to the SFSArray.
 
         Args:
-            value (SFSArray): The value to add.
+            value (SFSArray | RawSFS): The value to add, or a pre-encoded SFSArray to copy as is.
             index (None, optional): The index to add the value at. Defaults to None.
         """
 
@@ -530,7 +586,7 @@ class SFSArray(BaseType):
         Adds an sfs_object value to the SFSArray.
 
         Args:
-            value (SFSObject): The value to add.
+            value (SFSObject | RawSFS): The value to add, or a pre-encoded SFSObject to copy as is.
             index (None, optional): The index to add the value at. Defaults to None.
         """
 
@@ -551,7 +607,7 @@ class SFSArray(BaseType):
         """
 
         # localmodules:start
-        from . import SFSObject
+        from .SFSObject import SFSObject
         # localmodules:end
 
         if isinstance(value, bool):
@@ -582,6 +638,9 @@ class SFSArray(BaseType):
 
         item = self.get_item(index)
         if item.get_type() in ("sfs_object", "sfs_array"):
+            if item.is_fragment:
+                # A RawSFS is decoded into its place, so changes are packed with the array.
+                item = self.get_value()[index] = item.decode()
             return item
         return self.get_item(index).get_value()
 
@@ -2,10 +2,11 @@ from __future__ import annotations
 
 import io
 import json
+import struct
 
 # localmodules:start
-from . import SFSArray
-from .BaseType import BaseType
+from .SFSArray import SFSArray
+from .BaseType import BaseType, encode_sfs_name
 from .Bool import Bool
 from .BoolArray import BoolArray
 from .Byte import Byte
@@ -26,18 +27,28 @@ from .UtfStringArray import UtfStringArray
 from ..Exceptions import InvalidDataType
 # localmodules:end
 
+_SFS_OBJECT_HEADER = struct.Struct(">BH")
+_SFS_OBJECT_LENGTH = struct.Struct(">H")
+
 
 class SFSObject(BaseType):
     """
     The SFSObject class represents a SmartFoxServer (SFS) object. It extends the BaseType class.
 
+    The typed getters (getInt, getUtfString, getSFSObject...) return their default when the key
+    is missing or holds another type. get, getSFSObject and getSFSArray decode a RawSFS item in
+    place, so they always return an SFSObject or SFSArray.
+
     Attributes:
         name (str): The name of the SFS object.
         value (dict): The dictionary of values in the SFS object.
 
     Methods:
         pack(): Returns a bytes representation of the SFS object.
+        pack_value_into(buf, offset): Writes the SFS object into buf without its name.
+        encoded_size(): Returns the number of bytes pack_value_into writes.
         unpack(buffer, name): Static method that returns an SFSObject instance from a bytes buffer.
+        unpack_from(buffer, offset, name): Static method that decodes an SFSObject from a memoryview without copying it.
         set_item(key, value): Sets an item in the SFS object.
         get_item(key, default): Gets an item from the SFS object.
         remove_item(key): Removes an item from the SFS object.
@@ -63,12 +74,32 @@ class SFSObject(BaseType):
         putSFSObject(key, value): Puts an SFSObject value into the SFS object.
         putAny(key, value): Puts any value into the SFS object.
         get(key, default): Gets a value from the SFS object.
+        getBool(key, default): Gets the value of a Bool item, or default.
+        getByte(key, default): Gets the value of a Byte item, or default.
+        getShort(key, default): Gets the value of a Short item, or default.
+        getInt(key, default): Gets the value of an Int item, or default.
+        getLong(key, default): Gets the value of a Long item, or default.
+        getFloat(key, default): Gets the value of a Float item, or default.
+        getDouble(key, default): Gets the value of a Double item, or default.
+        getUtfString(key, default): Gets the value of an UtfString item, or default.
+        getBoolArray(key, default): Gets the value of a BoolArray item, or default.
+        getByteArray(key, default): Gets the value of a ByteArray item, or default.
+        getShortArray(key, default): Gets the value of a ShortArray item, or default.
+        getIntArray(key, default): Gets the value of an IntArray item, or default.
+        getLongArray(key, default): Gets the value of a LongArray item, or default.
+        getFloatArray(key, default): Gets the value of a FloatArray item, or default.
+        getDoubleArray(key, default): Gets the value of a DoubleArray item, or default.
+        getUtfStringArray(key, default): Gets the value of an UtfStringArray item, or default.
+        getSFSArray(key, default): Gets an SFSArray item, or default.
+        getSFSObject(key, default): Gets an SFSObject item, or default.
         from_python_object(python_object): Static method that returns an SFSObject instance from a Python object.
         to_python_object(): Returns a Python object from the SFS object.
         from_json(json_string): Static method that returns an SFSObject instance from a JSON string.
         to_json(): Returns a JSON string from the SFS object.
     """
 
+    __slots__ = ()
+
     __type = "sfs_object"
 
     def __init__(self, name: str = None, value: dict = None):
@@ -195,21 +226,42 @@ class SFSObject(BaseType):
         else:
             return NotImplemented
 
-    def pack(self) -> bytes:
+    def pack_value_into(self, buf: bytearray | memoryview, offset: int = 0) -> int:
         """
-        Packs the SFS object into bytes.
+        Writes the type id, item count and every item of the SFS object into buf.
+
+        The whole tree is written in a single pass into the same buffer, each item under its key.
+
+        Args:
+            buf (bytearray | memoryview): The buffer to write into.
+            offset (int): The position in buf to start writing at.
 
         Returns:
-            bytes: The bytes representation of the SFS object.
+            int: The offset just past the written data.
         """
 
-        packed = self.pack_name() + bytes([18])
-        packed += len(self.get_value().keys()).to_bytes(2, "big")
-        for item_name, item_value in self.get_value().items():
-            if hasattr(item_value, "set_name"):
-                item_value.set_name(item_name)
-            packed += item_value.pack()
-        return packed
+        items = self.get_value()
+        end = offset + 3
+        buf[offset:end] = _SFS_OBJECT_HEADER.pack(18, len(items))
+        for item_name, item_value in items.items():
+            encoded_name = encode_sfs_name(item_name)
+            offset = end + len(encoded_name)
+            buf[end:offset] = encoded_name
+            end = item_value.pack_value_into(buf, offset)
+        return end
+
+    def encoded_size(self) -> int:
+        """
+        Returns the number of bytes pack_value_into writes, without encoding the object.
+
+        Returns:
+            int: The size of the header, the keys and the items.
+        """
+        size = 3
+        for key, item in self.get_value().items():
+            size += 2 + (len(key) if key.isascii() else len(key.encode("utf-8")))
+            size += item.encoded_size()
+        return size
 
     def tokenize(self) -> dict:
         """
@@ -231,7 +283,10 @@ class SFSObject(BaseType):
 
     @staticmethod
     def unpack(
-        buffer: io.BytesIO | bytes, name: str | None = None, skip_type: bool = False
+        buffer: io.BytesIO | bytes,
+        name: str | None = None,
+        skip_type: bool = False,
+        typed_arrays: bool = False,
     ) -> SFSObject:
         """
         Unpacks a bytes buffer into an SFSObject instance.
@@ -239,43 +294,75 @@ class SFSObject(BaseType):
         Args:
             buffer (io.BytesIO | bytes): The bytes buffer to unpack.
             name (str | None, optional): The name of the SFS object. Defaults to None.
-            skip_type (bool): # TODO: Add description for it
+            skip_type (bool): Whether the buffer starts with the object's type id, which is skipped.
+            typed_arrays (bool): Whether numeric arrays keep their items as array.array instead of lists.
 
         Returns:
             SFSObject: The unpacked SFSObject instance.
         """
 
+        if isinstance(buffer, io.BytesIO):
+            offset = buffer.tell()
+            view = buffer.getbuffer()
+        else:
+            offset = 0
+            view = memoryview(buffer)
+
+        with view:
+            named = isinstance(name, bool) and name
+            if named:
+                start = offset + 2
+                offset = start + _SFS_OBJECT_LENGTH.unpack_from(view, offset)[0]
+                name = str(view[start:offset], "utf8")
+            if named or skip_type:
+                offset += 1
+            result, offset = SFSObject.unpack_from(view, offset, name, typed_arrays)
+
+        if isinstance(buffer, io.BytesIO):
+            buffer.seek(offset)
+        return result
+
+    @staticmethod
+    def unpack_from(
+        buffer: memoryview | bytes,
+        offset: int = 0,
+        name: str | None = None,
+        typed_arrays: bool = False,
+    ) -> tuple[SFSObject, int]:
+        """
+        Decodes an SFS object starting at offset, just past its type id.
+
+        The buffer is walked with an integer cursor and never copied; every value is decoded
+        by the unpack_from of its type, looked up by type id.
+
+        Args:
+            buffer (memoryview | bytes): The buffer to decode from.
+            offset (int): The position of the item count in buffer.
+            name (str | None): The name of the SFS object.
+            typed_arrays (bool): Whether numeric arrays keep their items as array.array instead of lists.
+
+        Returns:
+            tuple[SFSObject, int]: The decoded SFSObject and the offset just past it.
+        """
+
         # localmodules:start
-        from . import sfs2x_datatypes
-        from .SFSArray import SFSArray
+        from . import sfs2x_decoders, sfs2x_typed_decoders
         # localmodules:end
 
-        if isinstance(buffer, bytes):
-            buffer = io.BytesIO(buffer)
-        if isinstance(name, bool) and name:
-            name = BaseType.unpack_name(buffer)
-        if (isinstance(name, bool) and name) or skip_type:
-            buffer.read(1)
-
-        result = SFSObject(name)
-        length = int.from_bytes(buffer.read(2), "big")
+        decoders = sfs2x_typed_decoders if typed_arrays else sfs2x_decoders
+        length = _SFS_OBJECT_LENGTH.unpack_from(buffer, offset)[0]
+        offset += 2
+        items = {}
         for _ in range(length):
-            key = BaseType.unpack_name(buffer)
-            value = None
-            type_id = int.from_bytes(buffer.read(1), "big")
+            start = offset + 2
+            offset = start + _SFS_OBJECT_LENGTH.unpack_from(buffer, offset)[0]
+            key = str(buffer[start:offset], "utf8")
+            type_id = buffer[offset]
             if type_id > 18:
                 raise InvalidDataType(type_id)
-            if type_id == 18:
-                value = SFSObject.unpack(buffer, False)
-            elif type_id == 17:
-                value = SFSArray.unpack(buffer, False)
-                pass
-            else:
-                value = list(sfs2x_datatypes.values())[type_id].unpack(buffer, False)
-            value.set_name(key)
-            result.set_item(key, value)
+            items[key], offset = decoders[type_id](buffer, offset + 1, key)
 
-        return result
+        return SFSObject(name, items), offset
 
     def set_item(self, key: str, value: BaseType) -> SFSObject:
         """
@@ -579,7 +666,7 @@ class SFSObject(BaseType):
 
         Args:
             key (str): The key of the item to set.
-            value (SFSArray): The value to set.
+            value (SFSArray | RawSFS): The value to set, or a pre-encoded SFSArray to copy as is.
 
         Returns:
             SFSObject: The SFS object itself.
@@ -593,7 +680,7 @@ class SFSObject(BaseType):
 
         Args:
             key (str): The key of the item to set.
-            value (SFSObject): The value to set.
+            value (SFSObject | RawSFS): The value to set, or a pre-encoded SFSObject to copy as is.
 
         Returns:
             SFSObject: The SFS object itself.
@@ -664,9 +751,115 @@ class SFSObject(BaseType):
             return default
         item = self.get_item(key)
         if item.get_type() in ("sfs_object", "sfs_array"):
-            return item
+            return self._get_container(key, item)
         return self.get_item(key).get_value()
 
+    def _get_container(self, key: str, item: BaseType) -> SFSObject | SFSArray:
+        """
+        Returns an object or array item, decoding a RawSFS fragment into its place first.
+        """
+
+        if item.is_fragment:
+            item = self.get_value()[key] = item.decode()
+        return item
+
+    def _get_typed(self, key: str, item_class: type, default):
+        """
+        Gets the value of an item of the given class, for the typed getters.
+
+        Args:
+            key (str): The key of the item to get.
+            item_class (type): The class the item must be, like Int or UtfString.
+            default: The value to return if the key is missing or holds another type.
+
+        Returns:
+            The value of the item, or default.
+        """
+
+        item = self.get_value().get(key)
+        if type(item) is not item_class:
+            return default
+        return item.get_value()
+
+    def _get_typed_container(self, key: str, item_class: type, default):
+        """
+        Gets an SFSObject or SFSArray item, for getSFSObject and getSFSArray.
+
+        Lazy subclasses match item_class; a RawSFS of the same type is decoded into its place.
+
+        Args:
+            key (str): The key of the item to get.
+            item_class (type): SFSObject or SFSArray.
+            default: The value to return if the key is missing or holds another type.
+
+        Returns:
+            SFSObject | SFSArray: The item, or default.
+        """
+
+        item = self.get_value().get(key)
+        if isinstance(item, item_class):
+            return item
+        if item is not None and item.is_fragment:
+            item = item.decode()
+            if isinstance(item, item_class):
+                self.get_value()[key] = item
+                return item
+        return default
+
+    def getBool(self, key: str, default=None) -> bool | None:
+        return self._get_typed(key, Bool, default)
+
+    def getByte(self, key: str, default=None) -> bytes | None:
+        return self._get_typed(key, Byte, default)
+
+    def getShort(self, key: str, default=None) -> int | None:
+        return self._get_typed(key, Short, default)
+
+    def getInt(self, key: str, default=None) -> int | None:
+        return self._get_typed(key, Int, default)
+
+    def getLong(self, key: str, default=None) -> int | None:
+        return self._get_typed(key, Long, default)
+
+    def getFloat(self, key: str, default=None) -> float | None:
+        return self._get_typed(key, Float, default)
+
+    def getDouble(self, key: str, default=None) -> float | None:
+        return self._get_typed(key, Double, default)
+
+    def getUtfString(self, key: str, default=None) -> str | None:
+        return self._get_typed(key, UtfString, default)
+
+    def getBoolArray(self, key: str, default=None) -> list[bool] | None:
+        return self._get_typed(key, BoolArray, default)
+
+    def getByteArray(self, key: str, default=None) -> bytearray | None:
+        return self._get_typed(key, ByteArray, default)
+
+    def getShortArray(self, key: str, default=None) -> list[int] | None:
+        return self._get_typed(key, ShortArray, default)
+
+    def getIntArray(self, key: str, default=None) -> list[int] | None:
+        return self._get_typed(key, IntArray, default)
+
+    def getLongArray(self, key: str, default=None) -> list[int] | None:
+        return self._get_typed(key, LongArray, default)
+
+    def getFloatArray(self, key: str, default=None) -> list[float] | None:
+        return self._get_typed(key, FloatArray, default)
+
+    def getDoubleArray(self, key: str, default=None) -> list[float] | None:
+        return self._get_typed(key, DoubleArray, default)
+
+    def getUtfStringArray(self, key: str, default=None) -> list[str] | None:
+        return self._get_typed(key, UtfStringArray, default)
+
+    def getSFSArray(self, key: str, default=None) -> SFSArray | None:
+        return self._get_typed_container(key, SFSArray, default)
+
+    def getSFSObject(self, key: str, default=None) -> SFSObject | None:
+        return self._get_typed_container(key, SFSObject, default)
+
     @staticmethod
     def from_python_object(python_object: dict) -> SFSObject:
         """
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import io
+import struct
 
 # localmodules:start
 from .BaseType import BaseType
 # localmodules:end
 
+_SHORT_ENTRY = struct.Struct(">Bh")
+_SHORT_VALUE = struct.Struct(">h")
+
 
 class Short(BaseType):
     """
@@ -14,9 +18,14 @@ class Short(BaseType):
     Methods:
         __init__(self, name: str, value: int | bytes): Constructs a new Short object.
         pack(self) -> bytes: Returns the packed name of the object followed by a byte representing the short value.
+        pack_value_into(self, buf: bytearray, offset: int) -> int: Writes the type id followed by the short value into buf.
+        encoded_size(self) -> int: Returns the number of bytes pack_value_into writes.
         unpack(buffer: io.BytesIO | bytes, name: str | None = None) -> Byte: Unpacks a Short object from the given buffer.
+        unpack_from(buffer: memoryview, offset: int, name: str | None = None) -> tuple[Short, int]: Decodes a Short object from a buffer without copying it.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, value: int):
         """
         Constructs a new Short object.
@@ -27,18 +36,29 @@ class Short(BaseType):
         """
         super().__init__("short", name, value)
 
-    def pack(self) -> bytes:
+    def pack_value_into(self, buf: bytearray | memoryview, offset: int = 0) -> int:
+        """
+        Writes the type id followed by the short value into buf.
+
+        Args:
+            buf (bytearray | memoryview): The buffer to write into.
+            offset (int): The position in buf to start writing at.
+
+        Returns:
+            int: The offset just past the written data.
+        """
+        end = offset + 3
+        buf[offset:end] = _SHORT_ENTRY.pack(3, self.get_value())
+        return end
+
+    def encoded_size(self) -> int:
         """
-        Returns the packed name of the Short object followed by a byte representing the short value.
+        Returns the number of bytes pack_value_into writes: the type id and the short value.
 
         Returns:
-            bytes: The packed name of the object followed by a byte representing the short value.
+            int: The encoded size.
         """
-        return (
-            self.pack_name()
-            + bytes([3])
-            + self.get_value().to_bytes(2, "big", signed=True)
-        )
+        return 3
 
     @staticmethod
     def unpack(buffer: io.BytesIO | bytes, name: str | None = None) -> Short:
@@ -58,3 +78,20 @@ class Short(BaseType):
             name = BaseType.unpack_name(buffer)
 
         return Short(name, int.from_bytes(buffer.read(2), "big", signed=True))
+
+    @staticmethod
+    def unpack_from(
+        buffer: memoryview | bytes, offset: int = 0, name: str | None = None
+    ) -> tuple[Short, int]:
+        """
+        Decodes a short value starting at offset, just past its type id.
+
+        Args:
+            buffer (memoryview | bytes): The buffer to decode from.
+            offset (int): The position of the value in buffer.
+            name (str | None): The name of the Short object.
+
+        Returns:
+            tuple[Short, int]: The decoded Short object and the offset just past it.
+        """
+        return Short(name, _SHORT_VALUE.unpack_from(buffer, offset)[0]), offset + 2
@@ -4,9 +4,17 @@ import io
 import struct
 
 # localmodules:start
+from .ArrayCodec import (
+    decode_numeric_array,
+    encode_numeric_array,
+    numeric_array_size,
+)
 from .BaseType import BaseType
 # localmodules:end
 
+_SHORT_ARRAY_HEADER = struct.Struct(">BH")
+_SHORT_ARRAY_LENGTH = struct.Struct(">H")
+
 
 class ShortArray(BaseType):
     """
@@ -18,9 +26,14 @@ class ShortArray(BaseType):
 
     Methods:
         pack(): Returns a bytes representation of the short array.
+        pack_value_into(buf, offset): Writes the type id followed by the length-prefixed short array into buf.
+        encoded_size(): Returns the number of bytes pack_value_into writes.
         unpack(buffer, name): Static method that returns a ShortArray instance from a bytes buffer.
+        unpack_from(buffer, offset, name, typed): Static method that decodes a ShortArray instance from a memoryview, optionally as a typed array.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, value: list[int]):
         """
         Constructs a new ShortArray instance.
@@ -32,17 +45,35 @@ class ShortArray(BaseType):
 
         super().__init__("short_array", name, value)
 
-    def pack(self) -> bytes:
+    def pack_value_into(self, buf: bytearray | memoryview, offset: int = 0) -> int:
+        """
+        Writes the type id followed by the length-prefixed short array into buf.
+
+        The items are encoded in one step; array.array, bytes-like and other buffer
+        objects are accepted as the value alongside lists.
+
+        Args:
+            buf (bytearray | memoryview): The buffer to write into.
+            offset (int): The position in buf to start writing at.
+
+        Returns:
+            int: The offset just past the written data.
+        """
+        length, payload = encode_numeric_array(self.get_value(), "h")
+        start = offset + 3
+        end = start + len(payload)
+        buf[offset:start] = _SHORT_ARRAY_HEADER.pack(11, length)
+        buf[start:end] = payload
+        return end
+
+    def encoded_size(self) -> int:
         """
-        Packs the short array into bytes.
+        Returns the number of bytes pack_value_into writes: the type id, the item count and the items.
 
         Returns:
-            bytes: The bytes representation of the short array.
+            int: The encoded size.
         """
-        result = len(self.get_value()).to_bytes(2, "big")
-        for i in self.get_value():
-            result += i.to_bytes(2, "big", signed=True)
-        return self.pack_name() + bytes([11]) + result
+        return 3 + numeric_array_size(self.get_value(), "h")
 
     @staticmethod
     def unpack(buffer: io.BytesIO | bytes, name: str | None = None) -> ShortArray:
@@ -62,7 +93,29 @@ class ShortArray(BaseType):
             name = BaseType.unpack_name(buffer)
 
         length = int.from_bytes(buffer.read(2), "big")
-        array = []
-        for _ in range(length):
-            array.append(int.from_bytes(buffer.read(2), "big", signed=True))
-        return ShortArray(name, array)
+        items = decode_numeric_array(buffer.read(length * 2), "h")
+        return ShortArray(name, items.tolist())
+
+    @staticmethod
+    def unpack_from(
+        buffer: memoryview | bytes,
+        offset: int = 0,
+        name: str | None = None,
+        typed: bool = False,
+    ) -> tuple[ShortArray, int]:
+        """
+        Decodes a length-prefixed short array starting at offset, just past its type id.
+
+        Args:
+            buffer (memoryview | bytes): The buffer to decode from.
+            offset (int): The position of the value in buffer.
+            name (str | None): The name of the ShortArray object.
+            typed (bool): Whether to keep the items as an array.array('h') instead of a list.
+
+        Returns:
+            tuple[ShortArray, int]: The decoded ShortArray object and the offset just past it.
+        """
+        start = offset + 2
+        end = start + _SHORT_ARRAY_LENGTH.unpack_from(buffer, offset)[0] * 2
+        items = decode_numeric_array(buffer[start:end], "h")
+        return ShortArray(name, items if typed else items.tolist()), end
@@ -7,6 +7,9 @@ import struct
 from .BaseType import BaseType
 # localmodules:end
 
+_UTF_STRING_HEADER = struct.Struct(">BH")
+_UTF_STRING_LENGTH = struct.Struct(">H")
+
 
 class UtfString(BaseType):
     """
@@ -15,9 +18,14 @@ class UtfString(BaseType):
     Methods:
         __init__(self, name: str, value: int | bytes): Constructs a new UtfString object.
         pack(self) -> bytes: Returns the packed name of the object followed by a byte representing the utf_string value.
+        pack_value_into(self, buf: bytearray, offset: int) -> int: Writes the type id followed by the length-prefixed utf_string value into buf.
+        encoded_size(self) -> int: Returns the number of bytes pack_value_into writes.
         unpack(buffer: io.BytesIO | bytes, name: str | None = None) -> Byte: Unpacks a UtfString object from the given buffer.
+        unpack_from(buffer: memoryview, offset: int, name: str | None = None) -> tuple[UtfString, int]: Decodes a UtfString object from a buffer without copying it.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, value: str):
         """
         Constructs a new UtfString object.
@@ -28,15 +36,31 @@ class UtfString(BaseType):
         """
         super().__init__("utf_string", name, value)
 
-    def pack(self) -> bytes:
+    def pack_value_into(self, buf: bytearray | memoryview, offset: int = 0) -> int:
+        """
+        Writes the type id followed by the length-prefixed utf_string value into buf.
+
+        Args:
+            buf (bytearray | memoryview): The buffer to write into.
+            offset (int): The position in buf to start writing at.
+
+        Returns:
+            int: The offset just past the written data.
+        """
+        encoded = self.get_value().encode("utf8")
+        end = offset + 3 + len(encoded)
+        buf[offset:end] = _UTF_STRING_HEADER.pack(8, len(encoded)) + encoded
+        return end
+
+    def encoded_size(self) -> int:
         """
-        Returns the packed name of the UtfString object followed by a byte representing the utf_string value.
+        Returns the number of bytes pack_value_into writes: the type id, the length and the UTF-8 string.
 
         Returns:
-            bytes: The packed name of the object followed by a byte representing the utf_string value.
+            int: The encoded size.
         """
-        length = len(self.get_value()).to_bytes(2, "big")
-        return self.pack_name() + bytes([8]) + length + self.get_value().encode("utf8")
+        value = self.get_value()
+        return 3 + (len(value) if value.isascii() else len(value.encode("utf-8")))
 
     @staticmethod
     def unpack(buffer: io.BytesIO | bytes, name: str | None = None) -> UtfString:
@@ -57,3 +81,22 @@ class UtfString(BaseType):
 
         length = int.from_bytes(buffer.read(2), "big")
         return UtfString(name, buffer.read(length).decode("utf8"))
+
+    @staticmethod
+    def unpack_from(
+        buffer: memoryview | bytes, offset: int = 0, name: str | None = None
+    ) -> tuple[UtfString, int]:
+        """
+        Decodes a length-prefixed utf_string value starting at offset, just past its type id.
+
+        Args:
+            buffer (memoryview | bytes): The buffer to decode from.
+            offset (int): The position of the value in buffer.
+            name (str | None): The name of the UtfString object.
+
+        Returns:
+            tuple[UtfString, int]: The decoded UtfString object and the offset just past it.
+        """
+        start = offset + 2
+        end = start + _UTF_STRING_LENGTH.unpack_from(buffer, offset)[0]
+        return UtfString(name, str(buffer[start:end], "utf8")), end
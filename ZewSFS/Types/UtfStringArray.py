@@ -7,6 +7,9 @@ import struct
 from .BaseType import BaseType
 # localmodules:end
 
+_UTF_STRING_ARRAY_HEADER = struct.Struct(">BH")
+_UTF_STRING_ARRAY_LENGTH = struct.Struct(">H")
+
 
 class UtfStringArray(BaseType):
     """
@@ -18,9 +21,14 @@ class UtfStringArray(BaseType):
 
     Methods:
         pack(): Returns a bytes representation of the utf_string array.
+        pack_value_into(buf, offset): Writes the type id followed by the length-prefixed utf_string array into buf.
+        encoded_size(): Returns the number of bytes pack_value_into writes.
         unpack(buffer, name): Static method that returns a UtfStringArray instance from a bytes buffer.
+        unpack_from(buffer, offset, name): Static method that decodes a UtfStringArray instance from a memoryview without copying it.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, value: list[str]):
         """
         Constructs a new UtfStringArray instance.
@@ -32,17 +40,39 @@ class UtfStringArray(BaseType):
 
         super().__init__("utf_string_array", name, value)
 
-    def pack(self) -> bytes:
+    def pack_value_into(self, buf: bytearray | memoryview, offset: int = 0) -> int:
+        """
+        Writes the type id followed by the length-prefixed utf_string array into buf.
+
+        Args:
+            buf (bytearray | memoryview): The buffer to write into.
+            offset (int): The position in buf to start writing at.
+
+        Returns:
+            int: The offset just past the written data.
         """
-        Packs the utf_string array into bytes.
+        values = self.get_value()
+        parts = [_UTF_STRING_ARRAY_HEADER.pack(16, len(values))]
+        for i in values:
+            encoded = i.encode("utf-8")
+            parts.append(len(encoded).to_bytes(2, "big"))
+            parts.append(encoded)
+        data = b"".join(parts)
+        end = offset + len(data)
+        buf[offset:end] = data
+        return end
+
+    def encoded_size(self) -> int:
+        """
+        Returns the number of bytes pack_value_into writes: the type id, the item count and the length-prefixed strings.
 
         Returns:
-            bytes: The bytes representation of the utf_string array.
+            int: The encoded size.
         """
-        result = len(self.get_value()).to_bytes(2, "big")
+        size = 3
         for i in self.get_value():
-            result += len(i).to_bytes(2, "big") + i.encode("utf-8")
-        return self.pack_name() + bytes([16]) + result
+            size += 2 + (len(i) if i.isascii() else len(i.encode("utf-8")))
+        return size
 
     @staticmethod
     def unpack(buffer: io.BytesIO | bytes, name: str | None = None) -> UtfStringArray:
@@ -67,3 +97,27 @@ class UtfStringArray(BaseType):
             string_length = int.from_bytes(buffer.read(2), "big")
             array.append(buffer.read(string_length).decode("utf-8"))
         return UtfStringArray(name, array)
+
+    @staticmethod
+    def unpack_from(
+        buffer: memoryview | bytes, offset: int = 0, name: str | None = None
+    ) -> tuple[UtfStringArray, int]:
+        """
+        Decodes a length-prefixed utf_string array starting at offset, just past its type id.
+
+        Args:
+            buffer (memoryview | bytes): The buffer to decode from.
+            offset (int): The position of the value in buffer.
+            name (str | None): The name of the UtfStringArray object.
+
+        Returns:
+            tuple[UtfStringArray, int]: The decoded UtfStringArray object and the offset just past it.
+        """
+        length = _UTF_STRING_ARRAY_LENGTH.unpack_from(buffer, offset)[0]
+        offset += 2
+        array = []
+        for _ in range(length):
+            start = offset + 2
+            offset = start + _UTF_STRING_ARRAY_LENGTH.unpack_from(buffer, offset)[0]
+            array.append(str(buffer[start:offset], "utf-8"))
+        return UtfStringArray(name, array), offset
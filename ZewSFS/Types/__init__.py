@@ -1,3 +1,5 @@
+from functools import partial
+
 # localmodules:start
 from .Bool import Bool
 from .BoolArray import BoolArray
@@ -9,9 +11,11 @@ from .Float import Float
 from .FloatArray import FloatArray
 from .Int import Int
 from .IntArray import IntArray
+from .LazySFSObject import LazySFSArray, LazySFSObject
 from .Long import Long
 from .LongArray import LongArray
 from .Null import Null
+from .RawSFS import RawSFS
 from .SFSArray import SFSArray
 from .SFSObject import SFSObject
 from .Short import Short
@@ -42,6 +46,24 @@ sfs2x_datatypes = {
     "sfs_object": SFSObject,
 }
 
+# Decoders indexed by wire type id, in the same order as sfs2x_datatypes.
+sfs2x_decoders = tuple(datatype.unpack_from for datatype in sfs2x_datatypes.values())
+# Same as sfs2x_decoders, but numeric arrays decode to array.array instead of lists.
+sfs2x_typed_decoders = (
+    sfs2x_decoders[:9]
+    + tuple(partial(decoder, typed=True) for decoder in sfs2x_decoders[9:16])
+    + (sfs2x_decoders[16],)
+    + (
+        partial(SFSArray.unpack_from, typed_arrays=True),
+        partial(SFSObject.unpack_from, typed_arrays=True),
+    )
+)
+# Same as sfs2x_decoders, but nested objects and arrays are wrapped instead of decoded.
+sfs2x_lazy_decoders = sfs2x_decoders[:17] + (
+    LazySFSArray.unpack_from,
+    LazySFSObject.unpack_from,
+)
+
 
 def _sfs_type_name(val):
     return getattr(val, "get_type", lambda: type(val).__name__.lower())()
@@ -1,36 +1,242 @@
+import zlib
 from io import BytesIO
 
 # localmodules:start
+from ZewSFS.Exceptions import CompilePacketException
+from ZewSFS.Schema import SFSSchema
 from ZewSFS.Types import SFSObject
 # localmodules:end
 
+# Header flags of a frame: binary protocol, zlib compressed body, 4-byte length field.
+PACKET_BINARY = 0x80
+PACKET_COMPRESSED = 0x20
+PACKET_BIG_SIZE = 0x08
 
-def compile_packet(packet: SFSObject) -> bytes:
+
+def compile_packet(packet: SFSObject, max_size: int | None = None) -> bytearray:
     """
     This function compiles a packet into bytes.
 
+    The size of the body is computed first, so the header is chosen up front, an oversize
+    packet is refused before anything is encoded, and the body is written into a buffer of
+    exactly the right size.
+
     Args:
         packet (SFSObject): The packet to be compiled.
+        max_size (int | None): The largest body size allowed, if any.
+
+    Returns:
+        bytearray: The compiled packet in bytes.
+
+    Raises:
+        CompilePacketException: If the packet is larger than max_size.
+    """
+    packet_size = packet.encoded_size()
+    _check_packet_size(packet_size, max_size)
+    if packet_size < 65535:
+        header_size = 3
+        buf = bytearray(header_size + packet_size)
+        buf[0] = 0x80
+        buf[1:3] = packet_size.to_bytes(2, "big")
+    else:
+        header_size = 5
+        buf = bytearray(header_size + packet_size)
+        buf[0] = 0x88
+        buf[1:5] = packet_size.to_bytes(4, "big")
+    end = packet.pack_value_into(buf, header_size)
+    if end != len(buf):
+        raise CompilePacketException(
+            f"Packet body is {end - header_size} bytes, expected {packet_size}"
+        )
+    return buf
+
+
+def compile_extension_packet(
+    schema: SFSSchema, cmd: str, params, max_size: int | None = None
+) -> bytearray:
+    """
+    This function compiles an extension response straight from plain Python values.
+
+    With a max_size, the size of the body is computed from the values first, so an oversize
+    packet is refused before anything is encoded.
+
+    Args:
+        schema (SFSSchema): The shape of the response parameters.
+        cmd (str): The command of the response.
+        params: The response parameters, as plain Python values matching schema.
+        max_size (int | None): The largest body size allowed, if any.
+
+    Returns:
+        bytearray: The compiled packet in bytes.
+
+    Raises:
+        CompilePacketException: If the packet is larger than max_size.
+    """
+    if max_size is not None:
+        _check_packet_size(schema.extension_size(cmd, params), max_size)
+    buf = bytearray(5)
+    schema.pack_extension_into(buf, cmd, params)
+    return _frame_packet(buf)
+
+
+def compile_extension_response(
+    cmd: str, params: SFSObject, max_size: int | None = None
+) -> bytearray:
+    """
+    This function compiles the extension response a server sends for a command.
+
+    Args:
+        cmd (str): The command of the response.
+        params (SFSObject): The response parameters.
+        max_size (int | None): The largest body size allowed, if any.
 
     Returns:
-        bytes: The compiled packet in bytes.
+        bytearray: The compiled packet in bytes.
 
     Raises:
-        CompilePacketException: If there is an error in compiling the packet.
+        CompilePacketException: If the packet is larger than max_size.
+    """
+    request = SFSObject()
+    request.putUtfString("c", cmd)
+    request.putInt("r", -1)
+    request.putSFSObject("p", params)
+
+    packet = SFSObject()
+    packet.putByte("c", 1)
+    packet.putShort("a", 13)
+    packet.putSFSObject("p", request)
+    return compile_packet(packet, max_size)
+
+
+def _check_packet_size(packet_size: int, max_size: int | None):
+    """
+    Refuses a packet body larger than max_size.
+
+    Raises:
+        CompilePacketException: If the packet is larger than max_size.
+    """
+    if max_size is not None and packet_size > max_size:
+        raise CompilePacketException(
+            f"Packet of {packet_size} bytes exceeds the {max_size} bytes limit"
+        )
+
+
+def _frame_packet(buf: bytearray) -> bytearray:
+    """
+    Writes the packet header into the 5 bytes reserved at the start of buf.
+
+    Args:
+        buf (bytearray): 5 reserved bytes followed by the packed body.
+
+    Returns:
+        bytearray: The framed packet, sharing memory with buf.
+    """
+    packet_size = len(buf) - 5
+    if packet_size < 65535:
+        buf[2] = 0x80
+        buf[3:5] = packet_size.to_bytes(2, "big")
+        del buf[:2]
+    else:
+        buf[0] = 0x88
+        buf[1:5] = packet_size.to_bytes(4, "big")
+    return buf
+
+
+def parse_packet_header(header: int) -> tuple[int, bool] | None:
+    """
+    Reads the flags of a frame header.
+
+    Args:
+        header (int): The first byte of the frame.
+
+    Returns:
+        tuple[int, bool] | None: The size of the length field and whether the body is compressed,
+            or None if the frame uses a flag that is not supported (encryption, text protocol).
+    """
+    if header & ~(PACKET_COMPRESSED | PACKET_BIG_SIZE) != PACKET_BINARY:
+        return None
+    return (4 if header & PACKET_BIG_SIZE else 2), bool(header & PACKET_COMPRESSED)
+
+
+def packet_body_size(packet: bytes | bytearray) -> int:
+    """
+    Returns the size of the body of a compiled packet, read from its header.
+
+    Args:
+        packet (bytes | bytearray): The compiled packet.
+
+    Returns:
+        int: The size of the body, without the header.
+    """
+    if packet[0] & PACKET_BIG_SIZE:
+        return int.from_bytes(packet[1:5], "big")
+    return int.from_bytes(packet[1:3], "big")
+
+
+def compress_packet(packet: bytes | bytearray, level: int = 6) -> bytes | bytearray:
+    """
+    This function compresses the body of a compiled packet with zlib and sets the compressed flag.
+
+    Bodies that don't shrink are sent as they are, so the packet is returned unchanged for them.
+
+    Args:
+        packet (bytes | bytearray): The compiled, uncompressed packet.
+        level (int): The zlib compression level, from 1 (fastest) to 9 (smallest).
+
+    Returns:
+        bytes | bytearray: The compressed packet, or packet itself if compressing doesn't pay off.
     """
-    compiled_packet = packet.pack()
-    if len(compiled_packet) < 65535:
-        return b"\x80" + (len(compiled_packet)).to_bytes(2, "big") + compiled_packet
+    header_size = 5 if packet[0] & PACKET_BIG_SIZE else 3
+    body = zlib.compress(memoryview(packet)[header_size:], level)
+    packet_size = len(body)
+    if packet_size >= len(packet) - header_size:
+        return packet
+    if packet_size < 65535:
+        header = bytes((PACKET_BINARY | PACKET_COMPRESSED,))
+        header += packet_size.to_bytes(2, "big")
     else:
-        return b"\x88" + (len(compiled_packet)).to_bytes(4, "big") + compiled_packet
+        header = bytes((PACKET_BINARY | PACKET_COMPRESSED | PACKET_BIG_SIZE,))
+        header += packet_size.to_bytes(4, "big")
+    return header + body
+
+
+def decompress_packet_body(body: bytes | memoryview, max_size: int | None = None) -> bytes:
+    """
+    This function inflates the body of a compressed frame.
+
+    The output is capped at max_size while inflating, so a small frame can't expand into an
+    arbitrarily large buffer.
+
+    Args:
+        body (bytes | memoryview): The compressed body, without the frame header.
+        max_size (int | None): The largest inflated size allowed, if any.
+
+    Returns:
+        bytes: The inflated body.
+
+    Raises:
+        CompilePacketException: If the body is not valid zlib data, is truncated or inflates past max_size.
+    """
+    decompressor = zlib.decompressobj()
+    try:
+        data = decompressor.decompress(body, 0 if max_size is None else max_size + 1)
+    except zlib.error as e:
+        raise CompilePacketException(f"Invalid compressed packet: {e}") from e
+    if max_size is not None and len(data) > max_size:
+        raise CompilePacketException(
+            f"Compressed packet inflates past the {max_size} bytes limit"
+        )
+    if not decompressor.eof:
+        raise CompilePacketException("Truncated compressed packet")
+    return data
 
 
-def decompile_packet(packet: BytesIO) -> SFSObject:
+def decompile_packet(packet: BytesIO | bytes | memoryview) -> SFSObject:
     """
     This function decompiles a packet from bytes to an SFSObject.
 
     Args:
-        packet (BytesIO): The packet in bytes to be decompiled.
+        packet (BytesIO | bytes | memoryview): The packet in bytes to be decompiled.
 
     Returns:
         SFSObject: The decompiled packet as an SFSObject.
@@ -1,4 +1,6 @@
 # localmodules:start
 from .Server import SFSServer
 from .Client import SFSClient
+from .Schema import SFSSchema
+from .Capture import SFSCaptureReader, SFSFrameCapture
 # localmodules:end
@@ -5,3 +5,18 @@ ROUTE_PREFIX = os.environ.get("ROUTE_PREFIX", "")
 HTTP_PORT = os.environ.get("HTTP_PORT", "9013")
 DATABASE_PATH = os.environ.get("DATABASE_PATH", "zewmsm.db")
 HOME = os.environ.get("HOME", ".")
+SFS_COMPRESSION_THRESHOLD = int(os.environ.get("SFS_COMPRESSION_THRESHOLD", "1024"))
+SFS_COMPRESSION_LEVEL = int(os.environ.get("SFS_COMPRESSION_LEVEL", "6"))
+SFS_WORKERS = int(os.environ.get("SFS_WORKERS", "1"))
+# Seconds a game client may send nothing before it is disconnected; 0 disables it.
+SFS_IDLE_TIMEOUT = float(os.environ.get("SFS_IDLE_TIMEOUT", "300"))
+# Admission control of the game server: requests per second (and burst) one client may send,
+# and expensive requests (login, gs_player, db_* cache misses) handled at the same time.
+SFS_CLIENT_RATE = float(os.environ.get("SFS_CLIENT_RATE", "30"))
+SFS_CLIENT_BURST = float(os.environ.get("SFS_CLIENT_BURST", "60"))
+SFS_MAX_EXPENSIVE_REQUESTS = int(os.environ.get("SFS_MAX_EXPENSIVE_REQUESTS", "8"))
+# Seconds a game server has to finish its requests and close its connections on SIGTERM.
+SFS_DRAIN_TIMEOUT = float(os.environ.get("SFS_DRAIN_TIMEOUT", "20"))
+# If set, the game server records every frame to this file, for ZewSFS.Client.SFSReplay to play back.
+# "{pid}" is replaced by the process id, so workers write separate files.
+SFS_CAPTURE_PATH = os.environ.get("SFS_CAPTURE_PATH", "")
@@ -1,4 +1,5 @@
 import asyncio
+import json
 from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import TypeVar, Type, List, Optional, Dict
@@ -8,7 +9,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 # localmodules:start
-from ZewSFS.Types import SFSObject, Long, SFSArray
+from ZewSFS.JsonTranscoder import transcode_json
+from ZewSFS.Schema import SFSSchema
+from ZewSFS.Types import SFSObject, Long, Double, SFSArray, RawSFS
 from database import Base, Session as SessionLocal
 # localmodules:end
 
@@ -20,6 +23,16 @@ current_transaction = __import__("contextvars").ContextVar(
 
 model_adapter_map: Dict[Type[Base], Type["BaseAdapter"]] = {}
 
+# Schema type of the values to_sfs_object puts: by SFS type for _specific_sfs_datatypes,
+# by Python type (what putAny picks) for the other columns.
+_ADAPTER_SCHEMA_SFS_TYPES = {Long: "long", Double: "double"}
+_ADAPTER_SCHEMA_PYTHON_TYPES = {
+    int: "int",
+    float: "double",
+    str: "utf_string",
+    bool: "bool",
+}
+
 
 def register_adapter(model_class: Type[Base]):
     def decorator(adapter_class: Type["BaseAdapter"]):
@@ -74,6 +87,8 @@ class BaseAdapterMeta(type):
         db_model = dct.get("_db_model")
         if db_model:
             model_adapter_map[db_model] = cls
+        if dct.get("_sfs_extra_keys"):
+            cls.sfs_schema = SFSSchema(cls.sfs_schema_fields())
         return cls
 
 
@@ -82,9 +97,16 @@ class BaseAdapter(metaclass=BaseAdapterMeta):
 
     _game_id_key = "id"
     _specific_sfs_datatypes = {}
+    # key -> field update_sfs puts again under that key, after the columns. Adapters
+    # that set it get an sfs_schema of to_sfs_object(), to encode to_sfs_values()
+    # without building an SFSObject.
+    _sfs_extra_keys: Dict[str, str] = {}
+    sfs_schema: Optional[SFSSchema] = None
 
     id: int = None
     _db_instance: Optional[Base] = None
+    # field -> (JSON text, encoded fragment), see sfs_fragment
+    _sfs_fragments: Optional[Dict[str, tuple]] = None
 
     def __init__(self):
         self.created_at: datetime = datetime.now()
@@ -437,29 +459,83 @@ class BaseAdapter(metaclass=BaseAdapterMeta):
     def enforce_dict(self, data: dict):
         return data
 
+    @classmethod
+    def _sfs_datatypes(cls) -> dict:
+        return {
+            "id": Long,
+            "date_created": Long,
+            "last_updated": Long,
+        } | cls._specific_sfs_datatypes
+
     async def to_sfs_object(self) -> SFSObject:
         obj = SFSObject()
+        sds = self._sfs_datatypes()
         for field in self._db_model.__table__.columns.keys():
             key = self._game_id_key if field == "id" else field
             val = getattr(self, field)
             if val is None:
                 continue
-            sds = {
-                "id": Long,
-                "date_created": Long,
-                "last_updated": Long,
-            } | self._specific_sfs_datatypes
             if field in sds:
                 obj.set_item(key, sds.get(field)(name=key, value=val))
             else:
                 obj.putAny(key, val)
         return await self.update_sfs(obj)
 
+    @classmethod
+    def sfs_schema_fields(cls) -> dict:
+        """Shape of to_sfs_object(), in its key order: columns, then _sfs_extra_keys."""
+        sds = cls._sfs_datatypes()
+        schema = {}
+        for field, column in cls._db_model.__table__.columns.items():
+            key = cls._game_id_key if field == "id" else field
+            if field in sds:
+                schema[key] = _ADAPTER_SCHEMA_SFS_TYPES[sds[field]]
+            else:
+                schema[key] = _ADAPTER_SCHEMA_PYTHON_TYPES[column.type.python_type]
+        for key, field in cls._sfs_extra_keys.items():
+            schema[key] = schema[cls._game_id_key if field == "id" else field]
+        return schema
+
+    def to_sfs_values(self) -> dict:
+        """Same fields as to_sfs_object, as plain values for sfs_schema."""
+        values = {}
+        for field in self._db_model.__table__.columns.keys():
+            values[self._game_id_key if field == "id" else field] = getattr(self, field)
+        for key, field in self._sfs_extra_keys.items():
+            values[key] = getattr(self, field)
+        return values
+
+    def sfs_fragment(self, field: str, sfs_type=SFSObject) -> RawSFS:
+        """Encodes the JSON stored in field once, as sfs_type; reused until it changes.
+
+        An empty value ("", "{}", "[]") gives an empty sfs_type; others must hold one.
+        """
+        text = getattr(self, field)
+        if self._sfs_fragments is None:
+            self._sfs_fragments = {}
+        cached = self._sfs_fragments.get(field)
+        if cached is None or cached[0] != text:
+            value = text
+            if isinstance(value, (str, bytes)):
+                value = json.loads(value) if value else None
+            if not value:
+                value = {} if sfs_type is SFSObject else []
+            elif type(value) is not (dict if sfs_type is SFSObject else list):
+                raise TypeError(
+                    f"{type(self).__name__}.{field} does not hold "
+                    f"an {sfs_type.__name__}: {text!r:.40}"
+                )
+            cached = (text, RawSFS(None, transcode_json(value)))
+            self._sfs_fragments[field] = cached
+        return cached[1]
+
     @classmethod
     async def from_sfs_object(cls: Type[T], obj: SFSObject) -> T:
         instance = cls()
         values = obj.get_value()
         for field, val_container in values.items():
+            if val_container.is_fragment:
+                val_container = val_container.decode()
             if isinstance(val_container, (SFSObject, SFSArray)):
                 val = val_container.to_json()
             else:
@@ -28,7 +28,7 @@ class BreedingCombination(BaseAdapter):
     modifier: float = 1.0
 
     @classmethod
-    async def _ensure_loaded(cls):
+    async def ensure_loaded(cls):
         async with _session_ctx() as session:
             from sqlalchemy import select
 
@@ -39,12 +39,12 @@ class BreedingCombination(BaseAdapter):
 
     @classmethod
     async def load_all(cls, use_cache: bool = False):
-        await cls._ensure_loaded()
+        await cls.ensure_loaded()
         return await super().load_all(use_cache=use_cache)
 
     @classmethod
     async def load_by_id(cls, id: int, use_cache: bool = True):
-        await cls._ensure_loaded()
+        await cls.ensure_loaded()
         return await super().load_by_id(id, use_cache=use_cache)
 
     @classmethod
@@ -52,7 +52,7 @@ class BreedingCombination(BaseAdapter):
         cls, monster_1: int, monster_2: int
     ) -> Optional["BreedingCombination"]:
         """Find combo by (monster_1, monster_2) or (monster_2, monster_1)."""
-        await cls._ensure_loaded()
+        await cls.ensure_loaded()
         all_combos = await cls.load_all(use_cache=True)
         for combo in all_combos:
             if (combo.monster_1 == monster_1 and combo.monster_2 == monster_2) or (
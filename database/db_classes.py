@@ -237,3 +237,11 @@ class PlayerMonsterDB(Base):
     times_fed = Column(Integer, nullable=False, default=0)
     volume = Column(Float, nullable=False, default=1.0)
     last_collection = Column(BIGINT, nullable=True, default=None)
+
+
+# Which game server worker a player is active in; id is the player's id.
+class PlayerLeaseDB(Base):
+    __tablename__ = "player_leases"
+
+    owner = Column(String, nullable=False, default="")
+    expires_at = Column(BIGINT, nullable=False, default=0)
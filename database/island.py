@@ -36,7 +36,7 @@ class Island(BaseAdapter):
     levels: str = "[]"
 
     @classmethod
-    async def _ensure_loaded(cls):
+    async def ensure_loaded(cls):
         async with _session_ctx() as session:
             from sqlalchemy import select
 
@@ -47,12 +47,12 @@ class Island(BaseAdapter):
 
     @classmethod
     async def load_all(cls, use_cache: bool = False):
-        await cls._ensure_loaded()
+        await cls.ensure_loaded()
         return await super().load_all(use_cache=use_cache)
 
     @classmethod
     async def load_by_id(cls, id: int, use_cache: bool = True):
-        await cls._ensure_loaded()
+        await cls.ensure_loaded()
         return await super().load_by_id(id, use_cache=use_cache)
 
     @classmethod
@@ -129,15 +129,15 @@ class Island(BaseAdapter):
 
     async def update_sfs(self, params: SFSObject):
         params.putInt("island_id", self.id)
-        params.putSFSObject("graphic", SFSObject.from_json(self.graphic))
-        params.putSFSArray("monsters", SFSArray.from_json(self.monsters))
-        params.putSFSArray("structures", SFSArray.from_json(self.structures))
+        params.putSFSObject("graphic", self.sfs_fragment("graphic"))
+        params.putSFSArray("monsters", self.sfs_fragment("monsters", SFSArray))
+        params.putSFSArray("structures", self.sfs_fragment("structures", SFSArray))
         params.remove_item(
             "levels"
         )  # base adds "levels" string; legacy has only beds.levels
         params.remove_item("date_created")  # legacy static island does not send this
         beds = SFSObject()
-        beds.putSFSArray("levels", SFSArray.from_json(self.levels))
+        beds.putSFSArray("levels", self.sfs_fragment("levels", SFSArray))
         params.putSFSObject("beds", beds)
         params.putLong("last_changed", 0)
         return params
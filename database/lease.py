@@ -0,0 +1,55 @@
+"""Per-player ownership leases, so a player is only active in one game server worker at a time."""
+
+import time
+
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+# localmodules:start
+from database import PlayerLeaseDB, Session
+# localmodules:end
+
+
+async def acquire_player_lease(player_id: int, owner: str, ttl_ms: int) -> bool:
+    """Takes or extends the lease of a player; fails while another owner holds an unexpired one."""
+    now_ms = int(time.time() * 1000)
+    async with Session() as session:
+        stmt = sqlite_insert(PlayerLeaseDB).values(
+            id=player_id, owner=owner, expires_at=now_ms + ttl_ms
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[PlayerLeaseDB.id],
+            set_={"owner": owner, "expires_at": now_ms + ttl_ms},
+            where=or_(
+                PlayerLeaseDB.owner == owner, PlayerLeaseDB.expires_at < now_ms
+            ),
+        )
+        await session.execute(stmt)
+        r = await session.execute(
+            select(PlayerLeaseDB.owner).where(PlayerLeaseDB.id == player_id)
+        )
+        await session.commit()
+        return r.scalar() == owner
+
+
+async def renew_player_leases(owner: str, ttl_ms: int) -> None:
+    """Extends every lease held by owner, in one statement."""
+    now_ms = int(time.time() * 1000)
+    async with Session() as session:
+        await session.execute(
+            update(PlayerLeaseDB)
+            .where(PlayerLeaseDB.owner == owner)
+            .values(expires_at=now_ms + ttl_ms)
+        )
+        await session.commit()
+
+
+async def release_player_lease(player_id: int, owner: str) -> None:
+    """Drops the lease of a player, if owner still holds it."""
+    async with Session() as session:
+        await session.execute(
+            delete(PlayerLeaseDB).where(
+                PlayerLeaseDB.id == player_id, PlayerLeaseDB.owner == owner
+            )
+        )
+        await session.commit()
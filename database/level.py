@@ -28,7 +28,7 @@ class Level(BaseAdapter):
     daily_rewards: str = "[]"
 
     @classmethod
-    async def _ensure_loaded(cls):
+    async def ensure_loaded(cls):
         async with _session_ctx() as session:
             from sqlalchemy import select
 
@@ -39,12 +39,12 @@ class Level(BaseAdapter):
 
     @classmethod
     async def load_all(cls, use_cache: bool = False):
-        await cls._ensure_loaded()
+        await cls.ensure_loaded()
         return await super().load_all(use_cache=use_cache)
 
     @classmethod
     async def load_by_id(cls, id: int, use_cache: bool = True):
-        await cls._ensure_loaded()
+        await cls.ensure_loaded()
         return await super().load_by_id(id, use_cache=use_cache)
 
     @classmethod
@@ -104,5 +104,7 @@ class Level(BaseAdapter):
         currency_conversion.putInt("coins", self.coins_conversion)
         currency_conversion.putInt("diamonds", self.diamonds_conversion)
         params.putSFSObject("currency_conversion", currency_conversion)
-        params.putSFSArray("daily_rewards", SFSArray.from_json(self.daily_rewards))
+        params.putSFSArray(
+            "daily_rewards", self.sfs_fragment("daily_rewards", SFSArray)
+        )
         return params
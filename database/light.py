@@ -31,7 +31,7 @@ class Light(BaseAdapter):
     description: str = ""
 
     @classmethod
-    async def _ensure_loaded(cls):
+    async def ensure_loaded(cls):
         async with _session_ctx() as session:
             from sqlalchemy import select
 
@@ -42,12 +42,12 @@ class Light(BaseAdapter):
 
     @classmethod
     async def load_all(cls, use_cache: bool = False):
-        await cls._ensure_loaded()
+        await cls.ensure_loaded()
         return await super().load_all(use_cache=use_cache)
 
     @classmethod
     async def load_by_id(cls, id: int, use_cache: bool = True):
-        await cls._ensure_loaded()
+        await cls.ensure_loaded()
         return await super().load_by_id(id, use_cache=use_cache)
 
     @classmethod
@@ -101,5 +101,5 @@ class Light(BaseAdapter):
     async def update_sfs(self, params: SFSObject):
         params.remove_item("date_created")
         params.putInt("lighting_id", self.id)
-        params.putSFSObject("graphic", SFSObject.from_json(self.graphic))
+        params.putSFSObject("graphic", self.sfs_fragment("graphic"))
         return params
@@ -61,7 +61,7 @@ class Monster(BaseAdapter):
             return []
 
     @classmethod
-    async def _ensure_loaded(cls):
+    async def ensure_loaded(cls):
         async with _session_ctx() as session:
             from sqlalchemy import select
 
@@ -72,12 +72,12 @@ class Monster(BaseAdapter):
 
     @classmethod
     async def load_all(cls, use_cache: bool = False):
-        await cls._ensure_loaded()
+        await cls.ensure_loaded()
         return await super().load_all(use_cache=use_cache)
 
     @classmethod
     async def load_by_id(cls, id: int, use_cache: bool = True):
-        await cls._ensure_loaded()
+        await cls.ensure_loaded()
         return await super().load_by_id(id, use_cache=use_cache)
 
     @classmethod
@@ -181,9 +181,9 @@ class Monster(BaseAdapter):
 
     async def update_sfs(self, params: SFSObject) -> SFSObject:
         params.remove_item("date_created")
-        params.putSFSObject("graphic", SFSObject.from_json(self.graphic))
-        params.putSFSArray("happiness", SFSArray.from_json(self.happiness))
-        params.putSFSArray("levels", SFSArray.from_json(self.levels))
-        params.putSFSArray("requirements", SFSArray.from_json(self.requirements))
+        params.putSFSObject("graphic", self.sfs_fragment("graphic"))
+        params.putSFSArray("happiness", self.sfs_fragment("happiness", SFSArray))
+        params.putSFSArray("levels", self.sfs_fragment("levels", SFSArray))
+        params.putSFSArray("requirements", self.sfs_fragment("requirements", SFSArray))
         params.putLong("last_changed", 0)
         return params
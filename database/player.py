@@ -10,11 +10,25 @@ from database.island import Island
 from database.level import Level
 from database.monster import Monster
 from database.structure import Structure
+from ZewSFS.Schema import SFSSchema
 from ZewSFS.Types import Double, Long, SFSArray, SFSObject
 # localmodules:end
 
 logger = logging.getLogger("GameServer/Player")
 
+# Items of a "properties" array: every item carries exactly one of these keys.
+PLAYER_PROPERTY_SCHEMA = {
+    "coins": "int",
+    "diamonds": "int",
+    "food": "int",
+    "xp": "int",
+    "level": "int",
+}
+# Parameters of gs_update_properties.
+PLAYER_PROPERTIES_SCHEMA = SFSSchema(
+    {"success": "bool", "properties": [PLAYER_PROPERTY_SCHEMA]}
+)
+
 
 class Player(BaseAdapter):
     _db_model = PlayerDB
@@ -40,8 +54,8 @@ class Player(BaseAdapter):
         params.putInt("user_id", self.id)
         params.putLong("last_collection", self.last_collection or 0)
         params.putLong("active_island", self.active_island or -1)
-        params.putSFSArray("backdrops", SFSArray.from_json(self.backdrops))
-        params.putSFSArray("lighting", SFSArray.from_json(self.lighting))
+        params.putSFSArray("backdrops", self.sfs_fragment("backdrops", SFSArray))
+        params.putSFSArray("lighting", self.sfs_fragment("lighting", SFSArray))
         params.putSFSArray("hidden_objects", SFSArray())
         islands = SFSArray()
         for island in self.islands:
@@ -157,6 +171,16 @@ class Player(BaseAdapter):
         props.addSFSObject(SFSObject().putInt("level", self.level))
         return props
 
+    def get_properties_values(self) -> list[dict]:
+        """Same as get_properties, as plain values for PLAYER_PROPERTY_SCHEMA."""
+        return [
+            {"coins": self.coins},
+            {"diamonds": self.diamonds},
+            {"food": self.food},
+            {"xp": self.xp},
+            {"level": self.level},
+        ]
+
     async def redeem_daily_reward(self) -> bool:
         """If 24h passed since last_collection, grant daily reward and return True."""
         now_ms = int(time.time() * 1000)
@@ -294,7 +318,13 @@ class PlayerIsland(BaseAdapter):
 class PlayerStructure(BaseAdapter):
     _db_model = PlayerStructureDB
     _game_id_key = "user_structure_id"
-    _specific_sfs_datatypes = {"user_island_id": Long, "obj_end": Long}
+    _specific_sfs_datatypes = {
+        "user_island_id": Long,
+        "building_completed": Long,
+        "last_collection": Long,
+        "obj_end": Long,
+    }
+    _sfs_extra_keys = {"structure": "structure_id"}
 
     user_island_id: int = None
     structure_id: int = 0
@@ -418,6 +448,7 @@ class PlayerMonster(BaseAdapter):
         "last_collection": Long,
         "volume": Double,
     }
+    _sfs_extra_keys = {"monster": "monster_id"}
 
     user_island_id: int = None
     monster_id: int = 0
@@ -50,7 +50,7 @@ class Structure(BaseAdapter):
             self.extra_params = {}
 
     @classmethod
-    async def _ensure_loaded(cls):
+    async def ensure_loaded(cls):
         async with _session_ctx() as session:
             from sqlalchemy import select
 
@@ -61,12 +61,12 @@ class Structure(BaseAdapter):
 
     @classmethod
     async def load_all(cls, use_cache: bool = False):
-        await cls._ensure_loaded()
+        await cls.ensure_loaded()
         return await super().load_all(use_cache=use_cache)
 
     @classmethod
     async def load_by_id(cls, id: int, use_cache: bool = True):
-        await cls._ensure_loaded()
+        await cls.ensure_loaded()
         return await super().load_by_id(id, use_cache=use_cache)
 
     @classmethod
@@ -156,23 +156,8 @@ class Structure(BaseAdapter):
     async def update_sfs(self, params: SFSObject):
         params.remove_item("date_created")
         params.putInt("structure_id", self.id)
-        params.putSFSArray(
-            "requirements",
-            SFSArray.from_json(self.requirements)
-            if isinstance(self.requirements, str)
-            else SFSArray.from_python_object(self.requirements),
-        )
-        params.putSFSObject(
-            "graphic",
-            SFSObject.from_json(self.graphic)
-            if isinstance(self.graphic, str)
-            else SFSObject.from_python_object(self.graphic),
-        )
-        params.putSFSObject(
-            "extra",
-            SFSObject.from_json(self.extra)
-            if isinstance(self.extra, str)
-            else SFSObject.from_python_object(self.extra),
-        )
+        params.putSFSArray("requirements", self.sfs_fragment("requirements", SFSArray))
+        params.putSFSObject("graphic", self.sfs_fragment("graphic"))
+        params.putSFSObject("extra", self.sfs_fragment("extra"))
         params.putLong("last_changed", 0)
         return params
@@ -1,4 +1,5 @@
 import asyncio
+import contextlib
 import logging
 from os import environ
 
@@ -8,10 +9,11 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # localmodules:start
-from config import HTTP_PORT
+from config import HTTP_PORT, SFS_WORKERS
 from database import init_database
 from MuppetsServer import MuppetsServer
 from MuppetsServer.auth_app import app as auth_app
+from MuppetsServer.supervisor import run_supervisor
 
 # localmodules:end
 
@@ -21,11 +23,32 @@ logging.basicConfig(
 )
 
 
+class AuthServer(uvicorn.Server):
+    """
+    The auth app's server, leaving SIGTERM to the game server, which drains and then stops it.
+    """
+
+    @contextlib.contextmanager
+    def capture_signals(self):
+        yield
+
+
 async def main():
     await init_database()
     config = uvicorn.Config(auth_app, host="0.0.0.0", port=int(HTTP_PORT))
-    server = uvicorn.Server(config)
-    await asyncio.gather(server.serve(), MuppetsServer.start())
+    server = AuthServer(config)
+
+    async def run_game_server():
+        try:
+            await MuppetsServer.start()
+        finally:
+            # The game server only returns once a SIGTERM has drained it.
+            server.should_exit = True
+
+    await asyncio.gather(server.serve(), run_game_server())
 
 
-asyncio.run(main())
+if SFS_WORKERS > 1:
+    run_supervisor(SFS_WORKERS)
+else:
+    asyncio.run(main())
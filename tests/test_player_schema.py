@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+# localmodules:start
+from database.player import PlayerMonster, PlayerStructure
+# localmodules:end
+
+
+def _structure(**fields) -> PlayerStructure:
+    structure = PlayerStructure()
+    structure.id = 7
+    structure.user_island_id = 3
+    structure.structure_id = 11
+    structure.date_created = 1700000000000
+    for field, value in fields.items():
+        setattr(structure, field, value)
+    return structure
+
+
+def _monster(**fields) -> PlayerMonster:
+    monster = PlayerMonster()
+    monster.id = 9
+    monster.user_island_id = 3
+    monster.monster_id = 5
+    monster.date_created = 1700000000000
+    for field, value in fields.items():
+        setattr(monster, field, value)
+    return monster
+
+
+@pytest.mark.parametrize(
+    "adapter",
+    [
+        _structure(),
+        _structure(building_completed=1700000000001, last_collection=1700000000002),
+        _structure(obj_data=5, obj_end=1700000000003, scale=1),
+        _structure(date_created=None, flip=1, muted=1, scale=0.5),
+        _monster(),
+        _monster(last_collection=1700000000004, volume=0.25, level=4),
+        _monster(date_created=None),
+    ],
+)
+def test_sfs_schema_matches_to_sfs_object(adapter):
+    expected = asyncio.run(adapter.to_sfs_object()).pack()
+    assert adapter.sfs_schema.pack(adapter.to_sfs_values()) == expected
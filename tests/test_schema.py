@@ -0,0 +1,71 @@
+import array
+
+import pytest
+
+# localmodules:start
+from ZewSFS.Exceptions import CompilePacketException
+from ZewSFS.Schema import SFSSchema
+from ZewSFS.Types import RawSFS, SFSArray, SFSObject
+from ZewSFS.Utils import compile_extension_packet
+# localmodules:end
+
+_SCHEMA = SFSSchema(
+    {
+        "n": "null",
+        "b": "bool",
+        "y": "byte",
+        "i": "int",
+        "l": "long",
+        "f": "float",
+        "u": "utf_string",
+        "ia": "int_array",
+        "ba": "byte_array",
+        "ua": "utf_string_array",
+        "o": {"x": "int", "z": ["utf_string"]},
+        "items": [{"k": "long"}],
+        "raw": [],
+        "sfs": {"q": "int"},
+    }
+)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        {},
+        {
+            "n": None,
+            "b": True,
+            "y": 3,
+            "i": 2,
+            "l": 2**40,
+            "f": 1.5,
+            "u": "héllo",
+            "ia": array.array("i", [1, 2, 3]),
+            "ba": b"abc",
+            "ua": ["a", "ü"],
+            "o": {"x": 1, "z": ["a", "bb"]},
+            "items": [{"k": 1}, {}],
+            "raw": SFSArray().addInt(1),
+            "sfs": RawSFS.from_sfs(SFSObject().putInt("q", 1)),
+        },
+    ],
+)
+def test_schema_sizes_match_encoding(value):
+    assert _SCHEMA.encoded_size(value) == len(_SCHEMA.pack(value))
+    buf = _SCHEMA.pack_extension_into(bytearray(), "gs_test", value)
+    assert _SCHEMA.extension_size("gs_test", value) == len(buf)
+    assert compile_extension_packet(_SCHEMA, "gs_test", value, len(buf))
+    with pytest.raises(CompilePacketException):
+        compile_extension_packet(_SCHEMA, "gs_test", value, len(buf) - 1)
+
+
+def test_oversize_extension_is_refused_before_encoding(monkeypatch):
+    schema = SFSSchema({"ua": "utf_string_array"})
+
+    def pack_extension_into(buf, cmd, value):
+        raise AssertionError("encoded an oversize packet")
+
+    monkeypatch.setattr(schema, "pack_extension_into", pack_extension_into)
+    with pytest.raises(CompilePacketException):
+        compile_extension_packet(schema, "gs_test", {"ua": ["x" * 1000] * 10}, 5000)
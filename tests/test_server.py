@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+# localmodules:start
+from ZewSFS import SFSClient, SFSServer
+from ZewSFS.Server import SFSRouter
+from ZewSFS.Types import SFSObject
+from ZewSFS.Utils import compile_packet
+# localmodules:end
+
+
+async def _serve(server: SFSServer) -> tuple[asyncio.Task, int]:
+    """
+    Starts server on a free port and returns its task and the port.
+    """
+    task = asyncio.create_task(server.serve_forever())
+    while server._listener is None:
+        await asyncio.sleep(0.01)
+    return task, server._listener.sockets[0].getsockname()[1]
+
+
+async def _send_malformed_and_ping(server: SFSServer, envelope) -> list:
+    """
+    Sends an extension frame whose envelope isn't an SFSObject with a command, then a valid
+    request, and returns the errors the server reported.
+    """
+    errors = []
+    router = SFSRouter()
+
+    @router.on_request("ping", read_only=True)
+    async def ping(client, params):
+        return SFSObject().putBool("pong", True)
+
+    @server.on_error()
+    async def on_error(client, error, formatted):
+        errors.append(error)
+
+    server.include_router(router)
+    task, port = await _serve(server)
+    client = SFSClient()
+    try:
+        await client.connect("127.0.0.1", port)
+        await client.send_login_request("zone", "user", "password", SFSObject())
+        request = SFSObject().putByte("c", 1).putShort("a", 13)
+        if envelope is not None:
+            request.putAny("p", envelope)
+        await client.send_raw(bytes(compile_packet(request)))
+        await client.send_extension_request("ping", SFSObject())
+        cmd, params = await asyncio.wait_for(client.wait_requests(["ping"]), 5)
+        assert params.getBool("pong")
+    finally:
+        await client.disconnect()
+        task.cancel()
+    await asyncio.sleep(0)
+    return errors
+
+
+@pytest.mark.parametrize("keep_alive_command", [None, "gs_keep_alive"])
+@pytest.mark.parametrize("concurrent_requests", [False, True])
+@pytest.mark.parametrize("envelope", [None, 5, "gs_player"])
+def test_malformed_play_frame_keeps_connection(
+    keep_alive_command, concurrent_requests, envelope
+):
+    server = SFSServer(
+        port=0,
+        concurrent_requests=concurrent_requests,
+        keep_alive_command=keep_alive_command,
+    )
+    errors = asyncio.run(_send_malformed_and_ping(server, envelope))
+    assert len(errors) == 1
+
+
+async def _keep_alive(server: SFSServer, params) -> SFSObject:
+    """
+    Sends a keep-alive request carrying params as is and returns the response.
+    """
+    task, port = await _serve(server)
+    client = SFSClient()
+    try:
+        await client.connect("127.0.0.1", port)
+        await client.send_login_request("zone", "user", "password", SFSObject())
+        envelope = SFSObject().putUtfString("c", "gs_keep_alive").putInt("r", -1)
+        envelope.putAny("p", params)
+        await client.send_packet(1, 13, envelope)
+        cmd, response = await asyncio.wait_for(
+            client.wait_requests(["gs_keep_alive"]), 5
+        )
+        return response
+    finally:
+        await client.disconnect()
+        task.cancel()
+
+
+@pytest.mark.parametrize("params", [{}, 5])
+def test_keep_alive_without_params_object(params):
+    server = SFSServer(port=0, keep_alive_command="gs_keep_alive")
+    response = asyncio.run(_keep_alive(server, params))
+    assert response.getLong("server_time") > 0
@@ -0,0 +1,57 @@
+import array
+import ctypes
+
+import pytest
+
+# localmodules:start
+from ZewSFS.Types import DoubleArray, IntArray, LongArray, SFSArray, SFSObject
+# localmodules:end
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        [{"b": 1}],
+        [{"b": 1}, {"c": [{"d": "x", "e": [1, 2]}]}],
+        [{"b": 1.5, "c": True}, {}],
+    ],
+)
+def test_put_any_round_trips_nested_lists_of_dicts(value):
+    obj = SFSObject().putAny("a", value)
+    assert isinstance(obj.getSFSArray("a"), SFSArray)
+    decoded = SFSObject.unpack(obj.pack(), None, True)
+    assert decoded.to_python_object() == {"a": value}
+    assert SFSObject.from_python_object({"a": value}).pack() == obj.pack()
+    assert SFSArray.from_python_object(value).to_python_object() == value
+
+
+def _big_endian_ints(values: list[int]) -> memoryview:
+    return memoryview((ctypes.c_int32.__ctype_be__ * len(values))(*values))
+
+
+@pytest.mark.parametrize(
+    "array_type, values, expected",
+    [
+        (IntArray, memoryview(array.array("i", [1, 2, 3, 4]))[::2], [1, 3]),
+        (IntArray, memoryview(array.array("i", [1, 2, 3, 4]))[::-1], [4, 3, 2, 1]),
+        (IntArray, memoryview(array.array("q", [5, -6, 7]))[::2], [5, 7]),
+        (IntArray, array.array("h", [-1, 2]), [-1, 2]),
+        (IntArray, array.array("q", [2**31 - 1, -(2**31)]), [2**31 - 1, -(2**31)]),
+        (IntArray, _big_endian_ints([1, -2, 3]), [1, -2, 3]),
+        (IntArray, _big_endian_ints([1, -2, 3])[::2], [1, 3]),
+        (
+            LongArray,
+            memoryview(array.array("q", [2**40, 1, -(2**40)]))[::2],
+            [2**40, -(2**40)],
+        ),
+        (LongArray, array.array("i", [7, -8]), [7, -8]),
+        (DoubleArray, memoryview(array.array("d", [0.5, 1.5, 2.5]))[1:], [1.5, 2.5]),
+        (DoubleArray, array.array("f", [0.25, -1.0]), [0.25, -1.0]),
+    ],
+)
+def test_numeric_arrays_accept_strided_and_wide_buffers(array_type, values, expected):
+    item = array_type("a", values)
+    obj = SFSObject().set_item("a", item)
+    packed = obj.pack()
+    assert SFSObject.unpack(packed, None, True).get("a") == expected
+    assert item.encoded_size() == array_type("a", expected).encoded_size()